@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Benchmark da análise de layout
+Compara a heurística de títulos do SimplePDFConverter (linhas em maiúsculas
+ou terminadas em ":"), a análise de layout por métricas de fonte (layout=True)
+e o DoclingConverter em tempo por página e qualidade (títulos encontrados,
+nível dos títulos e parágrafos íntegros na ordem de leitura) sobre documentos
+sintéticos com gabarito
+
+Com o Docling instalado, a saída dele também serve de referência: cada método
+recebe a concordância com o Docling (F1 dos títulos e das palavras), o que
+permite comparar em PDFs reais (--corpus), que não têm gabarito.
+
+Uso:
+    python benchmark_layout.py --pages 20
+    python benchmark_layout.py --corpus ./pdfs --json layout.json --require-docling
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+# Fontes Type1 padrão usadas pelo documento sintético
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+WORDS = (
+    "analise documento pagina processo conversao texto modelo dados resultado "
+    "sistema camada coluna tabela indice fonte tamanho leitura ordem metodo "
+    "desempenho custo memoria arquivo extracao estrutura secao titulo corpo"
+).split()
+
+_PAGE_HEADER = re.compile(r"^## Página \d+$")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("#", " ").split())
+
+
+class _SyntheticDocument:
+    """Documento sintético com gabarito de títulos e parágrafos"""
+
+    def __init__(self, pages: int, seed: int = 7, two_column_every: int = 2):
+        self.rng = random.Random(seed)
+        self.headings: List[Tuple[int, str]] = []
+        self.paragraphs: List[str] = []
+        self.page_runs: List[List[Tuple[str, float, float, float, str]]] = []
+        for page in range(1, pages + 1):
+            two_columns = two_column_every and page % two_column_every == 0
+            self.page_runs.append(self._page(page, bool(two_columns)))
+
+    def _sentence(self, words: int) -> str:
+        text = " ".join(self.rng.choice(WORDS) for _ in range(words))
+        return text[0].upper() + text[1:] + "."
+
+    def _paragraph(self, runs, x: float, y: float, width_chars: int, size: float = 10) -> float:
+        """Parágrafo quebrado em linhas de até width_chars caracteres; retorna o novo y"""
+        text = " ".join(self._sentence(self.rng.randint(6, 14)) for _ in range(self.rng.randint(2, 4)))
+        self.paragraphs.append(text)
+        line = ""
+        for word in text.split():
+            if line and len(line) + 1 + len(word) > width_chars:
+                runs.append(("F1", size, x, y, line))
+                y -= size * 1.2
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        runs.append(("F1", size, x, y, line))
+        return y - size * 2.2
+
+    def _heading(self, runs, level: int, text: str, x: float, y: float) -> float:
+        size = {1: 20, 2: 15, 3: 12}[level]
+        font = "F2" if level == 3 else "F1"
+        self.headings.append((level, text))
+        runs.append((font, size, x, y, text))
+        return y - size * 1.8
+
+    def _page(self, page: int, two_columns: bool) -> List[Tuple[str, float, float, float, str]]:
+        runs: List[Tuple[str, float, float, float, str]] = []
+        y = 790.0
+        if page == 1:
+            y = self._heading(runs, 1, "Relatorio sintetico de layout", 50, y)
+        y = self._heading(runs, 2, f"Secao {page} {self.rng.choice(WORDS)}", 50, y)
+
+        if not two_columns:
+            while y > 200:
+                y = self._paragraph(runs, 50, y, 95)
+            self._heading(runs, 3, f"Subsecao {page}.1 {self.rng.choice(WORDS)}", 50, y)
+            y -= 12 * 1.8
+            while y > 80:
+                y = self._paragraph(runs, 50, y, 95)
+            return runs
+
+        # Duas colunas de 240 pt com calha de 25 pt
+        for x in (50, 315):
+            column_y = y
+            while column_y > 200:
+                column_y = self._paragraph(runs, x, column_y, 45)
+            if x == 50:
+                column_y = self._heading(runs, 3, f"Subsecao {page}.1 {self.rng.choice(WORDS)}", x, column_y)
+            while column_y > 80:
+                column_y = self._paragraph(runs, x, column_y, 45)
+        return runs
+
+    def to_pdf(self) -> bytes:
+        """PDF com as fontes padrão (sem dependências externas)"""
+        fonts = " ".join(f"/{name} {index + 3} 0 R" for index, name in enumerate(FONTS))
+        objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+        for base_font in FONTS.values():
+            objects.append(f"<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} >>".encode())
+
+        kids = []
+        for runs in self.page_runs:
+            ops = [
+                f"BT /{font} {size} Tf 1 0 0 1 {x} {y} Tm ({text}) Tj ET".encode("latin-1")
+                for font, size, x, y, text in runs
+            ]
+            stream = b"\n".join(ops)
+            objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+            content_id = len(objects)
+            objects.append(
+                b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                b"/Resources << /Font << %s >> >> /Contents %d 0 R >>" % (fonts.encode(), content_id)
+            )
+            kids.append(b"%d 0 R" % len(objects))
+        objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), len(kids))
+
+        out = bytearray(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, 1):
+            offsets.append(len(out))
+            out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+        xref = len(out)
+        out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+        for offset in offsets:
+            out += b"%010d 00000 n \n" % offset
+        out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+        return bytes(out)
+
+
+def _headings(markdown: str) -> List[Tuple[int, str]]:
+    """Títulos (profundidade, texto normalizado), sem os cabeçalhos de página"""
+    found: List[Tuple[int, str]] = []
+    for line in markdown.split("\n"):
+        line = line.strip()
+        match = _HEADING.match(line)
+        if match and not _PAGE_HEADER.match(line):
+            found.append((len(match.group(1)), _normalize(match.group(2))))
+    return found
+
+
+def _f1(found: Counter, expected: Counter) -> float:
+    common = sum((found & expected).values())
+    if not common:
+        return 0.0
+    precision = common / sum(found.values())
+    recall = common / sum(expected.values())
+    return round(2 * precision * recall / (precision + recall), 3)
+
+
+def agreement(markdown: str, reference: str) -> Dict[str, Any]:
+    """
+    Concordância com a saída do Docling (referência sem gabarito)
+
+    - docling_heading_f1: F1 dos textos de título
+    - docling_word_f1: F1 das palavras do documento (sem os marcadores de
+      página e de título)
+    """
+    def words(text: str) -> Counter:
+        body = "\n".join(line for line in text.split("\n") if not _PAGE_HEADER.match(line.strip()))
+        return Counter(_normalize(body).split())
+
+    return {
+        "docling_heading_f1": _f1(Counter(text for _, text in _headings(markdown)),
+                                  Counter(text for _, text in _headings(reference))),
+        "docling_word_f1": _f1(words(markdown), words(reference))
+    }
+
+
+def score(markdown: str, document: Optional[_SyntheticDocument]) -> Dict[str, Any]:
+    """
+    Qualidade do Markdown em relação ao gabarito
+
+    - heading_precision/heading_recall: títulos (#) que são/estão no gabarito
+    - heading_level_accuracy: títulos encontrados no nível certo (relativo
+      ao título mais alto encontrado)
+    - paragraph_recall: parágrafos do gabarito presentes inteiros, com as
+      linhas na ordem de leitura (colunas não intercaladas)
+    """
+    found = _headings(markdown)
+    metrics: Dict[str, Any] = {"headings_found": len(found)}
+    if document is None:
+        return metrics
+
+    expected = {_normalize(text): level for level, text in document.headings}
+    matched = [(depth, expected[text]) for depth, text in found if text in expected]
+    top_depth = min((depth for depth, _ in matched), default=0)
+    text = _normalize(markdown)
+
+    metrics.update({
+        "heading_precision": round(len(matched) / len(found), 3) if found else 0.0,
+        "heading_recall": round(len({t for _, t in found if t in expected}) / len(expected), 3),
+        "heading_level_accuracy": round(
+            sum(1 for depth, level in matched if depth - top_depth == level - 1) / len(matched), 3
+        ) if matched else 0.0,
+        "paragraph_recall": round(
+            sum(1 for paragraph in document.paragraphs if _normalize(paragraph) in text)
+            / len(document.paragraphs), 3
+        )
+    })
+    return metrics
+
+
+def _methods(pipeline: Optional[str]) -> Tuple[List[Tuple[str, Any]], Optional[str]]:
+    """
+    Métodos comparados: (nome, função de conversão) dos disponíveis
+
+    Returns:
+        (métodos, motivo da ausência do Docling ou None)
+    """
+    from converters.simple_pdf import SimplePDFConverter
+
+    simple = SimplePDFConverter()
+    methods = [
+        ("heuristica", lambda content, name: simple.convert_pdf(content, name, layout=False)),
+    ]
+    if simple.layout_available:
+        methods.append(("layout", lambda content, name: simple.convert_pdf(content, name, layout=True)))
+    else:
+        print("⚠️  NumPy não instalado: análise de layout indisponível", file=sys.stderr)
+
+    missing = None
+    try:
+        from converters.docling import DoclingConverter
+        docling = DoclingConverter()
+        if docling.is_available():
+            methods.append(("docling", lambda content, name: docling.convert_pdf(content, name, pipeline=pipeline)))
+        else:
+            missing = docling.error or "não instalado"
+    except Exception as e:
+        missing = str(e)
+    return methods, missing
+
+
+def run(documents: List[Tuple[str, bytes, Optional[_SyntheticDocument]]],
+        pipeline: Optional[str], repeat: int,
+        methods: Optional[List[Tuple[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Converte cada documento com cada método (melhor de repeat execuções)
+
+    Se o Docling estiver entre os métodos, as demais linhas recebem a
+    concordância com a saída dele para o mesmo documento.
+    """
+    if methods is None:
+        methods, _ = _methods(pipeline)
+    rows = []
+    outputs: Dict[Tuple[str, str], str] = {}
+    for method, convert in methods:
+        for name, content, document in documents:
+            best = None
+            result: Dict[str, Any] = {}
+            for _ in range(repeat):
+                start = time.perf_counter()
+                result = convert(content, name)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            pages = result.get("pages") or 1
+            row = {
+                "method": method,
+                "document": name,
+                "success": bool(result.get("success")) and result.get("mode") != "fallback",
+                "pages": pages,
+                "ms_per_page": round(best * 1000 / pages, 2)
+            }
+            row.update(score(result.get("markdown", ""), document))
+            rows.append(row)
+            outputs[(method, name)] = result.get("markdown", "") if row["success"] else None
+
+    for row in rows:
+        reference = outputs.get(("docling", row["document"]))
+        if row["method"] != "docling" and reference:
+            row.update(agreement(outputs[(row["method"], row["document"])] or "", reference))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Benchmark da análise de layout (heurística x layout x Docling)")
+    parser.add_argument("--pages", type=int, default=20, help="Páginas do documento sintético")
+    parser.add_argument("--corpus", default=None, help="Diretório ou arquivo PDF reais (sem gabarito)")
+    parser.add_argument("--pipeline", choices=("fast", "balanced", "accurate"), default=None,
+                        help="Perfil do pipeline Docling")
+    parser.add_argument("--repeat", type=int, default=3, help="Execuções por documento (usa a melhor)")
+    parser.add_argument("--json", default=None, help="Grava os resultados em JSON")
+    parser.add_argument("--require-docling", action="store_true",
+                        help="Falha (código 2) se o Docling não estiver disponível")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+
+    methods, docling_missing = _methods(args.pipeline)
+    if docling_missing:
+        print(f"⚠️  Docling indisponível ({docling_missing}): sem a comparação e as métricas de "
+              "concordância; instale com: pip install docling", file=sys.stderr)
+        if args.require_docling:
+            return 2
+
+    if args.corpus:
+        paths = sorted(Path(args.corpus).rglob("*.pdf")) if Path(args.corpus).is_dir() else [Path(args.corpus)]
+        documents = [(path.name, path.read_bytes(), None) for path in paths]
+        if not documents:
+            print(f"❌ Nenhum PDF encontrado em {args.corpus}", file=sys.stderr)
+            return 1
+    else:
+        synthetic = _SyntheticDocument(args.pages)
+        documents = [(f"sintetico-{args.pages}p.pdf", synthetic.to_pdf(), synthetic)]
+
+    rows = run(documents, args.pipeline, args.repeat, methods)
+
+    columns = ["method", "document", "ms_per_page", "headings_found", "heading_precision",
+               "heading_recall", "heading_level_accuracy", "paragraph_recall",
+               "docling_heading_f1", "docling_word_f1"]
+    print(" | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(row.get(column, "-")) for column in columns))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"docling_missing": docling_missing, "results": rows}, f, ensure_ascii=False, indent=2)
+        print(f"📄 Resultados: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
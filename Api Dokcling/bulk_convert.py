@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Conversão em lote de PDFs para Markdown/JSON sem passar pela API HTTP
+Usa o ConverterManager diretamente em um pool de processos (que também
+calcula os hashes), com manifesto retomável (por hash do conteúdo e opções
+de conversão) e estatísticas de throughput
+
+Uso:
+    python bulk_convert.py ./pdfs -o ./saida --formats md,json --workers 8
+    python bulk_convert.py @lista.txt -o ./saida --tables --no-ocr
+
+Como biblioteca:
+    from bulk_convert import convert_paths
+    stats = convert_paths(["./pdfs"], "./saida", formats=("md",))
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+
+MANIFEST_NAME = ".manifest.jsonl"
+FORMATS = ("md", "json")
+
+# Gerenciador criado uma vez por processo do pool
+_manager = None
+
+
+def iter_pdf_files(inputs: Iterable[str]) -> Iterable[Tuple[Path, Path]]:
+    """
+    Expande as entradas em pares (arquivo, caminho relativo de saída)
+
+    Aceita diretórios (busca recursiva por *.pdf), arquivos PDF e listas de
+    arquivos no formato @lista.txt (um caminho por linha).
+    """
+    for entry in inputs:
+        if entry.startswith("@"):
+            with open(entry[1:], "r", encoding="utf-8") as f:
+                listed = [line.strip() for line in f if line.strip()]
+            yield from iter_pdf_files(listed)
+            continue
+
+        path = Path(entry)
+        if path.is_dir():
+            for pdf_path in sorted(path.rglob("*")):
+                if pdf_path.is_file() and pdf_path.suffix.lower() == ".pdf":
+                    yield pdf_path, pdf_path.relative_to(path)
+        elif path.is_file():
+            yield path, Path(path.name)
+
+
+def manifest_key(file_hash: str, options: Dict[str, Any], converter_names: Optional[str] = None) -> str:
+    """Chave do manifesto: hash do conteúdo + opções de conversão e conversores"""
+    settings = json.dumps({"options": options, "converters": converter_names}, sort_keys=True, default=str)
+    return f"{file_hash}:{hashlib.sha256(settings.encode()).hexdigest()[:16]}"
+
+
+def load_manifest(manifest_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Carrega o manifesto (último registro bem-sucedido por chave)
+
+    Registros sem chave (manifestos antigos, sem as opções) não são
+    reaproveitados.
+    """
+    done: Dict[str, Dict[str, Any]] = {}
+    if not manifest_path.exists():
+        return done
+
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Linha truncada por uma interrupção anterior
+                continue
+            if record.get("success") and record.get("key"):
+                done[record["key"]] = record
+    return done
+
+
+def _init_worker(converter_names: Optional[str], log_level: int):
+    """
+    Inicializa o ConverterManager no processo do pool
+
+    O paralelismo vem dos processos: cada gerenciador usa uma thread por
+    conversor, em vez de um pool do tamanho do número de CPUs.
+    """
+    global _manager
+    logging.basicConfig(level=log_level)
+    from converters.manager import ConverterManager
+    _manager = ConverterManager(converter_names, max_workers=1)
+
+
+def _convert_file(source: str, target: str, file_hash: str, key: str,
+                  formats: Sequence[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Converte um arquivo e grava as saídas (executa no processo do pool)"""
+    start = time.perf_counter()
+    with open(source, "rb") as f:
+        content = f.read()
+
+    result = _manager.convert_pdf(content, os.path.basename(source), **options)
+    success = bool(result.get("success")) and result.get("mode") != "fallback"
+
+    outputs = []
+    if success:
+        target_path = Path(target)
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        for output_format in formats:
+            output_path = target_path.with_suffix(f".{output_format}")
+            tmp_path = output_path.with_name(output_path.name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if output_format == "md":
+                    f.write(result.get("markdown", ""))
+                else:
+                    json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, output_path)
+            outputs.append(str(output_path))
+
+    return {
+        "hash": file_hash,
+        "key": key,
+        "source": source,
+        "outputs": outputs,
+        "success": success,
+        "error": None if success else result.get("error", result.get("mode")),
+        "converter_used": result.get("converter_used"),
+        "pages": result.get("pages", 0),
+        "size_bytes": len(content),
+        "seconds": round(time.perf_counter() - start, 3)
+    }
+
+
+def _file_hash(path: str) -> str:
+    """SHA-256 do conteúdo do arquivo (executa no processo do pool)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _reuse_outputs(previous: Dict[str, Any], target: Path, formats: Sequence[str]) -> Optional[List[str]]:
+    """Copia as saídas de um conteúdo já convertido para um novo caminho"""
+    outputs = []
+    for output_format in formats:
+        output_path = target.with_suffix(f".{output_format}")
+        source = next((p for p in previous.get("outputs", []) if p.endswith(f".{output_format}")), None)
+        if source is None or not os.path.exists(source):
+            return None
+        if os.path.abspath(source) != os.path.abspath(output_path):
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(source, output_path)
+        outputs.append(str(output_path))
+    return outputs
+
+
+class _Progress:
+    """Relatório de progresso periódico no stderr"""
+
+    def __init__(self, enabled: bool, interval: float = 2.0):
+        self.enabled = enabled
+        self.interval = interval
+        self.start = time.perf_counter()
+        self._last = 0.0
+
+    def update(self, stats: Dict[str, Any], force: bool = False):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if not force and now - self._last < self.interval:
+            return
+        self._last = now
+        elapsed = max(now - self.start, 1e-9)
+        processed = stats["converted"] + stats["failed"]
+        print(
+            f"\r[{processed + stats['skipped']}/{stats['files']}] "
+            f"{stats['converted']} convertidos, {stats['skipped']} pulados, {stats['failed']} falhas | "
+            f"{processed / elapsed:.1f} arq/s, {stats['pages'] / elapsed:.1f} pág/s",
+            end="", file=sys.stderr, flush=True
+        )
+
+
+def convert_paths(inputs: Iterable[str], output_dir: str,
+                  formats: Sequence[str] = ("md",),
+                  workers: Optional[int] = None,
+                  converter_names: Optional[str] = None,
+                  options: Optional[Dict[str, Any]] = None,
+                  progress: bool = False,
+                  log_level: int = logging.WARNING) -> Dict[str, Any]:
+    """
+    Converte arquivos/diretórios para .md/.json em output_dir
+
+    Arquivos cujo hash já consta no manifesto de output_dir com as mesmas
+    opções e conversores são pulados, o que permite retomar um backfill
+    interrompido; com outras opções, o arquivo é convertido novamente.
+    Os hashes são calculados no pool, e a conversão é agendada quando o
+    hash do arquivo fica pronto.
+
+    Arquivos de entradas diferentes com o mesmo caminho de saída (ex.:
+    a/x.pdf e b/x.pdf) não se sobrescrevem: o primeiro é convertido e os
+    demais contam como falha (collisions).
+
+    Opções ausentes ou None ficam com o padrão do conversor (variáveis de
+    ambiente e OCR automático para PDFs sem camada de texto).
+
+    Returns:
+        Estatísticas da execução (arquivos, páginas, bytes, throughput)
+    """
+    formats = tuple(formats)
+    invalid = [f for f in formats if f not in FORMATS]
+    if invalid:
+        raise ValueError(f"Formatos inválidos: {', '.join(invalid)}")
+
+    options = {key: value for key, value in (options or {}).items() if value is not None}
+    if "json" in formats:
+        options.setdefault("output_format", "pages")
+
+    output_root = Path(output_dir)
+    output_root.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_root / MANIFEST_NAME
+    done = load_manifest(manifest_path)
+
+    workers = workers or os.cpu_count() or 1
+    stats = {
+        "files": 0, "converted": 0, "skipped": 0, "failed": 0,
+        "collisions": 0, "pages": 0, "bytes": 0
+    }
+    reporter = _Progress(progress)
+    start = time.perf_counter()
+
+    with open(manifest_path, "a", encoding="utf-8") as manifest, \
+            ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                initargs=(converter_names, log_level)) as pool:
+
+        def record(entry: Dict[str, Any]):
+            manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            manifest.flush()
+
+        # Tarefa em voo -> (arquivo, destino) para hashes, None para conversões
+        pending: Dict[Any, Optional[Tuple[Path, Path]]] = {}
+        # Limita as tarefas em voo para não materializar listas enormes
+        max_pending = workers * 4
+        # Destino -> arquivo, para não sobrescrever saídas de outra entrada
+        targets: Dict[Path, Path] = {}
+        logger = logging.getLogger(__name__)
+
+        def schedule(source: Path, target: Path, file_hash: str):
+            key = manifest_key(file_hash, options, converter_names)
+            previous = done.get(key)
+            if previous is not None:
+                outputs = _reuse_outputs(previous, target, formats)
+                if outputs is not None:
+                    if outputs != previous.get("outputs"):
+                        record(dict(previous, source=str(source), outputs=outputs))
+                    stats["skipped"] += 1
+                    return
+            pending[pool.submit(_convert_file, str(source), str(target), file_hash, key,
+                                formats, options)] = None
+
+        def drain(block_until: int):
+            while len(pending) > block_until:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    hashed = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        logger.error(f"❌ Falha no processo de conversão: {e}")
+                        continue
+                    if hashed is not None:
+                        schedule(*hashed, result)
+                        continue
+                    record(result)
+                    if result["success"]:
+                        stats["converted"] += 1
+                        stats["pages"] += result["pages"] or 0
+                        stats["bytes"] += result["size_bytes"]
+                        done[result["key"]] = result
+                    else:
+                        stats["failed"] += 1
+                reporter.update(stats)
+
+        for source, relative in iter_pdf_files(inputs):
+            target = output_root / relative
+            claimed = targets.setdefault(target, source)
+            if claimed is not source:
+                if claimed.resolve() == source.resolve():
+                    # O mesmo arquivo listado por mais de uma entrada
+                    continue
+                stats["files"] += 1
+                stats["failed"] += 1
+                stats["collisions"] += 1
+                logger.error(f"❌ {source}: mesma saída de {claimed}, não convertido")
+                continue
+
+            stats["files"] += 1
+            pending[pool.submit(_file_hash, str(source))] = (source, target)
+            drain(max_pending)
+
+        drain(0)
+
+    elapsed = time.perf_counter() - start
+    reporter.update(stats, force=True)
+    if progress:
+        print(file=sys.stderr)
+
+    processed = stats["converted"] + stats["failed"]
+    stats.update({
+        "elapsed_seconds": round(elapsed, 2),
+        "files_per_second": round(processed / elapsed, 2) if elapsed else 0.0,
+        "pages_per_second": round(stats["pages"] / elapsed, 2) if elapsed else 0.0,
+        "mb_per_second": round(stats["bytes"] / 1024 / 1024 / elapsed, 2) if elapsed else 0.0,
+        "workers": workers,
+        "manifest": str(manifest_path)
+    })
+    return stats
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Conversão em lote de PDFs para Markdown/JSON")
+    parser.add_argument("inputs", nargs="+", help="Diretórios, arquivos PDF ou @lista.txt")
+    parser.add_argument("-o", "--output", required=True, help="Diretório de saída")
+    parser.add_argument("--formats", default="md", help="Formatos de saída: md, json ou md,json")
+    parser.add_argument("--workers", type=int, default=None, help="Processos (padrão: número de CPUs)")
+    parser.add_argument("--converters", default=None, help="Conversores habilitados (padrão: PDF_CONVERTERS)")
+    # Sem a flag, vale o padrão do conversor (PDF_EXTRACT_TABLES, OCR automático, PDF_LAYOUT)
+    parser.add_argument("--tables", action=argparse.BooleanOptionalAction, default=None,
+                        help="Extrai tabelas como Markdown")
+    parser.add_argument("--ocr", action=argparse.BooleanOptionalAction, default=None,
+                        help="Aplica OCR às páginas sem texto")
+    parser.add_argument("--layout", action=argparse.BooleanOptionalAction, default=None,
+                        help="Títulos, parágrafos e colunas por métricas de fonte")
+    parser.add_argument("--pipeline", choices=("fast", "balanced", "accurate"), default=None,
+                        help="Perfil do pipeline Docling")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Tamanho dos chunks na saída JSON")
+    parser.add_argument("--quiet", action="store_true", help="Não mostra o progresso")
+    args = parser.parse_args(argv)
+
+    options: Dict[str, Any] = {"extract_tables": args.tables, "ocr": args.ocr, "layout": args.layout}
+    if args.chunk_size:
+        options["chunk_size"] = args.chunk_size
+    if args.pipeline:
+        options["pipeline"] = args.pipeline
+
+    stats = convert_paths(
+        args.inputs,
+        args.output,
+        formats=[f.strip() for f in args.formats.split(",") if f.strip()],
+        workers=args.workers,
+        converter_names=args.converters,
+        options=options,
+        progress=not args.quiet
+    )
+
+    print("📊 Estatísticas:")
+    for key, value in stats.items():
+        print(f"   {key}: {value}")
+
+    return 0 if stats["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
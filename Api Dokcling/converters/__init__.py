@@ -3,7 +3,16 @@ Pacote de conversores para PDF to Markdown
 """
 
 from .base import BaseConverter
+from .registry import register_converter, get_registry
 from .simple import SimpleConverter
+from .simple_pdf import SimplePDFConverter
 from .docling import DoclingConverter
 
-__all__ = ['BaseConverter', 'SimpleConverter', 'DoclingConverter']
+__all__ = [
+    'BaseConverter',
+    'SimpleConverter',
+    'SimplePDFConverter',
+    'DoclingConverter',
+    'register_converter',
+    'get_registry'
+]
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Armazenamento de imagens extraídas dos PDFs, endereçado por conteúdo
+Cada imagem é gravada uma única vez no disco (nome = SHA-256), mesmo que se
+repita em várias páginas ou documentos, e o Markdown a referencia por URL
+(servida por /assets/{asset_id}) em vez de embutir base64
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from io import BytesIO
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+EXTRACT_IMAGES_DEFAULT = os.getenv("PDF_EXTRACT_IMAGES", "false").lower() in ("1", "true", "yes")
+ASSET_DIR = os.getenv("PDF_ASSET_DIR", "./data/assets")
+# Prefixo das URLs no Markdown (ex.: https://cdn.exemplo.com/assets)
+ASSET_BASE_URL = os.getenv("PDF_ASSET_BASE_URL", "/assets").rstrip("/")
+# Imagens menores que isto (em pixels, em qualquer dimensão) são ignoradas
+ASSET_MIN_SIZE_PX = int(os.getenv("PDF_ASSET_MIN_SIZE_PX", "16"))
+
+ASSET_MEDIA_TYPES = {"jpg": "image/jpeg", "jp2": "image/jp2", "png": "image/png"}
+_ASSET_ID = re.compile(r"^[0-9a-f]{64}\.(jpg|jp2|png)$")
+
+# Streams já codificados em um formato de arquivo de imagem (gravados como estão)
+_PASSTHROUGH_FILTERS = {"DCTDecode": "jpg", "JPXDecode": "jp2"}
+_COLOR_MODES = {"DeviceGray": "L", "CalGray": "L", "DeviceRGB": "RGB", "CalRGB": "RGB", "DeviceCMYK": "CMYK"}
+_ICC_MODES = {1: "L", 3: "RGB", 4: "CMYK"}
+
+
+class AssetStore:
+    """Diretório de imagens por hash (subdiretórios pelo prefixo)"""
+
+    def __init__(self, directory: str = ASSET_DIR, base_url: str = ASSET_BASE_URL):
+        self.directory = Path(directory)
+        self.base_url = base_url
+
+    def path(self, asset_id: str) -> Optional[Path]:
+        """Caminho do asset, ou None se o identificador é inválido"""
+        if not _ASSET_ID.match(asset_id):
+            return None
+        return self.directory / asset_id[:2] / asset_id
+
+    def exists(self, asset_id: str) -> bool:
+        path = self.path(asset_id)
+        return path is not None and path.exists()
+
+    def url(self, asset_id: str) -> str:
+        return f"{self.base_url}/{asset_id}"
+
+    def put(self, asset_id: str, data: bytes) -> bool:
+        """Grava o asset de forma atômica; False se já existia"""
+        path = self.path(asset_id)
+        if path is None:
+            raise ValueError(f"Identificador de asset inválido: {asset_id}")
+        if path.exists():
+            return False
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return True
+
+    def put_bytes(self, data: bytes, extension: str) -> Tuple[str, bool]:
+        """Grava um arquivo de imagem pelo hash do conteúdo; retorna (asset_id, novo)"""
+        asset_id = f"{hashlib.sha256(data).hexdigest()}.{extension}"
+        return asset_id, self.put(asset_id, data)
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"directory": str(self.directory), "base_url": self.base_url}
+
+
+class ImageExtractor:
+    """
+    Extração das imagens das páginas do pdfplumber para o AssetStore
+
+    JPEG e JPEG 2000 são gravados com os bytes do stream, sem recodificar;
+    os demais formatos são decodificados e salvos como PNG (requer Pillow).
+    O identificador dos PNGs é o hash do stream original e dos parâmetros da
+    imagem, de modo que uma imagem já armazenada (o logotipo repetido em
+    cada página ou documento) não é decodificada novamente. Uma instância
+    por conversão: imagens compartilhadas entre páginas são processadas uma
+    vez por documento.
+    """
+
+    def __init__(self, store: AssetStore, min_size: int = ASSET_MIN_SIZE_PX):
+        self.store = store
+        self.min_size = min_size
+        self._by_object: Dict[int, Optional[str]] = {}
+        self.stats = {"count": 0, "new_assets": 0, "skipped": 0}
+
+    def page_images(self, page) -> List[str]:
+        """Referências Markdown das imagens da página, de cima para baixo"""
+        references = []
+        for image in sorted(page.images, key=lambda image: (image["top"], image["x0"])):
+            try:
+                asset_id = self._asset(image)
+            except Exception as e:
+                logger.debug("Imagem ignorada na página %d: %s", page.page_number, e)
+                asset_id = None
+            if asset_id is None:
+                self.stats["skipped"] += 1
+                continue
+            self.stats["count"] += 1
+            references.append(f"![]({self.store.url(asset_id)})")
+        return references
+
+    def _asset(self, image: Dict[str, Any]) -> Optional[str]:
+        stream = image["stream"]
+        objid = getattr(stream, "objid", None)
+        if objid is not None and objid in self._by_object:
+            return self._by_object[objid]
+
+        asset_id = None
+        width, height = image.get("srcsize") or (0, 0)
+        if width >= self.min_size and height >= self.min_size:
+            asset_id = self._store_stream(stream, image)
+        if objid is not None:
+            self._by_object[objid] = asset_id
+        return asset_id
+
+    def _store_stream(self, stream, image: Dict[str, Any]) -> Optional[str]:
+        filters = [_name(name) for name, _ in stream.get_filters()]
+        raw = stream.get_rawdata()
+
+        if filters and filters[-1] in _PASSTHROUGH_FILTERS:
+            # O pdfminer decodifica só os filtros anteriores (ex.: ASCII85)
+            data = raw if len(filters) == 1 else stream.get_data()
+            asset_id = f"{hashlib.sha256(data).hexdigest()}.{_PASSTHROUGH_FILTERS[filters[-1]]}"
+            if self.store.put(asset_id, data):
+                self.stats["new_assets"] += 1
+            return asset_id
+
+        digest = hashlib.sha256(raw)
+        digest.update(repr((filters, image.get("srcsize"), image.get("bits"),
+                            [_name(c) for c in image.get("colorspace") or []])).encode())
+        asset_id = f"{digest.hexdigest()}.png"
+        if self.store.exists(asset_id):
+            return asset_id
+
+        data = _encode_png(stream, image)
+        if data is None:
+            return None
+        if self.store.put(asset_id, data):
+            self.stats["new_assets"] += 1
+        return asset_id
+
+
+def _name(value: Any) -> str:
+    """Nome de um PSLiteral do pdfminer (ou a própria string)"""
+    return getattr(value, "name", value) if not isinstance(value, str) else value
+
+
+def _color_mode(image: Dict[str, Any]) -> Optional[str]:
+    """Modo do Pillow para o espaço de cores da imagem (None se não suportado)"""
+    from pdfminer.pdftypes import resolve1
+
+    if image.get("imagemask") or image.get("bits") == 1:
+        return "1"
+    colorspace = [resolve1(item) for item in image.get("colorspace") or []]
+    if not colorspace:
+        return None
+    first = colorspace[0]
+    if isinstance(first, list) and first:
+        # [/ICCBased <stream>] resolvido como lista
+        colorspace = [resolve1(item) for item in first]
+        first = colorspace[0]
+    name = _name(first)
+    if name == "ICCBased" and len(colorspace) > 1:
+        return _ICC_MODES.get(resolve1(colorspace[1]).attrs.get("N"))
+    return _COLOR_MODES.get(name)
+
+
+def _encode_png(stream, image: Dict[str, Any]) -> Optional[bytes]:
+    """Decodifica um bitmap do PDF e codifica como PNG (None se não suportado)"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+
+    mode = _color_mode(image)
+    if mode is None or image.get("bits") not in (1, 8):
+        return None
+    width, height = image["srcsize"]
+    data = stream.get_data()
+
+    channels = {"1": 1, "L": 1, "RGB": 3, "CMYK": 4}[mode]
+    row_bytes = (width + 7) // 8 if mode == "1" else width * channels
+    if len(data) < row_bytes * height:
+        return None
+
+    bitmap = Image.frombytes(mode, (width, height), data[:row_bytes * height])
+    if mode == "CMYK":
+        bitmap = bitmap.convert("RGB")
+    output = BytesIO()
+    bitmap.save(output, format="PNG")
+    return output.getvalue()
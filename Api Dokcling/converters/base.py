@@ -3,7 +3,7 @@ Classe base para conversores de PDF para Markdown
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
@@ -11,6 +11,13 @@ logger = logging.getLogger(__name__)
 class BaseConverter(ABC):
     """Classe base abstrata para conversores de PDF"""
     
+    # Metadados usados pelo registro e pelo ConverterManager
+    key: str = ""
+    capabilities: Tuple[str, ...] = ("text",)
+    cost_per_page_ms: float = 100.0
+    memory_mb: int = 100
+    thread_safe: bool = True
+    
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
@@ -23,18 +30,47 @@ class BaseConverter(ABC):
         pass
     
     @abstractmethod
+    def convert_pdf(self, pdf_content: bytes, filename: str, **options) -> Dict[str, Any]:
+        """
+        Converte o PDF para Markdown
+        
+        Opções que o conversor não suporta devem ser ignoradas, para que o
+        gerenciador possa repassar as mesmas opções a toda a cadeia de fallback.
+        """
+        pass
+    
     def convert(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Converte o PDF para Markdown"""
+        """Compatibilidade com a interface anterior (use convert_pdf)"""
+        return self.convert_pdf(file_content, filename)
+    
+    def shutdown(self):
+        """Libera os recursos próprios do conversor (pools de processos, etc.)"""
         pass
     
+    def supports(self, capability: str) -> bool:
+        """Verifica se o conversor declara a capacidade informada"""
+        return capability in self.capabilities
+    
+    def get_metadata(self) -> Dict[str, Any]:
+        """Retorna os metadados de capacidade e custo do conversor"""
+        return {
+            "key": self.key,
+            "capabilities": list(self.capabilities),
+            "cost_per_page_ms": self.cost_per_page_ms,
+            "memory_mb": self.memory_mb,
+            "thread_safe": self.thread_safe
+        }
+    
     def get_status(self) -> Dict[str, Any]:
         """Retorna o status do conversor"""
-        return {
+        status = {
             "name": self.name,
             "description": self.description,
             "available": self.available,
             "error": self.error
         }
+        status.update(self.get_metadata())
+        return status
     
     def __str__(self) -> str:
         return f"{self.name}: {self.description} ({'Disponível' if self.available else 'Não disponível'})"
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Checkpoints de conversões longas
+Os registros por página são gravados à medida que são extraídos; se a
+conversão for interrompida (deploy, reinício do contêiner), uma nova
+requisição para o mesmo documento retoma a partir das páginas já salvas
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Any, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DIR = os.getenv("PDF_CHECKPOINT_DIR")
+# Documentos menores que isto não compensam o custo de gravar checkpoints
+CHECKPOINT_MIN_PAGES = int(os.getenv("PDF_CHECKPOINT_MIN_PAGES", "32"))
+# Checkpoints abandonados são removidos após este período
+CHECKPOINT_TTL_HOURS = float(os.getenv("PDF_CHECKPOINT_TTL_HOURS", "24"))
+
+
+class Checkpoint:
+    """Progresso de um documento: páginas concluídas e arquivo de continuação"""
+
+    def __init__(self, path: Path, on_close: Optional[Callable[[], None]] = None):
+        self.path = path
+        self._on_close = on_close
+        self.pages: Dict[int, Optional[Dict[str, Any]]] = self._load()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _load(self) -> Dict[int, Optional[Dict[str, Any]]]:
+        pages: Dict[int, Optional[Dict[str, Any]]] = {}
+        if not self.path.exists():
+            return pages
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Linha truncada pela interrupção
+                    continue
+                pages[entry["page"]] = entry.get("record")
+        return pages
+
+    def add(self, page: int, record: Optional[Dict[str, Any]]):
+        """Registra uma página concluída (record None para página sem texto)"""
+        self._file.write(json.dumps({"page": page, "record": record}, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        """Fecha o arquivo mantendo o progresso para uma retomada"""
+        if not self._file.closed:
+            self._file.close()
+            if self._on_close is not None:
+                self._on_close()
+
+    def complete(self):
+        """Conversão concluída: o checkpoint não é mais necessário"""
+        try:
+            self.path.unlink()
+        except FileNotFoundError:
+            pass
+        self.close()
+
+
+class CheckpointStore:
+    """Diretório de checkpoints, um arquivo JSONL por documento e variante"""
+
+    def __init__(self, directory: str, min_pages: int = CHECKPOINT_MIN_PAGES,
+                 ttl_hours: float = CHECKPOINT_TTL_HOURS):
+        self.directory = Path(directory)
+        self.min_pages = min_pages
+        self.ttl_hours = ttl_hours
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._active: Set[str] = set()
+        self._lock = threading.Lock()
+        self.purge_expired()
+
+    def open(self, doc_hash: str, variant: str, pages: int) -> Optional[Checkpoint]:
+        """
+        Checkpoint do documento (com as páginas já salvas, se houver)
+
+        Retorna None para documentos pequenos ou se o mesmo documento já está
+        sendo convertido por outra requisição neste processo.
+        """
+        if pages < self.min_pages:
+            return None
+        key = f"{doc_hash}-{variant.replace('=', '')}"
+        with self._lock:
+            if key in self._active:
+                return None
+            self._active.add(key)
+        try:
+            checkpoint = Checkpoint(self.directory / f"{key}.jsonl", lambda: self._release(key))
+        except OSError as e:
+            self._release(key)
+            logger.warning("Checkpoint indisponível para %s: %s", doc_hash[:12], e)
+            return None
+        if checkpoint.pages:
+            logger.info("Retomando %s a partir de %d páginas salvas", doc_hash[:12], len(checkpoint.pages))
+        return checkpoint
+
+    def _release(self, key: str):
+        with self._lock:
+            self._active.discard(key)
+
+    def purge_expired(self):
+        """Remove checkpoints mais antigos que ttl_hours"""
+        cutoff = time.time() - self.ttl_hours * 3600
+        for path in self.directory.glob("*.jsonl"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+            except OSError:
+                pass
+
+    def get_status(self) -> Dict[str, Any]:
+        """Checkpoints pendentes no diretório"""
+        return {
+            "directory": str(self.directory),
+            "pending": sum(1 for _ in self.directory.glob("*.jsonl")),
+            "active": len(self._active),
+            "min_pages": self.min_pages
+        }
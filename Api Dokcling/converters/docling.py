@@ -3,22 +3,90 @@ Conversor Docling para conversão real de PDF para Markdown
 """
 
 from .base import BaseConverter
-from typing import Dict, Any, Optional
+from .registry import register_converter
+from .assets import AssetStore, EXTRACT_IMAGES_DEFAULT
+from io import BytesIO
+from typing import Dict, Any, Optional, Tuple
 import logging
 import tempfile
+import threading
 import os
 
 logger = logging.getLogger(__name__)
 
+# Perfis de pipeline por requisição (opção pipeline); "accurate" equivale ao
+# DocumentConverter() padrão: OCR e o modelo de tabelas completo, sem gerar
+# as imagens das figuras (geradas só quando extract_images é pedido)
+DOCLING_PIPELINES: Dict[str, Dict[str, Any]] = {
+    "fast": {"do_ocr": False, "do_table_structure": False, "table_mode": None},
+    "balanced": {"do_ocr": False, "do_table_structure": True, "table_mode": "fast"},
+    "accurate": {"do_ocr": True, "do_table_structure": True, "table_mode": "accurate"}
+}
+DEFAULT_PIPELINE = os.getenv("DOCLING_PIPELINE", "accurate")
+if DEFAULT_PIPELINE not in DOCLING_PIPELINES:
+    DEFAULT_PIPELINE = "accurate"
+
+# Marcador das figuras no Markdown exportado, trocado pelas URLs dos assets
+_IMAGE_PLACEHOLDER = "<!-- image -->"
+
+
+def _pipeline_options_supported() -> bool:
+    """Indica se o Docling instalado expõe as opções do pipeline de PDF"""
+    try:
+        from docling.datamodel.base_models import InputFormat
+        from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+        from docling.document_converter import PdfFormatOption
+    except ImportError:
+        return False
+    return True
+
+
+def _build_document_converter(pipeline: str, images: bool = False):
+    """
+    DocumentConverter configurado para o perfil de pipeline informado
+
+    Com images, o pipeline também gera as imagens das figuras. Requer um
+    Docling com PdfPipelineOptions (ver _pipeline_options_supported).
+    """
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+    from docling.document_converter import DocumentConverter, PdfFormatOption
+    
+    settings = DOCLING_PIPELINES[pipeline]
+    pipeline_options = PdfPipelineOptions()
+    pipeline_options.do_ocr = settings["do_ocr"]
+    pipeline_options.do_table_structure = settings["do_table_structure"]
+    if settings["table_mode"]:
+        pipeline_options.table_structure_options.mode = (
+            TableFormerMode.ACCURATE if settings["table_mode"] == "accurate" else TableFormerMode.FAST
+        )
+    pipeline_options.generate_page_images = False
+    pipeline_options.generate_picture_images = images
+    
+    return DocumentConverter(format_options={
+        InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+    })
+
+@register_converter("docling")
 class DoclingConverter(BaseConverter):
     """Conversor Docling para conversão real de PDFs"""
     
+    capabilities = ("text", "tables", "layout", "ocr", "images")
+    cost_per_page_ms = 1500.0
+    memory_mb = 2048
+    thread_safe = False
+    
     def __init__(self):
         super().__init__(
             name="Docling Converter",
             description="Conversor real de PDFs usando Docling"
         )
         self.converter = None
+        self.pipeline_options_supported = False
+        # Um DocumentConverter por perfil (e com/sem imagens), criado no primeiro uso
+        self._converters: Dict[Tuple[str, bool], Any] = {}
+        self._converters_lock = threading.Lock()
+        self.asset_store = AssetStore()
         self._initialize()
     
     def _initialize(self):
@@ -28,7 +96,15 @@ class DoclingConverter(BaseConverter):
             from docling.document_converter import DocumentConverter
             logger.info("Docling importado com sucesso, inicializando converter...")
             
-            self.converter = DocumentConverter()
+            self.pipeline_options_supported = _pipeline_options_supported()
+            if self.pipeline_options_supported:
+                self.converter = _build_document_converter(DEFAULT_PIPELINE)
+                self._converters[(DEFAULT_PIPELINE, False)] = self.converter
+            else:
+                # Versões antigas do Docling não expõem as opções do pipeline:
+                # um único DocumentConverter atende todos os perfis
+                logger.warning("⚠️ Docling sem PdfPipelineOptions; perfis de pipeline usam a configuração padrão")
+                self.converter = DocumentConverter()
             self.available = True
             self.error = None
             logger.info("✅ Docling converter inicializado com sucesso")
@@ -54,55 +130,162 @@ class DoclingConverter(BaseConverter):
         """Verifica se o Docling está disponível"""
         return self.available and self.converter is not None
     
-    def convert(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Converte PDF para Markdown usando Docling"""
+    def get_converter(self, pipeline: Optional[str] = None, images: bool = False):
+        """
+        DocumentConverter em cache do perfil (padrão: DOCLING_PIPELINE)
+        
+        Sem suporte a PdfPipelineOptions, retorna sempre o conversor padrão
+        compartilhado, em vez de criar cópias idênticas por perfil.
+        """
+        pipeline = pipeline or DEFAULT_PIPELINE
+        if pipeline not in DOCLING_PIPELINES:
+            raise ValueError(f"Perfil de pipeline inválido: {pipeline}")
+        if not self.pipeline_options_supported:
+            return self.converter
+        
+        key = (pipeline, images)
+        converter = self._converters.get(key)
+        if converter is None:
+            with self._converters_lock:
+                converter = self._converters.get(key)
+                if converter is None:
+                    logger.info("Inicializando pipeline Docling: %s%s", pipeline, " (imagens)" if images else "")
+                    converter = _build_document_converter(pipeline, images)
+                    self._converters[key] = converter
+        return converter
+    
+    def convert_pdf(self, pdf_content: bytes, filename: str, pipeline: Optional[str] = None,
+                    extract_images: Optional[bool] = None, **options) -> Dict[str, Any]:
+        """
+        Converte PDF para Markdown usando Docling (opções não suportadas são ignoradas)
+        
+        Args:
+            pipeline: Perfil do pipeline (fast, balanced, accurate)
+            extract_images: Grava as figuras no AssetStore e as referencia no
+                Markdown por URL (None usa PDF_EXTRACT_IMAGES); usa uma
+                variante do perfil que gera as imagens das figuras
+        """
+        if extract_images is None:
+            extract_images = EXTRACT_IMAGES_DEFAULT
         if not self.is_available():
             raise RuntimeError("Docling não está disponível")
         
-        logger.info(f"Convertendo com Docling: {filename}")
+        pipeline = pipeline or DEFAULT_PIPELINE
+        converter = self.get_converter(pipeline, images=bool(extract_images))
+        logger.debug("Convertendo com Docling (%s): %s", pipeline, filename)
         
         try:
             # Salva temporariamente o PDF
             with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                tmp.write(file_content)
+                tmp.write(pdf_content)
                 tmp_path = tmp.name
             
-            logger.info(f"Arquivo temporário criado: {tmp_path}")
+            logger.debug("Arquivo temporário criado: %s", tmp_path)
             
             try:
                 # Converte para markdown usando Docling
-                doc = self.converter.convert(tmp_path).document
-                markdown_content = doc.export_to_markdown()
+                doc = converter.convert(tmp_path).document
+                images = None
+                warning = None
+                if extract_images and not self.pipeline_options_supported:
+                    markdown_content = doc.export_to_markdown()
+                    warning = "Imagens não extraídas: esta versão do Docling não gera as imagens das figuras"
+                elif extract_images:
+                    markdown_content, images, warning = self._export_with_images(doc)
+                else:
+                    markdown_content = doc.export_to_markdown()
                 
-                logger.info(f"Conversão Docling concluída com sucesso para: {filename}")
+                logger.debug("Conversão Docling concluída com sucesso para: %s", filename)
                 
-                return {
+                result = {
                     "success": True,
                     "filename": filename,
                     "markdown": markdown_content,
                     "message": "PDF convertido com sucesso usando Docling",
                     "mode": "full",
-                    "converter": self.name
+                    "converter": self.name,
+                    "converter_used": self.name,
+                    "pipeline": pipeline,
+                    "size_bytes": len(pdf_content)
                 }
+                if images is not None:
+                    result["images"] = images
+                if warning:
+                    logger.warning("Docling (%s): %s", filename, warning)
+                    result["warning"] = warning
+                return result
                 
             finally:
                 # Limpa o arquivo temporário
                 try:
                     os.unlink(tmp_path)
-                    logger.info(f"Arquivo temporário removido: {tmp_path}")
+                    logger.debug("Arquivo temporário removido: %s", tmp_path)
                 except Exception as cleanup_error:
-                    logger.warning(f"Erro ao remover arquivo temporário: {cleanup_error}")
+                    logger.warning("Erro ao remover arquivo temporário: %s", cleanup_error)
                     
         except Exception as e:
-            logger.error(f"Erro na conversão Docling: {e}")
+            logger.error("Erro na conversão Docling: %s", e)
             raise RuntimeError(f"Falha na conversão Docling: {e}")
     
+    def _export_with_images(self, doc) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Markdown com as figuras gravadas no AssetStore, na ordem do documento
+        
+        Retorna (markdown, estatísticas, aviso); o aviso explica por que as
+        imagens pedidas não foram extraídas (ou só em parte).
+        """
+        pictures = getattr(doc, "pictures", None)
+        if pictures is None:
+            return (doc.export_to_markdown(), None,
+                    "Imagens não extraídas: esta versão do Docling não expõe as figuras do documento")
+        try:
+            markdown = doc.export_to_markdown(image_placeholder=_IMAGE_PLACEHOLDER)
+        except TypeError:
+            return (doc.export_to_markdown(), None,
+                    "Imagens não extraídas: esta versão do Docling não marca as figuras no Markdown")
+        
+        stats = {"count": 0, "new_assets": 0, "skipped": 0}
+        references = []
+        for picture in pictures:
+            image = picture.get_image(doc) if hasattr(picture, "get_image") else None
+            if image is None:
+                references.append("")
+                stats["skipped"] += 1
+                continue
+            output = BytesIO()
+            image.save(output, format="PNG")
+            asset_id, new = self.asset_store.put_bytes(output.getvalue(), "png")
+            references.append(f"![]({self.asset_store.url(asset_id)})")
+            stats["count"] += 1
+            stats["new_assets"] += int(new)
+        
+        parts = markdown.split(_IMAGE_PLACEHOLDER)
+        if len(parts) - 1 != len(references):
+            # Figuras fora do corpo exportado: mantém o Markdown sem as URLs
+            return (markdown.replace(_IMAGE_PLACEHOLDER, ""), stats,
+                    f"Imagens não referenciadas: {len(parts) - 1} marcadores para {len(references)} figuras")
+        
+        pieces = [parts[0]]
+        for reference, part in zip(references, parts[1:]):
+            pieces.append(reference)
+            pieces.append(part)
+        
+        warning = None
+        if stats["skipped"]:
+            warning = f"{stats['skipped']} figura(s) sem imagem gerada pelo pipeline"
+        return "".join(pieces), stats, warning
+    
     def get_detailed_status(self) -> Dict[str, Any]:
         """Retorna status detalhado do conversor"""
         status = self.get_status()
         status.update({
             "converter_instance": "Disponível" if self.converter else "Não disponível",
             "initialization_success": self.available,
+            "default_pipeline": DEFAULT_PIPELINE,
+            "pipeline_options_supported": self.pipeline_options_supported,
+            "loaded_pipelines": sorted(
+                f"{pipeline}+images" if images else pipeline for pipeline, images in self._converters
+            ),
             "recommendations": [
                 "Use o modo simples para testes" if not self.available else "Docling funcionando perfeitamente",
                 "Instale Docling: pip install docling" if not self.available else "Conversão real ativa",
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Índice persistente (SQLite) de impressões digitais de páginas
+Permite reaproveitar o resultado de páginas já extraídas e detectar
+documentos quase duplicados (reexportados, com capa diferente etc.)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_DB = os.getenv("PDF_FINGERPRINT_DB")
+NEAR_DUPLICATE_RATIO = float(os.getenv("PDF_NEAR_DUPLICATE_RATIO", "0.6"))
+
+# Marca páginas sem camada de texto, para não reprocessá-las
+EMPTY_PAGE = None
+
+# Profundidade máxima percorrida nos objetos das fontes e XObjects
+_MAX_OBJECT_DEPTH = 12
+# Chaves que apontam para fora do objeto (árvore de páginas, anotações)
+_SKIPPED_KEYS = {"Parent", "P", "StructParents", "Metadata"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_hash TEXT PRIMARY KEY,
+    filename TEXT,
+    pages INTEGER,
+    created_at REAL
+);
+CREATE TABLE IF NOT EXISTS doc_pages (
+    doc_hash TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (doc_hash, page)
+);
+CREATE INDEX IF NOT EXISTS idx_doc_pages_fingerprint ON doc_pages (fingerprint);
+CREATE TABLE IF NOT EXISTS page_results (
+    fingerprint TEXT NOT NULL,
+    variant TEXT NOT NULL,
+    record TEXT,
+    PRIMARY KEY (fingerprint, variant)
+);
+"""
+
+
+def page_fingerprint(page: Any, cache: Optional[Dict[int, bytes]] = None) -> str:
+    """
+    Impressão digital do conteúdo de uma página do pdfplumber
+
+    Usa os streams de conteúdo decodificados, o MediaBox, as fontes (com
+    codificação, ToUnicode e arquivos de fonte) e os XObjects
+    (imagens/formulários, com os próprios recursos) referenciados, sem
+    análise de layout. Conteúdo igual com fontes diferentes extrai texto
+    diferente, por isso as fontes fazem parte da impressão digital.
+
+    cache guarda o hash de objetos indiretos já vistos; compartilhado entre
+    as páginas de um documento, fontes e imagens comuns são lidas uma vez.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    if cache is None:
+        cache = {}
+    page_obj = page.page_obj
+    digest = hashlib.sha256()
+    digest.update(repr([round(float(v), 2) for v in page_obj.mediabox]).encode())
+
+    for stream in page_obj.contents:
+        stream = resolve1(stream)
+        if hasattr(stream, "get_data"):
+            digest.update(stream.get_data())
+
+    resources = resolve1(page_obj.resources) or {}
+    for key in ("Font", "XObject"):
+        entries = resolve1(resources.get(key)) if isinstance(resources, dict) else None
+        if isinstance(entries, dict):
+            for name in sorted(entries, key=str):
+                digest.update(f"{key}/{name}".encode())
+                digest.update(_object_digest(entries[name], cache))
+
+    return digest.hexdigest()
+
+
+def _object_digest(obj: Any, cache: Dict[int, bytes], depth: int = 0) -> bytes:
+    """
+    Hash canônico de um objeto PDF (dicionários, listas e streams, seguindo
+    referências indiretas; streams entram pelos bytes brutos)
+    """
+    from pdfminer.pdftypes import PDFObjRef, PDFStream
+
+    objid = obj.objid if isinstance(obj, PDFObjRef) else None
+    if objid is not None:
+        cached = cache.get(objid)
+        if cached is not None:
+            return cached
+        # Marca antes de descer, para não seguir ciclos (/Parent etc.)
+        cache[objid] = b"cycle:%d" % objid
+        obj = obj.resolve()
+
+    digest = hashlib.sha256()
+    if depth > _MAX_OBJECT_DEPTH:
+        digest.update(b"...")
+    elif isinstance(obj, PDFStream):
+        digest.update(b"stream")
+        digest.update(_object_digest(obj.attrs, cache, depth + 1))
+        digest.update(obj.get_rawdata() or b"")
+    elif isinstance(obj, dict):
+        digest.update(b"dict")
+        for key in sorted(obj, key=str):
+            if key in _SKIPPED_KEYS:
+                continue
+            digest.update(str(key).encode())
+            digest.update(_object_digest(obj[key], cache, depth + 1))
+    elif isinstance(obj, (list, tuple)):
+        digest.update(b"list")
+        for item in obj:
+            digest.update(_object_digest(item, cache, depth + 1))
+    else:
+        digest.update(repr(getattr(obj, "name", obj)).encode())
+
+    value = digest.digest()
+    if objid is not None:
+        cache[objid] = value
+    return value
+
+
+class FingerprintIndex:
+    """Índice SQLite de páginas por impressão digital"""
+
+    def __init__(self, path: str, near_duplicate_ratio: float = NEAR_DUPLICATE_RATIO):
+        self.path = path
+        self.near_duplicate_ratio = near_duplicate_ratio
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def lookup_pages(self, fingerprints: List[str], variant: str) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Resultados já armazenados para as impressões digitais informadas
+
+        Páginas sem texto aparecem com valor EMPTY_PAGE.
+        """
+        unique = list(dict.fromkeys(fingerprints))
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        with self._lock:
+            for batch in _batches(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT fingerprint, record FROM page_results "
+                    f"WHERE variant = ? AND fingerprint IN ({placeholders})",
+                    [variant, *batch]
+                ).fetchall()
+                for fingerprint, record in rows:
+                    found[fingerprint] = json.loads(record) if record else EMPTY_PAGE
+        return found
+
+    def find_near_duplicate(self, doc_hash: str, fingerprints: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Documento conhecido que compartilha a maior fração de páginas
+
+        Retorna None se a fração ficar abaixo de near_duplicate_ratio.
+        """
+        unique = list(dict.fromkeys(fingerprints))
+        if not unique:
+            return None
+
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for batch in _batches(unique):
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT doc_hash, COUNT(DISTINCT fingerprint) FROM doc_pages "
+                    f"WHERE fingerprint IN ({placeholders}) AND doc_hash != ? GROUP BY doc_hash",
+                    [*batch, doc_hash]
+                ).fetchall()
+                for match_hash, count in rows:
+                    counts[match_hash] = counts.get(match_hash, 0) + count
+
+            if not counts:
+                return None
+            match_hash, matched = max(counts.items(), key=lambda item: item[1])
+            row = self._conn.execute(
+                "SELECT filename, pages FROM documents WHERE doc_hash = ?", (match_hash,)
+            ).fetchone()
+
+        ratio = matched / len(unique)
+        if ratio < self.near_duplicate_ratio:
+            return None
+
+        return {
+            "doc_hash": match_hash,
+            "filename": row[0] if row else None,
+            "pages": row[1] if row else None,
+            "matched_pages": matched,
+            "ratio": round(ratio, 3)
+        }
+
+    def store(self, doc_hash: str, filename: str, fingerprints: List[str],
+              records: Dict[str, Optional[Dict[str, Any]]], variant: str):
+        """Grava o documento, suas páginas e os resultados novos por página"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO documents (doc_hash, filename, pages, created_at) VALUES (?, ?, ?, ?)",
+                    (doc_hash, filename, len(fingerprints), time.time())
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO doc_pages (doc_hash, page, fingerprint) VALUES (?, ?, ?)",
+                    [(doc_hash, page, fingerprint) for page, fingerprint in enumerate(fingerprints, 1)]
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO page_results (fingerprint, variant, record) VALUES (?, ?, ?)",
+                    [
+                        (fingerprint, variant, json.dumps(record, ensure_ascii=False) if record else None)
+                        for fingerprint, record in records.items()
+                    ]
+                )
+
+    def get_status(self) -> Dict[str, Any]:
+        """Tamanho do índice"""
+        with self._lock:
+            documents = self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+            pages = self._conn.execute("SELECT COUNT(*) FROM page_results").fetchone()[0]
+        return {
+            "path": self.path,
+            "documents": documents,
+            "page_results": pages,
+            "near_duplicate_ratio": self.near_duplicate_ratio
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _batches(items: List[str], size: int = 500) -> List[List[str]]:
+    """Divide a lista para respeitar o limite de parâmetros do SQLite"""
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Saúde dos conversores: taxa de erro e latência em janela móvel + circuit breaker
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+HEALTH_WINDOW = int(os.getenv("PDF_HEALTH_WINDOW", "100"))
+BREAKER_ERROR_RATE = float(os.getenv("PDF_BREAKER_ERROR_RATE", "0.5"))
+BREAKER_MIN_CALLS = int(os.getenv("PDF_BREAKER_MIN_CALLS", "10"))
+BREAKER_COOLDOWN_S = float(os.getenv("PDF_BREAKER_COOLDOWN_S", "30"))
+# p95 por página (ms) acima deste valor também abre o circuito (0 desabilita)
+BREAKER_SLOW_P95_MS = float(os.getenv("PDF_BREAKER_SLOW_P95_MS", "0"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class ConverterHealth:
+    """
+    Acompanha as últimas chamadas de um conversor e controla o circuit breaker
+
+    closed -> open quando a taxa de erro (ou o p95 por página) passa do limite;
+    open -> half_open após o cooldown, liberando uma única chamada de teste;
+    half_open -> closed se o teste passar, ou open novamente se falhar.
+
+    A latência é normalizada pelo número de páginas, para que documentos
+    grandes não pareçam lentidão do conversor. Falhas causadas pela entrada
+    (PDF corrompido, criptografado ou digitalizado sem OCR) não dizem nada
+    sobre a saúde do conversor e ficam fora da janela.
+    """
+
+    def __init__(self, key: str, window: int = HEALTH_WINDOW,
+                 error_rate_threshold: float = BREAKER_ERROR_RATE,
+                 min_calls: int = BREAKER_MIN_CALLS,
+                 cooldown_s: float = BREAKER_COOLDOWN_S,
+                 slow_p95_ms: float = BREAKER_SLOW_P95_MS):
+        self.key = key
+        self.error_rate_threshold = error_rate_threshold
+        self.min_calls = min_calls
+        self.cooldown_s = cooldown_s
+        self.slow_p95_ms = slow_p95_ms
+
+        self.state = CLOSED
+        self.opened_at: Optional[float] = None
+        self.open_count = 0
+        self.total_calls = 0
+        self.total_errors = 0
+        self.total_input_errors = 0
+
+        self._calls: deque = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Indica se o conversor pode receber a próxima chamada"""
+        return self.acquire() is not None
+
+    def acquire(self) -> Optional[bool]:
+        """
+        Reserva a próxima chamada
+
+        Returns:
+            None se o circuito não permite a chamada; senão, se ela é a
+            chamada de teste do half_open (que deve terminar em record() ou,
+            se nunca executar, em release_probe())
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return False
+
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.cooldown_s:
+                    return None
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+
+            # half_open: libera apenas uma chamada de teste por vez
+            if self._probe_in_flight:
+                return None
+            self._probe_in_flight = True
+            return True
+
+    def release_probe(self):
+        """Libera a chamada de teste reservada que não chegou a executar (ex.: cancelada)"""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+
+    def record(self, latency_ms: float, ok: bool, pages: Optional[int] = None,
+               input_error: bool = False):
+        """
+        Registra o resultado de uma chamada e atualiza o circuito
+
+        Args:
+            latency_ms: Duração da chamada
+            ok: Se a conversão teve sucesso
+            pages: Páginas do documento (None se desconhecido)
+            input_error: Falha atribuída à entrada, e não ao conversor
+        """
+        with self._lock:
+            self.total_calls += 1
+            if input_error:
+                self.total_input_errors += 1
+                if self.state == HALF_OPEN:
+                    # O teste não foi conclusivo: libera outra chamada de teste
+                    self._probe_in_flight = False
+                return
+
+            per_page_ms = latency_ms / pages if pages else None
+            self._calls.append((latency_ms, per_page_ms, ok))
+            if not ok:
+                self.total_errors += 1
+
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if ok:
+                    self.state = CLOSED
+                    self.opened_at = None
+                    self._calls.clear()
+                    logger.info(f"✅ Circuito de '{self.key}' fechado")
+                else:
+                    self._open()
+                return
+
+            if self.state == CLOSED and self._should_open():
+                self._open()
+
+    def _should_open(self) -> bool:
+        if len(self._calls) < self.min_calls:
+            return False
+        if self._error_rate() >= self.error_rate_threshold:
+            return True
+        if not self.slow_p95_ms:
+            return False
+        p95 = self._page_percentile(95)
+        return p95 is not None and p95 > self.slow_p95_ms
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.open_count += 1
+        logger.warning(f"⚠️ Circuito de '{self.key}' aberto por {self.cooldown_s:.0f}s")
+
+    def _error_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for _, _, ok in self._calls if not ok) / len(self._calls)
+
+    def _percentile(self, percentile: float) -> Optional[float]:
+        return _percentile([latency for latency, _, _ in self._calls], percentile)
+
+    def _page_samples(self) -> list:
+        return [per_page for _, per_page, _ in self._calls if per_page is not None]
+
+    def _page_percentile(self, percentile: float) -> Optional[float]:
+        return _percentile(self._page_samples(), percentile)
+
+    def error_rate(self) -> float:
+        """Taxa de erro na janela atual"""
+        with self._lock:
+            return self._error_rate()
+
+    def latency_percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Percentil de latência (ms) na janela, ou None se houver poucas amostras"""
+        with self._lock:
+            if len(self._calls) < min_samples:
+                return None
+            return self._percentile(percentile)
+
+    def page_latency_percentile(self, percentile: float, min_samples: int = 1) -> Optional[float]:
+        """Percentil de latência por página (ms), ou None se houver poucas amostras"""
+        with self._lock:
+            samples = self._page_samples()
+            if len(samples) < min_samples:
+                return None
+            return _percentile(samples, percentile)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna o estado do circuito e as métricas da janela"""
+        with self._lock:
+            retry_in = None
+            if self.state == OPEN:
+                retry_in = max(0.0, self.cooldown_s - (time.monotonic() - self.opened_at))
+            p50, p95 = self._percentile(50), self._percentile(95)
+            page_p95 = self._page_percentile(95)
+            return {
+                "breaker_state": self.state,
+                "breaker_open_count": self.open_count,
+                "breaker_retry_in_s": round(retry_in, 1) if retry_in is not None else None,
+                "window_calls": len(self._calls),
+                "error_rate": round(self._error_rate(), 3),
+                "latency_p50_ms": round(p50, 1) if p50 is not None else None,
+                "latency_p95_ms": round(p95, 1) if p95 is not None else None,
+                "latency_p95_ms_per_page": round(page_p95, 2) if page_p95 is not None else None,
+                "total_calls": self.total_calls,
+                "total_errors": self.total_errors,
+                "total_input_errors": self.total_input_errors
+            }
+
+
+def _percentile(values: list, percentile: float) -> Optional[float]:
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(percentile / 100 * (len(values) - 1))))
+    return values[index]
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Inspeção rápida de PDFs (somente metadados)
+A criptografia é lida direto do dicionário do trailer, nos bytes do arquivo;
+número de páginas, produtor e indícios de camada de texto vêm do catálogo,
+por um PdfReader que só resolve os objetos consultados, sem construir os
+objetos de página nem decodificar streams de conteúdo
+"""
+
+import logging
+import os
+import re
+import time
+from io import BytesIO
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Páginas examinadas para estimar se o documento tem camada de texto
+TEXT_HINT_SAMPLE = int(os.getenv("PDF_INSPECT_SAMPLE_PAGES", "8"))
+
+_HEADER_RE = re.compile(rb"%PDF-(\d\.\d)")
+_LINEARIZED_RE = re.compile(rb"/Linearized\s")
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_ENCRYPT_RE = re.compile(rb"/Encrypt\s*(?:(\d+)\s+(\d+)\s+R|<<)")
+_ENCRYPT_FIELDS = {
+    "filter": re.compile(rb"/Filter\s*/(\w+)"),
+    "version": re.compile(rb"/V\s+(\d+)"),
+    "revision": re.compile(rb"/R\s+(\d+)")
+}
+
+# Dicionário de linearização fica no primeiro objeto, no início do arquivo
+_LINEARIZED_WINDOW = 1024
+# startxref e o trailer ficam no fim do arquivo; o dicionário de um xref
+# stream fica no início do objeto apontado por startxref
+_TRAILER_WINDOW = 4096
+
+
+def inspect_pdf(pdf_content: bytes, sample_pages: int = TEXT_HINT_SAMPLE) -> Dict[str, Any]:
+    """
+    Metadados do PDF lidos pelo trailer/xref
+
+    Returns:
+        Dicionário com valid, version, pages, encrypted, needs_password,
+        linearized, producer/creator/title, text_layer (present, partial,
+        absent ou unknown) e o tempo gasto em inspect_ms
+    """
+    start = time.perf_counter()
+    header = _HEADER_RE.search(pdf_content[:1024])
+    info: Dict[str, Any] = {
+        "valid": False,
+        "version": header.group(1).decode() if header else None,
+        "size_bytes": len(pdf_content),
+        "pages": None,
+        "encrypted": False,
+        "needs_password": False,
+        "linearized": bool(_LINEARIZED_RE.search(pdf_content[:_LINEARIZED_WINDOW])),
+        "producer": None,
+        "creator": None,
+        "title": None,
+        "text_layer": "unknown"
+    }
+
+    encryption = _trailer_encryption(pdf_content)
+    if encryption is not None:
+        info["encrypted"] = True
+        info["encryption"] = encryption
+        # Muitos PDFs "protegidos" só restringem permissões (senha de usuário vazia)
+        info["needs_password"] = _needs_password(pdf_content)
+        if info["needs_password"] is not False:
+            # Sem a senha (ou sem como testá-la), strings e streams continuam ilegíveis
+            info["valid"] = True
+            if info["needs_password"] is None:
+                info["error"] = "Criptografia não suportada ou corrompida: não foi possível testar a senha vazia"
+            return _finish(info, start)
+
+    try:
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(BytesIO(pdf_content), strict=False)
+        root = reader.trailer["/Root"].get_object()
+        info["pages"] = int(root["/Pages"].get_object().get("/Count", 0))
+        info.update(_document_info(reader))
+        info.update(_text_layer_hints(root, sample_pages))
+        info["valid"] = True
+
+    except Exception as e:
+        info["error"] = f"{type(e).__name__}: {e}"
+        logger.debug("Inspeção do PDF falhou: %s", e)
+
+    return _finish(info, start)
+
+
+def _trailer_section(pdf_content: bytes) -> Optional[bytes]:
+    """Bytes do dicionário do trailer (ou do xref stream) mais recente"""
+    tail_start = max(0, len(pdf_content) - _TRAILER_WINDOW)
+    tail = pdf_content[tail_start:]
+    matches = list(_STARTXREF_RE.finditer(tail))
+    if not matches:
+        return None
+    startxref = matches[-1]
+
+    # Tabela xref clássica: "trailer << ... >>" logo antes de startxref
+    trailer = tail.rfind(b"trailer", 0, startxref.start())
+    if trailer != -1:
+        return tail[trailer:startxref.start()]
+
+    # PDF 1.5+: o trailer é o dicionário do xref stream
+    offset = int(startxref.group(1))
+    if offset >= len(pdf_content):
+        return None
+    section = pdf_content[offset:offset + _TRAILER_WINDOW]
+    end = section.find(b"stream")
+    return section[:end] if end != -1 else section
+
+
+def _trailer_encryption(pdf_content: bytes) -> Optional[Dict[str, Any]]:
+    """
+    Dados de /Encrypt lidos direto dos bytes do trailer (None se não criptografado)
+
+    O dicionário de criptografia nunca fica dentro de object streams, então
+    é localizado pelo cabeçalho "N G obj" do objeto referenciado.
+    """
+    section = _trailer_section(pdf_content)
+    if section is None:
+        # Trailer ilegível: procura a chave no fim do arquivo
+        section = pdf_content[-_TRAILER_WINDOW:]
+    match = _ENCRYPT_RE.search(section)
+    if match is None:
+        return None
+
+    body = section[match.end():]
+    if match.group(1) is not None:
+        header = re.compile(rb"(?<!\d)%s\s+%s\s+obj" % (match.group(1), match.group(2)))
+        found = None
+        for found in header.finditer(pdf_content):
+            pass
+        body = pdf_content[found.end():found.end() + _TRAILER_WINDOW] if found else b""
+        end = body.find(b"endobj")
+        body = body[:end] if end != -1 else body
+
+    encryption: Dict[str, Any] = {}
+    for key, pattern in _ENCRYPT_FIELDS.items():
+        value = pattern.search(body)
+        if value is not None:
+            raw = value.group(1).decode("latin-1")
+            encryption[key] = f"/{raw}" if key == "filter" else int(raw)
+    return encryption
+
+
+def _needs_password(pdf_content: bytes) -> Optional[bool]:
+    """
+    Testa a senha de usuário vazia (None se não foi possível testá-la)
+
+    O PyPDF2 precisa do pycryptodome para AES; sem ele (ou com um /Encrypt
+    corrompido ou não suportado), o teste é feito pelo pdfminer (que usa o
+    pacote cryptography).
+    """
+    try:
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(BytesIO(pdf_content), strict=False)
+        return not reader.decrypt("")
+    except Exception as e:
+        logger.debug("PyPDF2 não testou a senha vazia: %s", e)
+
+    try:
+        from pdfminer.pdfdocument import PDFDocument, PDFPasswordIncorrect
+        from pdfminer.pdfparser import PDFParser
+
+        try:
+            PDFDocument(PDFParser(BytesIO(pdf_content)), password="")
+            return False
+        except PDFPasswordIncorrect:
+            return True
+    except Exception as e:
+        logger.debug("Falha ao testar a senha vazia com pdfminer: %s", e)
+        return None
+
+
+def count_pages(pdf_content: bytes) -> Optional[int]:
+    """Número de páginas pelo /Count da árvore de páginas (None se ilegível)"""
+    return inspect_pdf(pdf_content, sample_pages=0)["pages"]
+
+
+def _finish(info: Dict[str, Any], start: float) -> Dict[str, Any]:
+    info["inspect_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return info
+
+
+def _document_info(reader: Any) -> Dict[str, Any]:
+    """Produtor, criador e título do dicionário /Info"""
+    info_ref = reader.trailer.get("/Info")
+    if info_ref is None:
+        return {}
+    document_info = info_ref.get_object()
+    return {
+        key.lower(): str(document_info[f"/{key}"])
+        for key in ("Producer", "Creator", "Title")
+        if document_info.get(f"/{key}") is not None
+    }
+
+
+def _iter_page_dicts(node: Any, inherited: Any = None) -> Iterator[Any]:
+    """Percorre a árvore de páginas, entregando (página, /Resources herdado)"""
+    node = node.get_object()
+    resources = node.get("/Resources", inherited)
+    if node.get("/Type") == "/Pages" or "/Kids" in node:
+        for kid in node.get("/Kids", []):
+            yield from _iter_page_dicts(kid, resources)
+    else:
+        yield node, resources
+
+
+def _has_images(resources: Any, depth: int = 1) -> bool:
+    """Verifica se os recursos usam imagens (também dentro de formulários)"""
+    xobjects = resources.get("/XObject")
+    if xobjects is None:
+        return False
+    xobjects = xobjects.get_object()
+    for name in xobjects:
+        xobject = xobjects[name].get_object()
+        subtype = xobject.get("/Subtype")
+        if subtype == "/Image":
+            return True
+        if subtype == "/Form" and depth > 0 and xobject.get("/Resources") is not None:
+            if _has_images(xobject["/Resources"].get_object(), depth - 1):
+                return True
+    return False
+
+
+def _text_layer_hints(root: Any, sample_pages: int) -> Dict[str, Any]:
+    """
+    Estima a camada de texto pelos recursos das primeiras páginas
+
+    Páginas com fontes e sem imagens provavelmente têm texto; páginas só com
+    imagens são provavelmente digitalizadas; com ambos, o resultado é
+    "partial". Os streams de conteúdo não são lidos.
+    """
+    if sample_pages <= 0:
+        return {}
+
+    sampled = with_fonts = with_images = text_only = image_only = 0
+    for _, resources in _iter_page_dicts(root["/Pages"]):
+        if sampled >= sample_pages:
+            break
+        sampled += 1
+        resources = resources.get_object() if resources is not None else {}
+        fonts = resources.get("/Font")
+        has_fonts = fonts is not None and len(fonts.get_object()) > 0
+        has_images = _has_images(resources)
+        with_fonts += has_fonts
+        with_images += has_images
+        text_only += has_fonts and not has_images
+        image_only += has_images and not has_fonts
+
+    if sampled == 0 or (with_fonts == 0 and with_images == 0):
+        text_layer = "unknown"
+    elif text_only == sampled:
+        text_layer = "present"
+    elif image_only == sampled:
+        text_layer = "absent"
+    else:
+        text_layer = "partial"
+
+    return {
+        "text_layer": text_layer,
+        "pages_sampled": sampled,
+        "pages_with_fonts": with_fonts,
+        "pages_with_images": with_images
+    }
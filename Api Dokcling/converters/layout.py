@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+Análise de layout por métricas de fonte (títulos, parágrafos e colunas)
+Uma primeira passada reúne os tamanhos de fonte de todo o documento; depois,
+os caracteres de cada página (pdfplumber) são carregados em arrays NumPy e,
+em lote, os tamanhos são agrupados em níveis de título, as linhas em
+parágrafos pelo espaçamento e as colunas detectadas pelas calhas verticais
+"""
+
+import hashlib
+import logging
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_ENABLED_DEFAULT = os.getenv("PDF_LAYOUT", "false").lower() in ("1", "true", "yes")
+# Tamanho mínimo (relativo ao corpo do texto) para uma linha ser título
+HEADING_RATIO = float(os.getenv("PDF_LAYOUT_HEADING_RATIO", "1.15"))
+# Os títulos ficam abaixo do "## Página N" do Markdown montado
+HEADING_BASE = 3
+# Níveis de título gerados; os tamanhos excedentes são agrupados no último
+# (0 desativa os títulos; limitado a "######")
+HEADING_LEVELS = min(max(0, int(os.getenv("PDF_LAYOUT_HEADING_LEVELS", "3"))), 7 - HEADING_BASE)
+# Largura mínima (pt) de uma calha vertical para separar colunas
+COLUMN_GUTTER_PT = float(os.getenv("PDF_LAYOUT_GUTTER_PT", "10"))
+
+# Tamanhos de fonte são agrupados em passos de meio ponto
+SIZE_STEP = 0.5
+# Tamanhos de título a menos desta distância (pt) formam o mesmo nível
+SIZE_CLUSTER_GAP = 1.0
+# Resolução (pt) do histograma de ocupação horizontal
+COLUMN_BIN_PT = 2.0
+# Fração mínima dos caracteres em cada lado de uma calha
+COLUMN_MIN_SHARE = 0.15
+# Linhas em negrito até este tamanho (no corpo do texto) viram o último nível de título
+BOLD_HEADING_MAX_CHARS = 80
+_BOLD_MARKERS = ("bold", "black", "heavy", "semibold", "demi")
+
+
+def is_available() -> bool:
+    """Verifica se o NumPy está instalado"""
+    try:
+        import numpy  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class LayoutAnalyzer:
+    """
+    Analisador de layout de um documento
+
+    O histograma de tamanhos de fonte é montado numa primeira passada por
+    todas as páginas (collect_page), de modo que o tamanho do corpo do texto
+    e os níveis de título são os mesmos em todo o documento. Sem a primeira
+    passada, o histograma é acumulado à medida que as páginas são analisadas.
+    Uma instância por conversão.
+    """
+
+    def __init__(self):
+        import numpy as np
+        self._np = np
+        self._sizes: Dict[float, int] = {}
+        self._collected = False
+        self._clusters: Optional[Tuple[float, List[float]]] = None
+
+    def collect_page(self, page):
+        """Primeira passada: acrescenta os tamanhos de fonte da página ao histograma"""
+        sizes = [
+            char["size"] for char in page.chars
+            if char.get("upright", True) and char["text"].strip()
+        ]
+        self._collected = True
+        if sizes:
+            self._update_histogram(self._np.round(self._np.array(sizes) / SIZE_STEP) * SIZE_STEP)
+            self._clusters = None
+
+    def page_markdown(self, page) -> Optional[str]:
+        """
+        Markdown da página a partir dos caracteres do pdfplumber
+
+        Returns:
+            Texto com títulos (###...) e parágrafos, ou None se a página não
+            tem caracteres horizontais (o chamador usa extract_text)
+        """
+        np = self._np
+        chars = [
+            char for char in page.chars
+            if char.get("upright", True) and char["text"].strip()
+        ]
+        if not chars:
+            return None
+
+        x0 = np.fromiter((char["x0"] for char in chars), float, len(chars))
+        x1 = np.fromiter((char["x1"] for char in chars), float, len(chars))
+        bottom = np.fromiter((char["bottom"] for char in chars), float, len(chars))
+        size = np.fromiter((char["size"] for char in chars), float, len(chars))
+        bold = np.fromiter(
+            (any(marker in char.get("fontname", "").lower() for marker in _BOLD_MARKERS) for char in chars),
+            bool, len(chars)
+        )
+        texts = [char["text"] for char in chars]
+
+        quantized = np.round(size / SIZE_STEP) * SIZE_STEP
+        if not self._collected:
+            self._update_histogram(quantized)
+            self._clusters = None
+        if self._clusters is None:
+            self._clusters = self._heading_clusters()
+        body_size, level_bounds = self._clusters
+
+        boundaries = self._column_boundaries(x0, x1, float(page.width))
+        lines = self._build_lines(x0, x1, bottom, size, quantized, bold, texts, boundaries)
+        blocks = self._build_blocks(lines, body_size, level_bounds)
+        return "\n\n".join(blocks)
+
+    def digest(self) -> str:
+        """
+        Resumo do corpo e dos níveis de título definidos pelo histograma
+
+        Páginas analisadas com o mesmo resumo geram o mesmo Markdown; ele
+        entra na variante do índice de impressões digitais, para que uma
+        página reaproveitada de outro documento mantenha os níveis deste.
+        """
+        if not self._sizes:
+            return "empty"
+        if self._clusters is None:
+            self._clusters = self._heading_clusters()
+        body_size, level_bounds = self._clusters
+        key = ",".join(f"{value:g}" for value in [body_size] + level_bounds)
+        return hashlib.sha256(key.encode()).hexdigest()[:12]
+
+    def _update_histogram(self, quantized):
+        values, counts = self._np.unique(quantized, return_counts=True)
+        for value, count in zip(values.tolist(), counts.tolist()):
+            self._sizes[value] = self._sizes.get(value, 0) + count
+
+    def _heading_clusters(self) -> Tuple[float, List[float]]:
+        """
+        Tamanho do corpo do texto e limites inferiores dos níveis de título
+
+        O corpo é o tamanho com mais caracteres no documento; os tamanhos
+        acima de HEADING_RATIO vezes o corpo são agrupados (lacunas maiores
+        que SIZE_CLUSTER_GAP separam níveis) do maior para o menor.
+        """
+        np = self._np
+        sizes = np.array(list(self._sizes.keys()))
+        counts = np.array(list(self._sizes.values()))
+        body_size = float(sizes[np.argmax(counts)])
+
+        headings = np.sort(sizes[sizes >= body_size * HEADING_RATIO])[::-1]
+        if not len(headings) or HEADING_LEVELS <= 0:
+            return body_size, []
+        # Cada cluster começa onde a lacuna para o tamanho anterior é grande
+        splits = np.flatnonzero(np.diff(headings) < -SIZE_CLUSTER_GAP) + 1
+        clusters = np.split(headings, splits)
+        # Limite inferior de cada nível (o último absorve os demais)
+        bounds = [float(cluster.min()) for cluster in clusters[:HEADING_LEVELS]]
+        bounds[-1] = float(headings.min())
+        return body_size, bounds
+
+    def _column_boundaries(self, x0, x1, width: float) -> List[float]:
+        """
+        Posições x que separam colunas
+
+        Uma calha é uma faixa vertical de pelo menos COLUMN_GUTTER_PT quase
+        sem caracteres (linhas que atravessam a página, como títulos, não a
+        anulam) com pelo menos COLUMN_MIN_SHARE dos caracteres de cada lado.
+        """
+        np = self._np
+        bins = int(width / COLUMN_BIN_PT) + 2
+        start = np.clip((x0 / COLUMN_BIN_PT).astype(int), 0, bins - 1)
+        end = np.clip((x1 / COLUMN_BIN_PT).astype(int) + 1, 0, bins - 1)
+        # Ocupação por faixa: soma acumulada das entradas/saídas de cada caractere
+        delta = np.zeros(bins + 1)
+        np.add.at(delta, start, 1)
+        np.add.at(delta, end, -1)
+        occupancy = np.cumsum(delta)[:bins]
+
+        left = int(start.min())
+        right = int(end.max())
+        if right - left < 4:
+            return []
+        filled = occupancy[left:right]
+        threshold = max(2.0, 0.1 * float(np.median(filled[filled > 0])))
+        empty = np.concatenate(([False], filled <= threshold, [False]))
+        edges = np.flatnonzero(np.diff(empty.astype(np.int8)))
+        run_starts, run_ends = edges[::2] + left, edges[1::2] + left
+
+        centers = (x0 + x1) / 2
+        total = len(centers)
+        boundaries = []
+        min_bins = COLUMN_GUTTER_PT / COLUMN_BIN_PT
+        for run_start, run_end in zip(run_starts, run_ends):
+            if run_end - run_start < min_bins:
+                continue
+            boundary = (run_start + run_end) / 2 * COLUMN_BIN_PT
+            share = np.count_nonzero(centers < boundary) / total
+            if COLUMN_MIN_SHARE <= share <= 1 - COLUMN_MIN_SHARE:
+                boundaries.append(boundary)
+        return boundaries
+
+    def _build_lines(self, x0, x1, bottom, size, quantized, bold, texts,
+                     boundaries: List[float]) -> List[Dict[str, Any]]:
+        """
+        Agrupa os caracteres em linhas (por coluna) com suas métricas
+
+        Caracteres com a linha de base próxima formam uma faixa; a faixa é
+        dividida onde passa de uma coluna para outra com um espaço maior que
+        o normal entre palavras. Segmentos que atravessam uma calha ficam com
+        coluna -1 (títulos e textos na largura da página).
+        """
+        np = self._np
+        tolerance = np.maximum(size * 0.3, 1.0)
+        order = np.argsort(bottom, kind="stable")
+        band_break = np.diff(bottom[order]) > tolerance[order][1:]
+        band = np.concatenate(([0], np.cumsum(band_break)))
+        # Dentro de cada faixa, da esquerda para a direita
+        within = np.lexsort((x0[order], band))
+        order, band = order[within], band[within]
+
+        column = np.searchsorted(np.array(boundaries), (x0 + x1) / 2) if boundaries \
+            else np.zeros(len(x0), dtype=int)
+        ox0, ox1, osize, ocolumn = x0[order], x1[order], size[order], column[order]
+        gap = ox0[1:] - ox1[:-1]
+        new_line = (np.diff(band) != 0) | (
+            (np.diff(ocolumn) != 0) & (gap > osize[1:] * 0.8)
+        )
+        starts = np.concatenate(([0], np.flatnonzero(new_line) + 1))
+
+        # Métricas por segmento em lote (reduceat sobre os índices de início)
+        seg_x0 = np.minimum.reduceat(ox0, starts)
+        seg_x1 = np.maximum.reduceat(ox1, starts)
+        seg_bottom = np.maximum.reduceat(bottom[order], starts)
+        seg_top = np.minimum.reduceat(bottom[order] - size[order], starts)
+        seg_chars = np.diff(np.append(starts, len(order)))
+        seg_size = np.maximum.reduceat(quantized[order], starts)
+        seg_bold = np.add.reduceat(bold[order].astype(int), starts) == seg_chars
+        seg_column = np.where(
+            np.minimum.reduceat(ocolumn, starts) == np.maximum.reduceat(ocolumn, starts),
+            np.minimum.reduceat(ocolumn, starts), -1
+        )
+        # Espaço entre palavras onde a distância passa de 15% do tamanho da fonte
+        space_after = np.append(gap > osize[:-1] * 0.15, False)
+
+        lines = []
+        ends = np.append(starts[1:], len(order))
+        for i, (first, last) in enumerate(zip(starts.tolist(), ends.tolist())):
+            parts = []
+            for k in range(first, last):
+                parts.append(texts[order[k]])
+                if k < last - 1 and space_after[k]:
+                    parts.append(" ")
+            lines.append({
+                "text": "".join(parts),
+                "x0": float(seg_x0[i]),
+                "x1": float(seg_x1[i]),
+                "top": float(seg_top[i]),
+                "bottom": float(seg_bottom[i]),
+                "size": float(seg_size[i]),
+                "bold": bool(seg_bold[i]),
+                "column": int(seg_column[i])
+            })
+        return self._reading_order(lines)
+
+    @staticmethod
+    def _reading_order(lines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Ordem de leitura: segmentos na largura da página separam seções; em
+        cada seção, as colunas são lidas da esquerda para a direita
+        """
+        lines.sort(key=lambda line: line["top"])
+        ordered: List[Dict[str, Any]] = []
+        section: List[Dict[str, Any]] = []
+        for line in lines:
+            if line["column"] == -1:
+                ordered.extend(sorted(section, key=lambda item: (item["column"], item["top"])))
+                ordered.append(line)
+                section = []
+            else:
+                section.append(line)
+        ordered.extend(sorted(section, key=lambda item: (item["column"], item["top"])))
+        return ordered
+
+    @staticmethod
+    def _heading_level(line: Dict[str, Any], body_size: float, level_bounds: List[float]) -> int:
+        """Nível de título da linha (0 para texto comum)"""
+        if len(line["text"]) > 200 or HEADING_LEVELS <= 0:
+            return 0
+        for level, bound in enumerate(level_bounds, 1):
+            if line["size"] >= bound:
+                return level
+        if (line["bold"] and len(line["text"]) <= BOLD_HEADING_MAX_CHARS
+                and not line["text"].endswith((".", ",", ";"))):
+            return min(len(level_bounds) + 1, HEADING_LEVELS)
+        return 0
+
+    def _build_blocks(self, lines: List[Dict[str, Any]], body_size: float,
+                      level_bounds: List[float]) -> List[str]:
+        """
+        Junta as linhas em títulos e parágrafos
+
+        Um parágrafo termina quando muda o nível de título ou a coluna, quando
+        o espaço vertical até a próxima linha passa de 0,8 vez o tamanho da
+        fonte (0,5 vez em títulos), ou quando a próxima linha tem recuo de
+        primeira linha.
+        """
+        blocks: List[str] = []
+        current: List[str] = []
+        current_level = 0
+        previous: Optional[Dict[str, Any]] = None
+
+        def flush():
+            if current:
+                text = current[0]
+                for part in current[1:]:
+                    # Palavra hifenizada na quebra de linha
+                    if text.endswith("-") and part[:1].islower():
+                        text = text[:-1] + part
+                    else:
+                        text = f"{text} {part}"
+                blocks.append(f"{'#' * (HEADING_BASE + current_level - 1)} {text}" if current_level else text)
+                current.clear()
+
+        for line in lines:
+            level = self._heading_level(line, body_size, level_bounds)
+            if previous is not None:
+                gap = line["top"] - previous["bottom"]
+                indent = line["x0"] - previous["x0"]
+                if (level != current_level
+                        or line["column"] != previous["column"]
+                        or gap > line["size"] * (0.5 if level else 0.8)
+                        or gap < -line["size"]
+                        or (not level and indent > line["size"] * 1.5)):
+                    flush()
+            current_level = level
+            current.append(line["text"])
+            previous = line
+        flush()
+        return blocks
@@ -5,23 +5,63 @@ Foca apenas no essencial para conversão PDF -> Markdown
 """
 
 import logging
-from typing import Dict, Any, List
-from .simple_pdf import SimplePDFConverter
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Dict, Any, List, Optional, Tuple
+from .base import BaseConverter
+from .health import ConverterHealth
+from .inspection import inspect_pdf
+from .profiling import ProfileStore, CPUProfile
+from .registry import get_registry, enabled_converter_keys
 
 logger = logging.getLogger(__name__)
 
+# Limites usados para dimensionar o pool de cada conversor
+MAX_WORKERS_PER_CONVERTER = int(os.getenv("PDF_CONVERTER_MAX_WORKERS", str(os.cpu_count() or 2)))
+MEMORY_BUDGET_MB = int(os.getenv("PDF_CONVERTER_MEMORY_BUDGET_MB", "4096"))
+
+# Execução "hedged": inicia o próximo conversor se o atual passar deste percentil
+# da latência por página, multiplicado pelas páginas do documento
+HEDGE_ENABLED = os.getenv("PDF_HEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+HEDGE_PERCENTILE = float(os.getenv("PDF_HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_SAMPLES = int(os.getenv("PDF_HEDGE_MIN_SAMPLES", "20"))
+
+# Capacidade exigida por cada opção de conversão
+OPTION_CAPABILITIES = {
+    "extract_tables": "tables",
+    "ocr": "ocr",
+    "layout": "layout",
+    "extract_images": "images"
+}
+
+# Motivos de fallback informados pelos conversores que se devem ao próprio PDF
+INPUT_FALLBACK_REASONS = ("no_text_layer",)
+
 class ConverterManager:
     """Gerenciador simplificado de conversores PDF"""
     
-    def __init__(self):
-        """Inicializa o gerenciador com conversores essenciais"""
+    def __init__(self, converter_names: Optional[str] = None, max_workers: Optional[int] = None):
+        """
+        Inicializa o gerenciador com os conversores habilitados no registro
+        
+        Args:
+            converter_names: Chaves separadas por vírgula (padrão: PDF_CONVERTERS)
+            max_workers: Threads por conversor (padrão: PDF_CONVERTER_MAX_WORKERS)
+        """
         logger.info("🔧 Inicializando conversores essenciais...")
+        self.max_workers = max_workers or MAX_WORKERS_PER_CONVERTER
         
-        # Lista de conversores disponíveis
-        self.converters: List[Any] = []
+        # Lista de conversores disponíveis e pool de execução de cada um
+        self.converters: List[BaseConverter] = []
+        self.pools: Dict[str, ThreadPoolExecutor] = {}
+        self.health: Dict[str, ConverterHealth] = {}
+        
+        # Traces das conversões perfiladas mais lentas
+        self.profiles = ProfileStore()
         
         # Inicializa conversores
-        self._initialize_converters()
+        self._initialize_converters(converter_names)
         
         # Seleciona o conversor ativo
         self.active_converter = self._select_active_converter()
@@ -30,22 +70,60 @@ class ConverterManager:
         if self.active_converter:
             logger.info(f"🎯 Conversor ativo: {self.active_converter.name}")
     
-    def _initialize_converters(self):
-        """Inicializa os conversores disponíveis"""
-        try:
-            # Conversor principal (PDF real)
-            pdf_converter = SimplePDFConverter()
-            self.converters.append(pdf_converter)
-            
-        except Exception as e:
-            logger.error(f"❌ Erro ao inicializar conversores: {e}")
+    def _initialize_converters(self, converter_names: Optional[str] = None):
+        """Inicializa os conversores habilitados no registro"""
+        registry = get_registry()
+        
+        for key in enabled_converter_keys(converter_names):
+            try:
+                converter = registry[key]()
+                self.converters.append(converter)
+                self.pools[key] = ThreadPoolExecutor(
+                    max_workers=self._pool_size(converter),
+                    thread_name_prefix=f"converter-{key}"
+                )
+                self.health[key] = ConverterHealth(key)
+            except Exception as e:
+                logger.error(f"❌ Erro ao inicializar conversor '{key}': {e}")
+    
+    def _pool_size(self, converter: BaseConverter) -> int:
+        """Dimensiona o pool pelo thread-safety e pela memória declarada"""
+        if not converter.thread_safe:
+            return 1
+        by_memory = MEMORY_BUDGET_MB // max(1, converter.memory_mb)
+        return max(1, min(self.max_workers, by_memory))
+    
+    def build_fallback_chain(self, **options) -> List[BaseConverter]:
+        """
+        Monta a cadeia de fallback para as opções da requisição
+        
+        Conversores disponíveis que suportam todas as capacidades pedidas vêm
+        primeiro; dentro de cada grupo, o menor custo por página tem prioridade.
+        Conversores de simulação (capacidade "mock") ficam sempre por último,
+        como resposta de emergência, independentemente do custo declarado.
+        O circuit breaker é aplicado na execução, não aqui.
+        """
+        required = [
+            capability for option, capability in OPTION_CAPABILITIES.items()
+            if options.get(option)
+        ]
+        
+        available = [c for c in self.converters if c.is_available()]
+        return sorted(
+            available,
+            key=lambda c: (
+                c.supports("mock"),
+                sum(1 for cap in required if not c.supports(cap)),
+                c.cost_per_page_ms
+            )
+        )
     
     def _select_active_converter(self):
         """Seleciona o conversor ativo baseado na disponibilidade"""
-        # Prioriza conversores reais sobre fallbacks
-        for converter in self.converters:
-            if hasattr(converter, 'available') and converter.available:
-                return converter
+        # Prioriza conversores reais, do menor custo para o maior
+        chain = self.build_fallback_chain()
+        if chain:
+            return chain[0]
         
         # Se não houver conversores reais, usa o primeiro disponível
         if self.converters:
@@ -53,13 +131,20 @@ class ConverterManager:
         
         return None
     
-    def convert_pdf(self, pdf_content: bytes, filename: str) -> Dict[str, Any]:
+    def convert_pdf(self, pdf_content: bytes, filename: str, **options) -> Dict[str, Any]:
         """
         Converte PDF para Markdown usando o conversor ativo
         
         Args:
             pdf_content: Conteúdo do arquivo PDF em bytes
             filename: Nome do arquivo PDF
+            **options: Opções repassadas ao conversor (ex.: extract_tables);
+                profile=True grava um trace com tempos e perfil de CPU
+            
+        PDFs que exigem senha são recusados sem acionar os conversores, e
+        documentos sem camada de texto recebem ocr=True se a opção não foi
+        informada. Falhas atribuíveis ao PDF (protegido, inválido,
+        criptografado ou sem camada de texto) trazem input_error=True.
             
         Returns:
             Dicionário com o resultado da conversão
@@ -67,13 +152,225 @@ class ConverterManager:
         if not self.active_converter:
             return self._error_response(filename, "Nenhum conversor disponível")
         
-        try:
-            logger.info(f"🔄 Convertendo {filename} usando {self.active_converter.name}")
-            return self.active_converter.convert_pdf(pdf_content, filename)
+        # Metadados lidos pelo trailer/xref orientam o roteamento
+        inspection = inspect_pdf(pdf_content)
+        if inspection["needs_password"]:
+            # Nenhum conversor consegue ler o conteúdo sem a senha
+            response = self._error_response(filename, "PDF protegido por senha")
+            response.update({"encrypted": True, "needs_password": True, "input_error": True})
+            return response
+        if inspection["encrypted"] and inspection["needs_password"] is None:
+            # Criptografia que não conseguimos testar: a tentativa de conversão decide
+            # (a falha conta como limitação do PDF, não do conversor)
+            logger.debug("%s criptografado; senha vazia não verificada", filename)
+        if inspection["text_layer"] == "absent" and options.get("ocr") is None:
+            # Documento digitalizado: prioriza conversores com OCR
+            logger.debug("%s sem camada de texto; habilitando OCR", filename)
+            options["ocr"] = True
+        
+        # Usados pela saúde dos conversores: latência por página e falhas
+        # atribuíveis ao próprio PDF, que não devem abrir o circuito
+        options["_pages"] = inspection["pages"]
+        options["_input_limited"] = (
+            not inspection["valid"] or inspection["encrypted"] or inspection["text_layer"] == "absent"
+        )
+        
+        if options.pop("profile", False):
+            result = self._profiled_convert(pdf_content, filename, **options)
+        else:
+            result = self._convert(pdf_content, filename, **options)
+        if not result.get("success") and options["_input_limited"]:
+            # Falha atribuível ao próprio PDF: repetir a conversão não adianta
+            result["input_error"] = True
+        return result
+    
+    def _profiled_convert(self, pdf_content: bytes, filename: str, **options) -> Dict[str, Any]:
+        """Converte com profiling e guarda o trace se estiver entre os mais lentos"""
+        options["page_timings"] = True
+        options["_profile"] = True
+        start = time.perf_counter()
+        result = self._convert(pdf_content, filename, **options)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        
+        profile = result.pop("_profile", None) or {}
+        trace_id = self.profiles.add(pdf_content, filename, elapsed_ms, result, profile)
+        result.pop("page_timings_ms", None)
+        if trace_id:
+            result["profile_id"] = trace_id
+        return result
+    
+    def _convert(self, pdf_content: bytes, filename: str, **options) -> Dict[str, Any]:
+        """Executa a cadeia de fallback (com circuit breaker e hedging)"""
+        # Sem conversores reais, o conversor ativo gera a resposta de fallback
+        chain = self.build_fallback_chain(**options) or [self.active_converter]
+        
+        # Conversores com circuito aberto são contornados; se todos estiverem
+        # abertos, o primeiro da cadeia é usado mesmo assim
+        candidates = iter(chain)
+        started = 0
+        hedged = False
+        pending: Dict[Future, BaseConverter] = {}
+        last_result = None
+        
+        while True:
+            if not pending:
+                converter, probe = self._next_allowed(candidates)
+                if converter is None:
+                    if started:
+                        break
+                    converter = chain[0]
+                pending[self._submit(converter, pdf_content, filename, probe, **options)] = converter
+                started += 1
             
-        except Exception as e:
-            logger.error(f"❌ Erro na conversão: {e}")
-            return self._error_response(filename, str(e))
+            # Sem resposta dentro do percentil de latência, inicia o próximo conversor
+            timeout = None if hedged else self._hedge_delay(list(pending.values())[-1], options.get("_pages"))
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            
+            if not done:
+                hedged = True
+                converter, probe = self._next_allowed(candidates)
+                if converter is not None:
+                    logger.info("%s: iniciando conversão paralela com %s", filename, converter.name)
+                    pending[self._submit(converter, pdf_content, filename, probe, **options)] = converter
+                    started += 1
+                continue
+            
+            for future in done:
+                converter = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error("Erro na conversão com %s: %s", converter.name, e)
+                    last_result = self._error_response(filename, str(e))
+                    continue
+                
+                if self._is_success(result):
+                    # Descarta chamadas paralelas que ainda não começaram
+                    for other in pending:
+                        other.cancel()
+                    if hedged:
+                        result["hedged"] = True
+                    return result
+                
+                # Resultado de fallback ou falha: tenta o próximo conversor da cadeia
+                last_result = result
+        
+        return last_result
+    
+    def _next_allowed(self, candidates) -> Tuple[Optional[BaseConverter], bool]:
+        """
+        Próximo conversor da cadeia cujo circuito permite chamadas
+        
+        Returns:
+            (conversor ou None, se a chamada é o teste do circuito half_open)
+        """
+        for converter in candidates:
+            health = self.health.get(converter.key)
+            if health is None:
+                return converter, False
+            probe = health.acquire()
+            if probe is not None:
+                return converter, probe
+            logger.debug("Circuito aberto, ignorando %s", converter.name)
+        return None, False
+    
+    def _hedge_delay(self, converter: BaseConverter, pages: Optional[int]) -> Optional[float]:
+        """
+        Tempo de espera (s) antes de iniciar um conversor paralelo
+        
+        O percentil é da latência por página, escalado pelas páginas do
+        documento; sem o número de páginas não há hedging.
+        """
+        if not HEDGE_ENABLED or not pages:
+            return None
+        health = self.health.get(converter.key)
+        if health is None:
+            return None
+        per_page_ms = health.page_latency_percentile(HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES)
+        return per_page_ms * pages / 1000 if per_page_ms is not None else None
+    
+    def _is_success(self, result: Dict[str, Any]) -> bool:
+        return bool(result.get("success")) and result.get("mode") != "fallback"
+    
+    def _submit(self, converter: BaseConverter, pdf_content: bytes,
+                filename: str, probe: bool = False, **options) -> Future:
+        """
+        Agenda a conversão no pool do conversor
+        
+        Se a chamada é o teste do circuito (probe) e for cancelada antes de
+        executar (perdeu a disputa "hedged" ainda na fila), o teste é liberado;
+        do contrário o circuito ficaria em half_open sem aceitar chamadas.
+        """
+        pool = self.pools.get(converter.key)
+        if pool is None:
+            future: Future = Future()
+            try:
+                future.set_result(self._timed_convert(converter, pdf_content, filename, **options))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        future = pool.submit(self._timed_convert, converter, pdf_content, filename, **options)
+        health = self.health.get(converter.key)
+        if probe and health is not None:
+            future.add_done_callback(lambda done: done.cancelled() and health.release_probe())
+        return future
+    
+    def _timed_convert(self, converter: BaseConverter, pdf_content: bytes,
+                       filename: str, **options) -> Dict[str, Any]:
+        """
+        Executa a conversão registrando latência e sucesso na saúde do conversor
+        
+        O registro acontece mesmo quando a chamada perdeu a disputa "hedged".
+        Falhas em PDFs corrompidos, criptografados ou sem camada de texto
+        (segundo a inspeção ou o fallback_reason do resultado) são registradas
+        como erros de entrada, sem contar contra o conversor.
+        """
+        logger.debug("Convertendo %s usando %s", filename, converter.name)
+        profile = CPUProfile() if options.pop("_profile", False) else None
+        # _pages segue para o conversor, que evita recontar as páginas
+        pages = options.get("_pages")
+        input_limited = options.pop("_input_limited", False)
+        start = time.perf_counter()
+        ok = False
+        try:
+            if profile is None:
+                result = converter.convert_pdf(pdf_content, filename, **options)
+            else:
+                # O perfil roda na thread do pool, onde a conversão acontece
+                with profile:
+                    result = converter.convert_pdf(pdf_content, filename, **options)
+                result["_profile"] = profile.export()
+            ok = self._is_success(result)
+            input_limited = input_limited or result.get("fallback_reason") in INPUT_FALLBACK_REASONS
+            return result
+        finally:
+            health = self.health.get(converter.key)
+            if health is not None:
+                health.record((time.perf_counter() - start) * 1000, ok, pages,
+                              input_error=input_limited and not ok)
+    
+    def get_health(self, converter: BaseConverter) -> Optional[Dict[str, Any]]:
+        """Retorna a saúde (circuit breaker, erro, latência) de um conversor"""
+        health = self.health.get(converter.key)
+        return health.get_status() if health else None
+    
+    def find_converter(self, converter_name: str) -> Optional[BaseConverter]:
+        """Busca um conversor pela chave ou por parte do nome"""
+        name = converter_name.lower()
+        for converter in self.converters:
+            if name == converter.key or name in converter.name.lower():
+                return converter
+        return None
+    
+    def shutdown(self):
+        """Encerra os pools de execução e os recursos próprios dos conversores"""
+        for pool in self.pools.values():
+            pool.shutdown(wait=False)
+        for converter in self.converters:
+            try:
+                converter.shutdown()
+            except Exception as e:
+                logger.warning("Falha ao encerrar %s: %s", converter.name, e)
     
     def _error_response(self, filename: str, error_message: str) -> Dict[str, Any]:
         """Gera resposta de erro padronizada"""
@@ -96,17 +393,15 @@ class ConverterManager:
                 "conversion_capability": "none"
             }
         
-        available_count = sum(1 for c in self.converters if hasattr(c, 'available') and c.available)
+        available_count = sum(1 for c in self.converters if c.is_available())
         
         converter_status = []
         for converter in self.converters:
-            if hasattr(converter, 'get_status'):
-                converter_status.append(converter.get_status())
-            else:
-                converter_status.append({
-                    "name": getattr(converter, 'name', 'Unknown'),
-                    "status": "unknown"
-                })
+            status = converter.get_status()
+            pool = self.pools.get(converter.key)
+            status["pool_size"] = pool._max_workers if pool else 0
+            status["health"] = self.get_health(converter)
+            converter_status.append(status)
         
         # Determina capacidade de conversão
         if available_count > 0:
@@ -122,6 +417,7 @@ class ConverterManager:
             "converters": converter_status,
             "active_converter": self.active_converter.get_status() if self.active_converter else None,
             "conversion_capability": capability,
+            "fallback_chain": [c.key for c in self.build_fallback_chain()],
             "mode": "essential"  # Modo essencial
         }
     
@@ -134,10 +430,7 @@ class ConverterManager:
             return recommendations
         
         # Verifica se há conversores reais
-        has_real_converter = any(
-            hasattr(c, 'available') and c.available 
-            for c in self.converters
-        )
+        has_real_converter = any(c.is_available() for c in self.converters)
         
         if not has_real_converter:
             recommendations.append("Para conversão completa, instale: pip install pypdf2 pdfplumber")
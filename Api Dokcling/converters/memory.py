@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Acompanhamento de memória (RSS) durante a conversão
+"""
+
+import os
+import sys
+from typing import Dict, Any
+
+# Páginas processadas entre as liberações dos caches do documento
+PAGE_WINDOW = int(os.getenv("PDF_PAGE_WINDOW", "64"))
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def current_rss_bytes() -> int:
+    """
+    RSS atual do processo
+
+    Usa /proc/self/statm (Linux) ou o working set (Windows); nos demais
+    sistemas recorre ao pico informado por getrusage, que é apenas uma
+    aproximação. Retorna 0 se nenhuma fonte estiver disponível.
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        pass
+
+    if sys.platform == "win32":
+        return _windows_working_set()
+
+    try:
+        import resource
+    except ImportError:
+        return 0
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS informa bytes; Linux e demais, kilobytes
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def _windows_working_set() -> int:
+    """Working set do processo pela API GetProcessMemoryInfo (psapi)"""
+    import ctypes
+    from ctypes import wintypes
+
+    class ProcessMemoryCounters(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t)
+        ]
+
+    try:
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return 0
+        return counters.WorkingSetSize
+    except (AttributeError, OSError):
+        return 0
+
+
+class MemoryTracker:
+    """
+    Pico de RSS observado durante uma conversão
+
+    O RSS é do processo inteiro: com conversões simultâneas no mesmo processo
+    o pico inclui o uso das outras requisições.
+    """
+
+    def __init__(self):
+        self.start = current_rss_bytes()
+        self.peak = self.start
+
+    def sample(self) -> int:
+        """Lê o RSS atual e atualiza o pico"""
+        rss = current_rss_bytes()
+        if rss > self.peak:
+            self.peak = rss
+        return rss
+
+    def report(self) -> Dict[str, Any]:
+        """Resumo em MB para a resposta da conversão"""
+        end = self.sample()
+        mb = 1024 * 1024
+        return {
+            "rss_start_mb": round(self.start / mb, 1),
+            "rss_peak_mb": round(self.peak / mb, 1),
+            "rss_end_mb": round(end / mb, 1),
+            "rss_peak_delta_mb": round((self.peak - self.start) / mb, 1)
+        }
+
+
+def release_page(page: Any):
+    """Libera os objetos de layout que o pdfplumber mantém em cache na página"""
+    page.close()
+
+
+def release_document_cache(pdf: Any):
+    """
+    Libera os objetos PDF já resolvidos pelo pdfminer (streams de conteúdo
+    decodificados das páginas já emitidas)
+
+    Objetos ainda necessários são apenas resolvidos de novo quando usados.
+    """
+    doc = getattr(pdf, "doc", None)
+    for attr in ("_cached_objs", "_parsed_objs"):
+        cache = getattr(doc, attr, None)
+        if isinstance(cache, dict):
+            cache.clear()
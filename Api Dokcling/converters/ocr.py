@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Estágio de OCR local para páginas sem camada de texto
+Renderiza as páginas com pypdfium2 e executa o Tesseract em um pool de processos
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+OCR_ENABLED_DEFAULT = os.getenv("PDF_OCR_ENABLED", "false").lower() in ("1", "true", "yes")
+OCR_DPI = int(os.getenv("PDF_OCR_DPI", "200"))
+OCR_LANG = os.getenv("PDF_OCR_LANG", "por+eng")
+OCR_MAX_WORKERS = int(os.getenv("PDF_OCR_MAX_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))))
+OCR_MAX_CONCURRENT = int(os.getenv("PDF_OCR_MAX_CONCURRENT", str(OCR_MAX_WORKERS)))
+OCR_CACHE_SIZE = int(os.getenv("PDF_OCR_CACHE_SIZE", "512"))
+OCR_CACHE_DIR = os.getenv("PDF_OCR_CACHE_DIR")
+
+
+def _ocr_page_worker(pdf_path: str, page_index: int, dpi: int, lang: str) -> str:
+    """Renderiza e aplica OCR a uma página (executa no processo do pool)"""
+    import pypdfium2 as pdfium
+    import pytesseract
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        page = pdf[page_index]
+        try:
+            image = page.render(scale=dpi / 72).to_pil()
+        finally:
+            page.close()
+        return pytesseract.image_to_string(image, lang=lang)
+    finally:
+        pdf.close()
+
+
+class OCRStage:
+    """OCR opcional com cache por página e limite de concorrência"""
+
+    def __init__(self, dpi: int = OCR_DPI, lang: str = OCR_LANG,
+                 max_workers: int = OCR_MAX_WORKERS,
+                 max_concurrent: int = OCR_MAX_CONCURRENT,
+                 cache_size: int = OCR_CACHE_SIZE,
+                 cache_dir: Optional[str] = OCR_CACHE_DIR):
+        self.dpi = dpi
+        self.lang = lang
+        self.max_workers = max(1, max_workers)
+        self.max_concurrent = max(1, max_concurrent)
+        self.cache_size = cache_size
+        self.cache_dir = cache_dir
+        self.available = False
+        self.error = None
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_concurrent)
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self._check_dependencies()
+
+    def _check_dependencies(self):
+        """Verifica se pypdfium2, pytesseract e o binário do Tesseract existem"""
+        try:
+            import pypdfium2  # noqa: F401
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            self.available = True
+        except Exception as e:
+            self.error = str(e)
+            logger.info(f"OCR indisponível: {e}")
+
+    def ocr_pages(self, pdf_content: bytes, page_numbers: List[int],
+                  doc_hash: Optional[str] = None) -> Tuple[Dict[int, str], int]:
+        """
+        Aplica OCR às páginas informadas (numeração a partir de 1)
+
+        Returns:
+            Tupla (texto por página, quantidade de páginas vindas do cache)
+        """
+        if not self.available or not page_numbers:
+            return {}, 0
+
+        doc_hash = doc_hash or hashlib.sha256(pdf_content).hexdigest()
+        texts: Dict[int, str] = {}
+        missing: List[int] = []
+
+        for page_number in page_numbers:
+            cached = self._cache_get(doc_hash, page_number)
+            if cached is None:
+                missing.append(page_number)
+            else:
+                texts[page_number] = cached
+
+        cache_hits = len(texts)
+        if not missing:
+            return texts, cache_hits
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
+            tmp.write(pdf_content)
+            tmp_path = tmp.name
+
+        try:
+            executor = self._get_executor()
+            futures = {}
+            for page_number in missing:
+                # Limita as páginas em OCR simultâneo entre todas as requisições
+                self._slots.acquire()
+                try:
+                    future = executor.submit(_ocr_page_worker, tmp_path, page_number - 1, self.dpi, self.lang)
+                except Exception:
+                    self._slots.release()
+                    raise
+                future.add_done_callback(lambda _: self._slots.release())
+                futures[page_number] = future
+
+            for page_number, future in futures.items():
+                try:
+                    text = future.result()
+                except BrokenProcessPool as e:
+                    logger.warning("Pool de OCR interrompido na página %d: %s", page_number, e)
+                    self._reset_executor(executor)
+                    continue
+                except Exception as e:
+                    logger.warning("OCR falhou na página %d: %s", page_number, e)
+                    continue
+                texts[page_number] = text
+                self._cache_put(doc_hash, page_number, text)
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+        return texts, cache_hits
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Cria o pool de processos sob demanda"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _reset_executor(self, broken: ProcessPoolExecutor):
+        """Descarta um pool quebrado para que a próxima chamada crie outro"""
+        with self._executor_lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _cache_key(self, doc_hash: str, page_number: int) -> str:
+        return f"{doc_hash}:{page_number}:{self.dpi}:{self.lang}"
+
+    def _cache_path(self, doc_hash: str, page_number: int) -> Optional[str]:
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, doc_hash[:2], doc_hash, f"{page_number}-{self.dpi}-{self.lang}.txt")
+
+    def _cache_get(self, doc_hash: str, page_number: int) -> Optional[str]:
+        """Busca o texto no cache em memória e depois no disco"""
+        key = self._cache_key(doc_hash, page_number)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+
+        path = self._cache_path(doc_hash, page_number)
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                text = f.read()
+            self._cache_put(doc_hash, page_number, text, persist=False)
+            return text
+
+        return None
+
+    def _cache_put(self, doc_hash: str, page_number: int, text: str, persist: bool = True):
+        """Armazena o texto no cache LRU (e no disco, se configurado)"""
+        key = self._cache_key(doc_hash, page_number)
+        with self._cache_lock:
+            self._cache[key] = text
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        path = self._cache_path(doc_hash, page_number)
+        if persist and path:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = f"{path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning(f"⚠️ Não foi possível gravar cache de OCR: {e}")
+
+    def shutdown(self):
+        """Encerra o pool de processos"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def get_status(self) -> Dict[str, Any]:
+        """Retorna o status do estágio de OCR"""
+        return {
+            "available": self.available,
+            "enabled_by_default": OCR_ENABLED_DEFAULT,
+            "dpi": self.dpi,
+            "lang": self.lang,
+            "max_workers": self.max_workers,
+            "max_concurrent_pages": self.max_concurrent,
+            "cached_pages": len(self._cache),
+            "cache_dir": self.cache_dir,
+            "error": self.error
+        }
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Profiling amostrado de conversões lentas
+Mantém em memória os N traces mais lentos (tempos por página/estágio e perfil
+de CPU) para download posterior pelos endpoints administrativos
+"""
+
+import cProfile
+import hashlib
+import heapq
+import io
+import logging
+import marshal
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Any, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MAX_TRACES = int(os.getenv("PROFILE_MAX_TRACES", "20"))
+PROFILE_TOP_FUNCTIONS = int(os.getenv("PROFILE_TOP_FUNCTIONS", "25"))
+
+
+def should_profile(requested: bool = False) -> bool:
+    """Decide se a requisição será perfilada (header de debug ou amostragem)"""
+    if requested:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], name: str):
+    """Registra em timings[name] a duração do bloco em milissegundos"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000, 2)
+
+
+class CPUProfile:
+    """
+    Perfil de CPU (cProfile) da thread atual
+
+    Se outro profiler já estiver ativo, o perfil é ignorado e apenas os
+    tempos são registrados.
+    """
+
+    def __init__(self):
+        self._profiler = cProfile.Profile()
+        self.active = False
+
+    def __enter__(self) -> "CPUProfile":
+        try:
+            self._profiler.enable()
+            self.active = True
+        except ValueError as e:
+            logger.warning(f"⚠️ Profiling de CPU indisponível: {e}")
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.active:
+            self._profiler.disable()
+
+    def export(self, top: int = PROFILE_TOP_FUNCTIONS) -> Dict[str, Any]:
+        """Resumo das funções mais custosas e o dump no formato pstats"""
+        if not self.active:
+            return {"top_functions": [], "pstats": None}
+
+        stats = pstats.Stats(self._profiler, stream=io.StringIO())
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+        top_functions = [
+            {
+                "function": f"{filename}:{line}({name})",
+                "ncalls": ncalls,
+                "tottime_ms": round(tottime * 1000, 2),
+                "cumtime_ms": round(cumtime * 1000, 2)
+            }
+            for (filename, line, name), (_, ncalls, tottime, cumtime, _) in rows
+        ]
+        return {"top_functions": top_functions, "pstats": marshal.dumps(stats.stats)}
+
+
+class ProfileStore:
+    """Guarda os traces mais lentos (até max_traces)"""
+
+    def __init__(self, max_traces: int = PROFILE_MAX_TRACES):
+        self.max_traces = max_traces
+        self._heap: List = []
+        self._traces: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, pdf_content: bytes, filename: str, elapsed_ms: float,
+            result: Dict[str, Any], profile: Dict[str, Any]) -> Optional[str]:
+        """
+        Registra um trace se ele estiver entre os mais lentos
+
+        Returns:
+            trace_id do trace armazenado, ou None se foi descartado
+        """
+        with self._lock:
+            if len(self._heap) >= self.max_traces and elapsed_ms <= self._heap[0][0]:
+                return None
+
+        trace_id = uuid.uuid4().hex
+        trace = {
+            "trace_id": trace_id,
+            "doc_hash": hashlib.sha256(pdf_content).hexdigest(),
+            "filename": filename,
+            "size_bytes": len(pdf_content),
+            "pages": result.get("pages"),
+            "converter_used": result.get("converter_used"),
+            "success": result.get("success"),
+            "elapsed_ms": round(elapsed_ms, 2),
+            "created_at": time.time(),
+            "stage_timings_ms": result.get("stage_timings_ms", {}),
+            "page_timings_ms": result.pop("page_timings_ms", {}),
+            "top_functions": profile.get("top_functions", []),
+            "pstats": profile.get("pstats")
+        }
+
+        with self._lock:
+            heapq.heappush(self._heap, (elapsed_ms, trace_id))
+            self._traces[trace_id] = trace
+            while len(self._heap) > self.max_traces:
+                _, evicted = heapq.heappop(self._heap)
+                self._traces.pop(evicted, None)
+            if trace_id not in self._traces:
+                return None
+        return trace_id
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Resumo dos traces, do mais lento para o mais rápido"""
+        with self._lock:
+            traces = list(self._traces.values())
+        return [
+            {key: value for key, value in trace.items()
+             if key not in ("pstats", "top_functions", "page_timings_ms")}
+            for trace in sorted(traces, key=lambda t: t["elapsed_ms"], reverse=True)
+        ]
+
+    def get(self, trace_id: str) -> Optional[Dict[str, Any]]:
+        """Trace completo (sem o dump binário)"""
+        with self._lock:
+            trace = self._traces.get(trace_id)
+        if trace is None:
+            return None
+        summary = {key: value for key, value in trace.items() if key != "pstats"}
+        summary["has_pstats"] = trace["pstats"] is not None
+        return summary
+
+    def get_pstats(self, trace_id: str) -> Optional[bytes]:
+        """Dump do perfil no formato lido por pstats.Stats(arquivo)"""
+        with self._lock:
+            trace = self._traces.get(trace_id)
+        return trace["pstats"] if trace else None
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Registro de conversores (plugins)
+Conversores embutidos se registram com @register_converter; pacotes externos
+podem publicar conversores no grupo de entry points "devmind.converters"
+"""
+
+import logging
+import os
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Dict, List, Optional, Type
+
+from .base import BaseConverter
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "devmind.converters"
+
+# Conversores habilitados, na ordem de preferência em caso de empate de custo.
+# O Docling (pesado e não thread-safe) é opt-in via PDF_CONVERTERS: na cadeia,
+# ele também recebe as chamadas paralelas do hedging
+DEFAULT_CONVERTERS = "simple_pdf"
+
+_BUILTIN_MODULES = (".simple_pdf", ".docling", ".simple")
+
+_registry: Dict[str, Type[BaseConverter]] = {}
+_loaded = False
+
+
+def register_converter(key: str):
+    """Decorador que registra uma classe de conversor sob a chave informada"""
+    def decorator(cls: Type[BaseConverter]) -> Type[BaseConverter]:
+        if not issubclass(cls, BaseConverter):
+            raise TypeError(f"{cls.__name__} deve herdar de BaseConverter")
+        cls.key = key
+        _registry[key] = cls
+        return cls
+    return decorator
+
+
+def _load_plugins():
+    """Importa os conversores embutidos e os entry points instalados"""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+
+    for module in _BUILTIN_MODULES:
+        import_module(module, __package__)
+
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            cls = entry_point.load()
+            if entry_point.name not in _registry:
+                register_converter(entry_point.name)(cls)
+        except Exception as e:
+            logger.warning(f"⚠️ Plugin de conversor '{entry_point.name}' ignorado: {e}")
+
+
+def get_registry() -> Dict[str, Type[BaseConverter]]:
+    """Retorna todas as classes de conversor registradas"""
+    _load_plugins()
+    return dict(_registry)
+
+
+def enabled_converter_keys(names: Optional[str] = None) -> List[str]:
+    """
+    Lista as chaves habilitadas (argumento, PDF_CONVERTERS ou padrão)
+
+    Chaves desconhecidas são ignoradas com aviso.
+    """
+    registry = get_registry()
+    names = names or os.getenv("PDF_CONVERTERS") or DEFAULT_CONVERTERS
+
+    keys = []
+    for key in (name.strip() for name in names.split(",")):
+        if not key:
+            continue
+        if key not in registry:
+            logger.warning(f"⚠️ Conversor '{key}' não registrado")
+            continue
+        if key not in keys:
+            keys.append(key)
+    return keys
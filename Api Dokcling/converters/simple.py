@@ -3,14 +3,21 @@ Conversor simples que simula a conversão de PDF para Markdown
 """
 
 from .base import BaseConverter
+from .registry import register_converter
 from typing import Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+@register_converter("simple")
 class SimpleConverter(BaseConverter):
     """Conversor simples que simula a conversão"""
     
+    capabilities = ("mock",)
+    cost_per_page_ms = 0.0
+    memory_mb = 10
+    thread_safe = True
+    
     def __init__(self):
         super().__init__(
             name="Simple Converter",
@@ -23,9 +30,9 @@ class SimpleConverter(BaseConverter):
         """Sempre retorna True - este conversor sempre funciona"""
         return True
     
-    def convert(self, file_content: bytes, filename: str) -> Dict[str, Any]:
-        """Simula a conversão de PDF para Markdown"""
-        logger.info(f"Simulando conversão para: {filename}")
+    def convert_pdf(self, file_content: bytes, filename: str, **options) -> Dict[str, Any]:
+        """Simula a conversão de PDF para Markdown (opções são ignoradas)"""
+        logger.debug("Simulando conversão para: %s", filename)
         
         # Gera markdown simulado baseado no arquivo
         markdown_content = self._generate_mock_markdown(file_content, filename)
@@ -37,6 +44,7 @@ class SimpleConverter(BaseConverter):
             "message": "PDF convertido com sucesso (simulação)",
             "mode": "simple",
             "converter": self.name,
+            "converter_used": self.name,
             "note": "Esta é uma versão de simulação para testes"
         }
     
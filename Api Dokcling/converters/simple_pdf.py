@@ -4,23 +4,75 @@ Conversor PDF simples e eficiente para Markdown
 Usa apenas as bibliotecas essenciais: PyPDF2 e pdfplumber
 """
 
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import os
+import time
+from io import BytesIO
+from typing import Dict, Any, List, Optional
 from pathlib import Path
 
+from .base import BaseConverter
+from .registry import register_converter
+from .tables import page_has_table_hints, extract_page_segments
+from .structure import build_page_record, assemble_markdown, structured_output
+from .ocr import OCRStage, OCR_ENABLED_DEFAULT
+from .memory import MemoryTracker, PAGE_WINDOW, release_page, release_document_cache
+from .profiling import stage_timer
+from .inspection import count_pages
+from .fingerprint import FingerprintIndex, FINGERPRINT_DB, EMPTY_PAGE, page_fingerprint
+from .checkpoint import CheckpointStore, CHECKPOINT_DIR
+from .layout import LayoutAnalyzer, LAYOUT_ENABLED_DEFAULT, is_available as layout_available
+from .assets import AssetStore, ImageExtractor, EXTRACT_IMAGES_DEFAULT
+
 logger = logging.getLogger(__name__)
 
-class SimplePDFConverter:
+# Extração de tabelas habilitada por padrão (pode ser sobrescrita por requisição)
+EXTRACT_TABLES_DEFAULT = os.getenv("PDF_EXTRACT_TABLES", "false").lower() in ("1", "true", "yes")
+
+@register_converter("simple_pdf")
+class SimplePDFConverter(BaseConverter):
     """Conversor PDF simples e eficiente para Markdown"""
     
+    capabilities = ("text", "tables", "pages", "ocr", "layout", "images")
+    cost_per_page_ms = 30.0
+    memory_mb = 150
+    thread_safe = True
+    
     def __init__(self):
-        self.name = "Simple PDF Converter"
-        self.description = "Conversor PDF real usando PyPDF2 e pdfplumber"
+        super().__init__(
+            name="Simple PDF Converter",
+            description="Conversor PDF real usando PyPDF2 e pdfplumber"
+        )
         self.version = "1.0.0"
-        self.available = False
         
         # Tenta importar as dependências
         self._import_dependencies()
+        
+        # Estágio de OCR opcional para páginas sem camada de texto
+        self.ocr_stage = OCRStage()
+        
+        # Índice de páginas já extraídas (habilitado com PDF_FINGERPRINT_DB)
+        self.fingerprint_index = None
+        if FINGERPRINT_DB:
+            try:
+                self.fingerprint_index = FingerprintIndex(FINGERPRINT_DB)
+            except Exception as e:
+                logger.warning(f"⚠️ Índice de impressões digitais indisponível: {e}")
+        
+        # Análise de layout por métricas de fonte (opcional, requer NumPy)
+        self.layout_available = layout_available()
+        
+        # Imagens extraídas (extract_images), gravadas uma vez por conteúdo
+        self.asset_store = AssetStore()
+        
+        # Checkpoints por página de documentos longos (habilitado com PDF_CHECKPOINT_DIR)
+        self.checkpoints = None
+        if CHECKPOINT_DIR:
+            try:
+                self.checkpoints = CheckpointStore(CHECKPOINT_DIR)
+            except OSError as e:
+                logger.warning(f"⚠️ Diretório de checkpoints indisponível: {e}")
     
     def _import_dependencies(self):
         """Importa as dependências necessárias"""
@@ -32,119 +84,401 @@ class SimplePDFConverter:
         except ImportError as e:
             logger.warning(f"⚠️ Dependências não disponíveis: {e}")
             self.available = False
+            self.error = f"ImportError: {e}"
+    
+    def is_available(self) -> bool:
+        """Verifica se PyPDF2 e pdfplumber estão disponíveis"""
+        return self.available
     
-    def convert_pdf(self, pdf_content: bytes, filename: str) -> Dict[str, Any]:
+    def convert_pdf(self, pdf_content: bytes, filename: str,
+                    extract_tables: Optional[bool] = None,
+                    output_format: str = "markdown",
+                    chunk_size: Optional[int] = None,
+                    chunk_unit: str = "chars",
+                    ocr: Optional[bool] = None,
+                    page_timings: bool = False,
+                    layout: Optional[bool] = None,
+                    extract_images: Optional[bool] = None,
+                    **options) -> Dict[str, Any]:
         """
         Converte PDF para Markdown usando bibliotecas essenciais
         
         Args:
             pdf_content: Conteúdo do arquivo PDF em bytes
             filename: Nome do arquivo PDF
+            extract_tables: Detecta tabelas e gera tabelas Markdown
+                (None usa PDF_EXTRACT_TABLES)
+            output_format: "markdown" ou "pages" (inclui registros por página)
+            chunk_size: Tamanho máximo dos chunks no formato "pages"
+            chunk_unit: Unidade de chunk_size ("chars" ou "tokens")
+            ocr: Aplica OCR às páginas sem texto (None usa PDF_OCR_ENABLED)
+            page_timings: Inclui o tempo de extração de cada página (profiling)
+            layout: Detecta títulos, parágrafos e colunas pelas métricas de
+                fonte (None usa PDF_LAYOUT; requer NumPy)
+            extract_images: Grava as imagens no AssetStore e as referencia no
+                Markdown por URL (None usa PDF_EXTRACT_IMAGES)
+            **options: Opções de outros conversores (ignoradas); _pages traz
+                a contagem de páginas já feita pela inspeção do ConverterManager
             
         Returns:
             Dicionário com o resultado da conversão
         """
+        known_pages = options.get("_pages")
         if not self.available:
-            return self._fallback_conversion(pdf_content, filename)
+            return self._fallback_conversion(pdf_content, filename, known_pages)
+        
+        if extract_tables is None:
+            extract_tables = EXTRACT_TABLES_DEFAULT
+        
+        if ocr is None:
+            ocr = OCR_ENABLED_DEFAULT
+        
+        if layout is None:
+            layout = LAYOUT_ENABLED_DEFAULT
+        layout = layout and self.layout_available
+        
+        if extract_images is None:
+            extract_images = EXTRACT_IMAGES_DEFAULT
+        images = ImageExtractor(self.asset_store) if extract_images else None
+        ocr_stats: Dict[str, Any] = {}
+        page_stats: Dict[str, Any] = {}
+        memory = MemoryTracker()
+        timings: Dict[str, float] = {}
+        page_times: Optional[Dict[int, float]] = {} if page_timings else None
         
         try:
-            logger.info(f"🔄 Convertendo {filename} usando conversor real")
+            logger.debug("Convertendo %s usando conversor real", filename)
             
             # Tenta usar pdfplumber primeiro (melhor para extração de texto)
-            markdown_content = self._convert_with_pdfplumber(pdf_content)
-            
-            if markdown_content:
-                return {
-                    "success": True,
-                    "filename": filename,
-                    "markdown": markdown_content,
-                    "converter_used": self.name,
-                    "mode": "real",
-                    "pages": self._count_pages(pdf_content),
-                    "size_bytes": len(pdf_content)
-                }
+            with stage_timer(timings, "pdfplumber"):
+                records = self._convert_with_pdfplumber(
+                    pdf_content, extract_tables,
+                    ocr_stats if ocr and self.ocr_stage.available else None,
+                    memory, page_times, page_stats, filename, layout, images
+                )
+            converter_used = self.name
             
             # Fallback para PyPDF2 se pdfplumber falhar
-            markdown_content = self._convert_with_pypdf2(pdf_content)
+            if not records:
+                with stage_timer(timings, "pypdf2"):
+                    records = self._convert_with_pypdf2(pdf_content)
+                converter_used = f"{self.name} (PyPDF2)"
             
-            if markdown_content:
-                return {
+            if records:
+                with stage_timer(timings, "assemble"):
+                    markdown_content = assemble_markdown(records)
+                with stage_timer(timings, "count_pages"):
+                    pages = self._count_pages(pdf_content, known_pages)
+                
+                result = {
                     "success": True,
                     "filename": filename,
                     "markdown": markdown_content,
-                    "converter_used": f"{self.name} (PyPDF2)",
+                    "converter_used": converter_used,
                     "mode": "real",
-                    "pages": self._count_pages(pdf_content),
-                    "size_bytes": len(pdf_content)
+                    "pages": pages,
+                    "size_bytes": len(pdf_content),
+                    "tables_extracted": extract_tables,
+                    "layout_analysis": layout,
+                    "memory": memory.report()
                 }
+                if ocr_stats:
+                    result.update(ocr_stats)
+                if page_stats:
+                    result.update(page_stats)
+                if images is not None:
+                    result["images"] = images.stats
+                if output_format == "pages":
+                    with stage_timer(timings, "structure"):
+                        result["output_format"] = "pages"
+                        result.update(structured_output(records, chunk_size, chunk_unit))
+                result["stage_timings_ms"] = timings
+                if page_times is not None:
+                    result["page_timings_ms"] = page_times
+                return result
             
             # Se ambos falharem, usa fallback
-            logger.warning("⚠️ Conversores reais falharam, usando fallback")
-            return self._fallback_conversion(pdf_content, filename)
+            logger.warning("Conversores reais falharam para %s, usando fallback", filename)
+            result = self._fallback_conversion(pdf_content, filename, known_pages)
+            if records is not None:
+                # O PDF foi lido, mas não tem camada de texto (e o OCR não a supriu)
+                result["fallback_reason"] = "no_text_layer"
+            return result
             
         except Exception as e:
-            logger.error(f"❌ Erro na conversão real: {e}")
-            return self._fallback_conversion(pdf_content, filename)
+            logger.error("Erro na conversão real de %s: %s", filename, e)
+            return self._fallback_conversion(pdf_content, filename, known_pages)
     
-    def _convert_with_pdfplumber(self, pdf_content: bytes) -> Optional[str]:
-        """Converte usando pdfplumber (melhor qualidade)"""
+    def _convert_with_pdfplumber(self, pdf_content: bytes,
+                                 extract_tables: bool = False,
+                                 ocr_stats: Optional[Dict[str, Any]] = None,
+                                 memory: Optional[MemoryTracker] = None,
+                                 page_times: Optional[Dict[int, float]] = None,
+                                 page_stats: Optional[Dict[str, Any]] = None,
+                                 filename: str = "",
+                                 layout: bool = False,
+                                 images: Optional[ImageExtractor] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Converte usando pdfplumber (melhor qualidade), retornando registros por página
+        
+        Se ocr_stats for informado, as páginas sem texto passam pelo estágio de
+        OCR e o dicionário recebe as estatísticas (ocr_pages, ocr_cache_hits).
+        
+        Cada página tem seus objetos de layout liberados assim que é emitida, e
+        os caches do documento são liberados a cada PDF_PAGE_WINDOW páginas,
+        mantendo a memória estável em documentos com milhares de páginas.
+        
+        Se page_times for informado, recebe o tempo (ms) de cada página.
+        
+        Com o índice de impressões digitais habilitado, páginas já presentes no
+        índice reaproveitam o resultado armazenado, e page_stats recebe
+        reused_pages e, se houver, o documento quase duplicado (near_duplicate).
+        
+        Com checkpoints habilitados, cada página extraída de um documento longo
+        é salva; uma conversão interrompida é retomada a partir das páginas
+        salvas, e page_stats recebe resumed_pages.
+        
+        Com layout, o texto de cada página vem da análise de layout (títulos
+        por tamanho de fonte, parágrafos e colunas) em vez de extract_text e
+        da heurística de _process_text; páginas com tabelas seguem o caminho
+        de tabelas. Uma primeira passada pelas páginas reúne os tamanhos de
+        fonte do documento inteiro para definir o corpo e os níveis de título;
+        o resumo desses níveis entra na variante do índice e dos checkpoints.
+        
+        Com images, as imagens de cada página são gravadas no AssetStore e
+        suas referências (![](url)) vão ao final do texto da página.
+        """
+        checkpoint = None
         try:
             import pdfplumber
             
-            with pdfplumber.open(pdf_content) as pdf:
-                markdown_lines = []
+            with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+                records = []
+                empty_pages = []
+                
+                analyzer = LayoutAnalyzer() if layout else None
+                if analyzer is not None:
+                    # Tamanhos de fonte de todo o documento, antes da análise de layout
+                    for page_num, page in enumerate(pdf.pages, 1):
+                        analyzer.collect_page(page)
+                        release_page(page)
+                        if page_num % PAGE_WINDOW == 0:
+                            release_document_cache(pdf)
+                    release_document_cache(pdf)
+                
+                variant = f"tables={int(extract_tables)}"
+                if analyzer is not None:
+                    # Os níveis de título dependem do histograma do documento
+                    variant += f";layout={analyzer.digest()}"
+                if images is not None:
+                    variant += ";images=1"
+                # Imagens das páginas sem texto (anexadas após o OCR)
+                empty_page_images: Dict[int, List[str]] = {}
+                doc_hash = None
+                if self.fingerprint_index or self.checkpoints:
+                    doc_hash = hashlib.sha256(pdf_content).hexdigest()
+                
+                # Páginas salvas por uma conversão anterior interrompida
+                resumed: Dict[int, Any] = {}
+                if self.checkpoints:
+                    checkpoint = self.checkpoints.open(doc_hash, variant, len(pdf.pages))
+                    if checkpoint is not None:
+                        resumed = checkpoint.pages
+                
+                # Impressões digitais de todas as páginas (sem análise de layout)
+                fingerprints: List[str] = []
+                known: Dict[str, Any] = {}
+                new_results: Dict[str, Any] = {}
+                reused = 0
+                if self.fingerprint_index:
+                    object_cache: Dict[int, bytes] = {}
+                    fingerprints = [page_fingerprint(page, object_cache) for page in pdf.pages]
+                    known = self.fingerprint_index.lookup_pages(fingerprints, variant)
+                    release_document_cache(pdf)
                 
                 for page_num, page in enumerate(pdf.pages, 1):
-                    # Extrai texto da página
-                    text = page.extract_text()
+                    page_start = time.perf_counter()
+                    fingerprint = fingerprints[page_num - 1] if fingerprints else None
+                    
+                    if page_num in resumed or fingerprint in known:
+                        # Página já extraída antes (nesta conversão interrompida,
+                        # ou neste ou em outro documento)
+                        if page_num in resumed:
+                            stored = resumed[page_num]
+                            if fingerprint:
+                                new_results[fingerprint] = stored
+                        else:
+                            stored = known[fingerprint]
+                            reused += 1
+                        if stored is EMPTY_PAGE:
+                            empty_pages.append(page_num)
+                            if images is not None:
+                                empty_page_images[page_num] = images.page_images(page)
+                        else:
+                            record = build_page_record(page_num, stored["text"], stored["backend"])
+                            record["reused"] = True
+                            records.append(record)
+                        text = None
+                        laid_out = False
+                    else:
+                        # Extrai texto da página (já estruturado, com layout)
+                        text = analyzer.page_markdown(page) if analyzer else None
+                        laid_out = text is not None
+                        if not laid_out:
+                            text = page.extract_text()
+                        if not text:
+                            empty_pages.append(page_num)
+                            if images is not None:
+                                empty_page_images[page_num] = images.page_images(page)
+                            if fingerprint:
+                                new_results[fingerprint] = EMPTY_PAGE
+                            if checkpoint is not None:
+                                checkpoint.add(page_num, EMPTY_PAGE)
+                    
                     if text:
-                        # Adiciona cabeçalho da página
-                        markdown_lines.append(f"\n## Página {page_num}\n")
+                        backend = "pdfplumber"
                         
-                        # Processa o texto
-                        processed_text = self._process_text(text)
-                        markdown_lines.append(processed_text)
+                        # Processa o texto (com tabelas apenas em páginas sinalizadas)
+                        processed_text = None
+                        if extract_tables and page_has_table_hints(page):
+                            processed_text = self._process_page_with_tables(page)
+                            if processed_text is not None:
+                                backend = "pdfplumber+tables"
+                        if processed_text is None and laid_out:
+                            processed_text = text
+                            backend = "pdfplumber+layout"
+                        if processed_text is None:
+                            processed_text = self._process_text(text)
+                        if images is not None:
+                            processed_text = "\n\n".join([processed_text] + images.page_images(page))
                         
-                        # Adiciona separador entre páginas
-                        markdown_lines.append("\n---\n")
-                
-                return "\n".join(markdown_lines)
+                        records.append(build_page_record(page_num, processed_text, backend))
+                        stored = {"text": processed_text, "backend": backend}
+                        if fingerprint:
+                            new_results[fingerprint] = stored
+                        if checkpoint is not None:
+                            checkpoint.add(page_num, stored)
+                    
+                    release_page(page)
+                    if page_times is not None:
+                        page_times[page_num] = round((time.perf_counter() - page_start) * 1000, 2)
+                    if page_num % PAGE_WINDOW == 0:
+                        release_document_cache(pdf)
+                        if memory is not None:
+                            memory.sample()
+            
+            if checkpoint is not None:
+                checkpoint.complete()
+                if resumed and page_stats is not None:
+                    page_stats["resumed_pages"] = len(resumed)
+            
+            if self.fingerprint_index and page_stats is not None:
+                self._update_index(doc_hash, filename, fingerprints, new_results,
+                                   variant, reused, page_stats)
+            
+            if ocr_stats is not None and empty_pages:
+                records.extend(self._ocr_records(pdf_content, empty_pages, ocr_stats))
+                records.sort(key=lambda record: record["page"])
+            
+            if any(empty_page_images.values()):
+                self._attach_images(records, empty_page_images)
+            
+            return records
                 
         except Exception as e:
-            logger.warning(f"⚠️ pdfplumber falhou: {e}")
+            logger.warning("pdfplumber falhou: %s", e)
+            if checkpoint is not None:
+                checkpoint.close()
             return None
     
-    def _convert_with_pypdf2(self, pdf_content: bytes) -> Optional[str]:
-        """Converte usando PyPDF2 (fallback)"""
+    def _update_index(self, doc_hash: str, filename: str, fingerprints: List[str],
+                      new_results: Dict[str, Any], variant: str, reused: int,
+                      index_stats: Dict[str, Any]):
+        """Detecta quase duplicatas e grava as páginas novas no índice"""
+        try:
+            near_duplicate = self.fingerprint_index.find_near_duplicate(doc_hash, fingerprints)
+            self.fingerprint_index.store(doc_hash, filename, fingerprints, new_results, variant)
+        except Exception as e:
+            logger.warning("Falha ao atualizar o índice de impressões digitais: %s", e)
+            return
+        
+        index_stats["reused_pages"] = reused
+        if near_duplicate:
+            index_stats["near_duplicate"] = near_duplicate
+    
+    def _attach_images(self, records: List[Dict[str, Any]], page_images: Dict[int, List[str]]):
+        """Anexa as imagens das páginas sem texto (ao texto do OCR, se houver)"""
+        by_page = {record["page"]: record for record in records}
+        for page_num, references in page_images.items():
+            if not references:
+                continue
+            record = by_page.get(page_num)
+            if record is None:
+                records.append(build_page_record(page_num, "\n\n".join(references), "images"))
+            else:
+                record["text"] = "\n\n".join([record["text"]] + references)
+        records.sort(key=lambda record: record["page"])
+    
+    def _ocr_records(self, pdf_content: bytes, page_numbers: List[int],
+                     ocr_stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Aplica OCR às páginas sem camada de texto e gera seus registros"""
+        start = time.perf_counter()
+        texts, cache_hits = self.ocr_stage.ocr_pages(pdf_content, page_numbers)
+        ocr_stats["ocr_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        
+        records = []
+        for page_num in sorted(texts):
+            processed_text = self._process_text(texts[page_num])
+            if processed_text:
+                records.append(build_page_record(page_num, processed_text, "ocr"))
+        
+        ocr_stats["ocr_pages"] = [record["page"] for record in records]
+        ocr_stats["ocr_cache_hits"] = cache_hits
+        return records
+    
+    def _convert_with_pypdf2(self, pdf_content: bytes) -> Optional[List[Dict[str, Any]]]:
+        """Converte usando PyPDF2 (fallback), retornando registros por página"""
         try:
             import PyPDF2
-            from io import BytesIO
             
             pdf_file = BytesIO(pdf_content)
             pdf_reader = PyPDF2.PdfReader(pdf_file)
             
-            markdown_lines = []
+            records = []
             
             for page_num, page in enumerate(pdf_reader.pages, 1):
                 # Extrai texto da página
                 text = page.extract_text()
                 if text:
-                    # Adiciona cabeçalho da página
-                    markdown_lines.append(f"\n## Página {page_num}\n")
-                    
-                    # Processa o texto
                     processed_text = self._process_text(text)
-                    markdown_lines.append(processed_text)
-                    
-                    # Adiciona separador entre páginas
-                    markdown_lines.append("\n---\n")
+                    records.append(build_page_record(page_num, processed_text, "pypdf2"))
             
-            return "\n".join(markdown_lines)
+            return records
             
         except Exception as e:
-            logger.warning(f"⚠️ PyPDF2 falhou: {e}")
+            logger.warning("PyPDF2 falhou: %s", e)
             return None
     
+    def _process_page_with_tables(self, page) -> Optional[str]:
+        """Processa a página intercalando texto e tabelas Markdown"""
+        try:
+            segments = extract_page_segments(page)
+        except Exception as e:
+            logger.warning("Detecção de tabelas falhou na página %d: %s", page.page_number, e)
+            return None
+        
+        if not segments:
+            return None
+        
+        blocks = []
+        for kind, content in segments:
+            if kind == "table":
+                blocks.append(content)
+            else:
+                blocks.append(self._process_text(content))
+        
+        return "\n\n".join(block for block in blocks if block)
+    
     def _process_text(self, text: str) -> str:
         """Processa e formata o texto extraído"""
         if not text:
@@ -165,21 +499,21 @@ class SimplePDFConverter:
         
         return "\n\n".join(processed_lines)
     
-    def _count_pages(self, pdf_content: bytes) -> int:
-        """Conta o número de páginas do PDF"""
-        try:
-            import PyPDF2
-            from io import BytesIO
-            
-            pdf_file = BytesIO(pdf_content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            return len(pdf_reader.pages)
-        except:
+    def _count_pages(self, pdf_content: bytes, known_pages: Optional[int] = None) -> int:
+        """Conta o número de páginas do PDF (pelo trailer, sem ler as páginas)"""
+        if known_pages is not None:
+            return known_pages
+        pages = count_pages(pdf_content)
+        if pages is None:
+            logger.debug("Não foi possível contar as páginas do PDF")
             return 0
+        return pages
     
-    def _fallback_conversion(self, pdf_content: bytes, filename: str) -> Dict[str, Any]:
+    def _fallback_conversion(self, pdf_content: bytes, filename: str,
+                             known_pages: Optional[int] = None) -> Dict[str, Any]:
         """Conversão de fallback quando os conversores reais falham"""
-        logger.info(f"📝 Usando conversão de fallback para {filename}")
+        logger.debug("Usando conversão de fallback para %s", filename)
+        pages = self._count_pages(pdf_content, known_pages)
         
         # Simula conversão básica
         markdown_content = f"""# {filename}
@@ -191,7 +525,7 @@ Este arquivo PDF foi processado usando conversão de fallback.
 **Informações do arquivo:**
 - Nome: {filename}
 - Tamanho: {len(pdf_content)} bytes
-- Páginas: {self._count_pages(pdf_content)}
+- Páginas: {pages}
 
 **Nota:** Para conversão completa, instale as dependências:
 ```bash
@@ -208,20 +542,23 @@ pip install pypdf2 pdfplumber
             "markdown": markdown_content,
             "converter_used": f"{self.name} (Fallback)",
             "mode": "fallback",
-            "pages": self._count_pages(pdf_content),
+            "pages": pages,
             "size_bytes": len(pdf_content),
             "note": "Instale pypdf2 e pdfplumber para conversão completa"
         }
     
+    def shutdown(self):
+        """Encerra o pool de processos do OCR"""
+        self.ocr_stage.shutdown()
+    
     def get_status(self) -> Dict[str, Any]:
         """Retorna o status do conversor"""
-        return {
-            "name": self.name,
-            "description": self.description,
+        status = super().get_status()
+        status.update({
             "version": self.version,
-            "available": self.available,
             "mode": "real" if self.available else "fallback"
-        }
+        })
+        return status
     
     def get_detailed_status(self) -> Dict[str, Any]:
         """Retorna status detalhado do conversor"""
@@ -231,13 +568,25 @@ pip install pypdf2 pdfplumber
             "version": self.version,
             "available": self.available,
             "mode": "real" if self.available else "fallback",
+            "metadata": self.get_metadata(),
+            "ocr": self.ocr_stage.get_status(),
+            "fingerprint_index": self.fingerprint_index.get_status() if self.fingerprint_index else None,
+            "checkpoints": self.checkpoints.get_status() if self.checkpoints else None,
+            "layout_analysis": self.layout_available,
+            "assets": self.asset_store.get_status(),
             "dependencies": {
                 "pypdf2": "PyPDF2 para leitura básica de PDF",
-                "pdfplumber": "pdfplumber para extração avançada de texto"
+                "pdfplumber": "pdfplumber para extração avançada de texto",
+                "numpy": "NumPy para a análise de layout (opcional)"
             },
             "capabilities": [
                 "Extração de texto de PDFs",
                 "Conversão para Markdown",
+                "Extração de tabelas (pdfplumber) em páginas com linhas/retângulos",
+                "Saída estruturada por página com chunks opcionais",
+                "OCR local (Tesseract) de páginas sem camada de texto",
+                "Títulos, parágrafos e colunas por métricas de fonte (layout)",
+                "Extração de imagens para um armazenamento por conteúdo",
                 "Contagem de páginas",
                 "Processamento de múltiplas páginas"
             ]
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Saída estruturada por página para consumo sem reprocessar o Markdown
+Monta o Markdown final a partir dos registros de página e gera chunks opcionais
+"""
+
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+OUTPUT_FORMATS = ("markdown", "pages")
+CHUNK_UNITS = ("chars", "tokens")
+
+_HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*)$")
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+
+def build_page_record(page_number: int, text: str, backend: str) -> Dict[str, Any]:
+    """Cria o registro de uma página já processada em Markdown"""
+    headings = []
+    for line in text.split("\n"):
+        match = _HEADING_PATTERN.match(line)
+        if match:
+            headings.append(match.group(1).strip())
+
+    return {
+        "page": page_number,
+        "text": text,
+        "headings": headings,
+        "backend": backend,
+        "char_start": 0,
+        "char_end": 0
+    }
+
+
+def assemble_markdown(records: List[Dict[str, Any]]) -> str:
+    """
+    Monta o Markdown do documento a partir dos registros de página
+
+    Preenche char_start/char_end de cada registro com a posição do texto da
+    página dentro do Markdown retornado.
+    """
+    parts: List[str] = []
+    offset = 0
+
+    for index, record in enumerate(records):
+        header = f"\n## Página {record['page']}\n"
+        # As partes são unidas com "\n", como na montagem original por linhas
+        prefix = ("\n" if index else "") + header + "\n"
+        record["char_start"] = offset + len(prefix)
+        record["char_end"] = record["char_start"] + len(record["text"])
+
+        parts.append(header)
+        parts.append(record["text"])
+        parts.append("\n---\n")
+        offset = record["char_end"] + len("\n" + "\n---\n")
+
+    return "\n".join(parts)
+
+
+def split_chunks(records: List[Dict[str, Any]], chunk_size: int,
+                 unit: str = "chars") -> List[Dict[str, Any]]:
+    """
+    Divide o conteúdo das páginas em chunks de tamanho máximo chunk_size
+
+    Os chunks respeitam limites de parágrafo sempre que possível e podem
+    atravessar páginas. O tamanho é medido em caracteres ou em tokens
+    (palavras separadas por espaço), conforme unit.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size deve ser maior que zero")
+    if unit not in CHUNK_UNITS:
+        raise ValueError(f"Unidade de chunk inválida: {unit}")
+
+    measure = len if unit == "chars" else _count_tokens
+    chunks: List[Dict[str, Any]] = []
+    current: List[Tuple[str, int, int, int]] = []
+    current_size = 0
+
+    def flush():
+        nonlocal current, current_size
+        if not current:
+            return
+        chunks.append({
+            "index": len(chunks),
+            "text": "\n\n".join(piece[0] for piece in current),
+            "page_start": current[0][1],
+            "page_end": current[-1][1],
+            "char_start": current[0][2],
+            "char_end": current[-1][3],
+            "size": current_size,
+            "unit": unit
+        })
+        current = []
+        current_size = 0
+
+    for record in records:
+        for text, start, end in _paragraphs(record):
+            for piece, piece_start, piece_end in _split_oversized(text, start, chunk_size, unit):
+                size = measure(piece)
+                separator = 2 if unit == "chars" and current else 0
+                if current and current_size + separator + size > chunk_size:
+                    flush()
+                    separator = 0
+                current.append((piece, record["page"], piece_start, piece_end))
+                current_size += separator + size
+
+    flush()
+    return chunks
+
+
+def _paragraphs(record: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    """Separa o texto da página em parágrafos com offsets absolutos"""
+    paragraphs = []
+    text = record["text"]
+    position = 0
+    for paragraph in text.split("\n\n"):
+        start = text.index(paragraph, position)
+        position = start + len(paragraph)
+        if paragraph.strip():
+            absolute = record["char_start"] + start
+            paragraphs.append((paragraph, absolute, absolute + len(paragraph)))
+    return paragraphs
+
+
+def _split_oversized(text: str, start: int, chunk_size: int,
+                     unit: str) -> List[Tuple[str, int, int]]:
+    """Quebra um parágrafo maior que chunk_size em pedaços menores"""
+    if unit == "chars":
+        if len(text) <= chunk_size:
+            return [(text, start, start + len(text))]
+        return [
+            (text[i:i + chunk_size], start + i, start + min(i + chunk_size, len(text)))
+            for i in range(0, len(text), chunk_size)
+        ]
+
+    tokens = list(_TOKEN_PATTERN.finditer(text))
+    if len(tokens) <= chunk_size:
+        return [(text, start, start + len(text))]
+
+    pieces = []
+    for i in range(0, len(tokens), chunk_size):
+        window = tokens[i:i + chunk_size]
+        piece_start, piece_end = window[0].start(), window[-1].end()
+        pieces.append((text[piece_start:piece_end], start + piece_start, start + piece_end))
+    return pieces
+
+
+def _count_tokens(text: str) -> int:
+    """Aproximação de tokens por palavras separadas por espaço"""
+    return len(_TOKEN_PATTERN.findall(text))
+
+
+def structured_output(records: List[Dict[str, Any]], chunk_size: Optional[int] = None,
+                      chunk_unit: str = "chars") -> Dict[str, Any]:
+    """Campos adicionais da resposta no formato "pages" """
+    output: Dict[str, Any] = {"page_items": records}
+    if chunk_size:
+        output["chunks"] = split_chunks(records, chunk_size, chunk_unit)
+    return output
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Extração de tabelas com pdfplumber para Markdown
+Detecta tabelas apenas em páginas sinalizadas por uma heurística barata
+"""
+
+import logging
+import os
+from typing import List, Tuple, Any
+
+logger = logging.getLogger(__name__)
+
+# Número mínimo de linhas + retângulos para considerar que a página pode ter tabelas
+TABLE_MIN_EDGES = int(os.getenv("PDF_TABLE_MIN_EDGES", "6"))
+
+
+def page_has_table_hints(page: Any, min_edges: int = TABLE_MIN_EDGES) -> bool:
+    """
+    Heurística barata de densidade de linhas/retângulos
+
+    Os objetos gráficos já ficam em cache na página depois de extract_text(),
+    então a contagem não reprocessa o layout.
+    """
+    edges = len(page.lines) + len(page.rects)
+    return edges >= min_edges
+
+
+def table_to_markdown(rows: List[List[Any]]) -> str:
+    """Converte as linhas extraídas de uma tabela em uma tabela Markdown"""
+    cleaned = [
+        [_clean_cell(cell) for cell in row]
+        for row in rows
+        if row and any(cell not in (None, "") for cell in row)
+    ]
+    if not cleaned:
+        return ""
+
+    width = max(len(row) for row in cleaned)
+    cleaned = [row + [""] * (width - len(row)) for row in cleaned]
+
+    header, body = cleaned[0], cleaned[1:]
+    lines = [
+        "| " + " | ".join(header) + " |",
+        "| " + " | ".join(["---"] * width) + " |",
+    ]
+    for row in body:
+        lines.append("| " + " | ".join(row) + " |")
+
+    return "\n".join(lines)
+
+
+def extract_page_segments(page: Any) -> List[Tuple[str, str]]:
+    """
+    Extrai a página como uma sequência de segmentos ("text" | "table", conteúdo)
+    na ordem vertical em que aparecem
+
+    Retorna lista vazia se nenhuma tabela for encontrada, para que o chamador
+    use a extração de texto normal.
+    """
+    tables = sorted(page.find_tables(), key=lambda table: table.bbox[1])
+    if not tables:
+        return []
+
+    bboxes = [table.bbox for table in tables]
+    segments: List[Tuple[str, str]] = []
+    cursor = 0.0
+
+    for table in tables:
+        top, bottom = table.bbox[1], table.bbox[3]
+        text = _text_between(page, cursor, top, bboxes)
+        if text:
+            segments.append(("text", text))
+
+        markdown_table = table_to_markdown(table.extract())
+        if markdown_table:
+            segments.append(("table", markdown_table))
+
+        # Texto ao lado da tabela, na mesma faixa vertical (notas, legendas)
+        text = _text_between(page, max(cursor, top), bottom, bboxes)
+        if text:
+            segments.append(("text", text))
+
+        cursor = max(cursor, bottom)
+
+    text = _text_between(page, cursor, page.height, bboxes)
+    if text:
+        segments.append(("text", text))
+
+    return segments
+
+
+def _text_between(page: Any, top: float, bottom: float, bboxes: List[Tuple[float, float, float, float]]) -> str:
+    """Extrai o texto de uma faixa vertical, ignorando o que está dentro de tabelas"""
+    if bottom <= top:
+        return ""
+
+    def keep(obj: dict) -> bool:
+        if obj.get("object_type") != "char":
+            return True
+        if not (top <= obj["top"] < bottom):
+            return False
+        return not _inside_any(obj, bboxes)
+
+    return page.filter(keep).extract_text() or ""
+
+
+def _inside_any(obj: dict, bboxes: List[Tuple[float, float, float, float]]) -> bool:
+    """Verifica se o centro do objeto está dentro de alguma tabela"""
+    cx = (obj["x0"] + obj["x1"]) / 2
+    cy = (obj["top"] + obj["bottom"]) / 2
+    for x0, top, x1, bottom in bboxes:
+        if x0 <= cx <= x1 and top <= cy <= bottom:
+            return True
+    return False
+
+
+def _clean_cell(cell: Any) -> str:
+    """Normaliza o conteúdo de uma célula para uma linha de tabela Markdown"""
+    if cell is None:
+        return ""
+    return " ".join(str(cell).split()).replace("|", "\\|")
@@ -0,0 +1,7 @@
+"""
+Cliente Python da API PDF to Markdown Converter
+"""
+
+from .client import DevMindClient, AsyncDevMindClient, DevMindError
+
+__all__ = ["DevMindClient", "AsyncDevMindClient", "DevMindError"]
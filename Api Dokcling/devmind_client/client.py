@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+Cliente Python da API PDF to Markdown Converter
+Transportes síncrono e assíncrono com pool de conexões keep-alive,
+concorrência limitada, novas tentativas em 503/429 (respeitando Retry-After)
+e upload de arquivos em streaming a partir do disco (no assíncrono, lidos
+numa thread)
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Any, Iterable, Iterator, AsyncIterator, List, Optional, Tuple, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BASE_URL = os.getenv("DEVMIND_API_URL", "http://localhost:8000")
+DEFAULT_TIMEOUT = float(os.getenv("DEVMIND_API_TIMEOUT", "300"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("DEVMIND_MAX_CONCURRENCY", "8"))
+
+# Status que indicam sobrecarga/indisponibilidade temporária do servidor
+RETRY_STATUS = (429, 502, 503, 504)
+
+# Espera entre consultas de jobs (cresce até o máximo)
+JOB_POLL_INTERVAL = 0.5
+JOB_POLL_MAX_INTERVAL = 5.0
+JOB_FINAL_STATUSES = ("done", "failed")
+
+PathLike = Union[str, Path]
+
+
+class DevMindError(Exception):
+    """Erro retornado pela API (status HTTP diferente de 2xx)"""
+
+    def __init__(self, status_code: int, detail: Any):
+        super().__init__(f"HTTP {status_code}: {detail}")
+        self.status_code = status_code
+        self.detail = detail
+
+
+def _conversion_params(extract_tables: Optional[bool] = None,
+                       output_format: Optional[str] = None,
+                       chunk_size: Optional[int] = None,
+                       chunk_unit: Optional[str] = None,
+                       ocr: Optional[bool] = None,
+                       layout: Optional[bool] = None,
+                       extract_images: Optional[bool] = None,
+                       **extra: Any) -> Dict[str, Any]:
+    """Parâmetros de query de /convert-pdf (omite os não informados)"""
+    params = dict(extra, extract_tables=extract_tables, output_format=output_format,
+                  chunk_size=chunk_size, chunk_unit=chunk_unit, ocr=ocr, layout=layout,
+                  extract_images=extract_images)
+    return {
+        key: (str(value).lower() if isinstance(value, bool) else value)
+        for key, value in params.items() if value is not None
+    }
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Segundos indicados no header Retry-After (número ou data HTTP)"""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _error_detail(response: httpx.Response) -> Any:
+    try:
+        return response.json().get("detail", response.text)
+    except ValueError:
+        return response.text
+
+
+class _RetryPolicy:
+    """Backoff exponencial com jitter, limitado por max_backoff"""
+
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def delay(self, attempt: int, response: Optional[httpx.Response]) -> Optional[float]:
+        """Espera antes da próxima tentativa, ou None se não deve tentar de novo"""
+        if attempt >= self.max_retries:
+            return None
+        if response is not None:
+            if response.status_code not in RETRY_STATUS:
+                return None
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, self.max_backoff)
+        return min(self.backoff * (2 ** attempt), self.max_backoff) * random.uniform(0.5, 1.0)
+
+
+def _limits(max_concurrency: int) -> httpx.Limits:
+    """Pool com uma conexão keep-alive por requisição simultânea"""
+    return httpx.Limits(max_connections=max_concurrency,
+                        max_keepalive_connections=max_concurrency)
+
+
+def _upload(source: Union[PathLike, bytes], filename: Optional[str]) -> Tuple[str, Any]:
+    """Nome e conteúdo do upload; caminhos são abertos para envio em streaming"""
+    if isinstance(source, (bytes, bytearray)):
+        return filename or "document.pdf", bytes(source)
+    path = Path(source)
+    return filename or path.name, open(path, "rb")
+
+
+async def _async_upload(source: Union[PathLike, bytes], filename: Optional[str]) -> Tuple[str, bytes]:
+    """Nome e conteúdo do upload; o arquivo é lido numa thread, sem bloquear o event loop"""
+    if isinstance(source, (bytes, bytearray)):
+        return filename or "document.pdf", bytes(source)
+    path = Path(source)
+    return filename or path.name, await asyncio.to_thread(path.read_bytes)
+
+
+class DevMindClient:
+    """
+    Cliente síncrono com pool de conexões
+
+    Seguro para uso em várias threads; no máximo max_concurrency requisições
+    ficam em andamento ao mesmo tempo.
+
+    Exemplo:
+        with DevMindClient("http://localhost:8000") as client:
+            result = client.convert("relatorio.pdf", extract_tables=True)
+            for path, result in client.iter_convert(Path("pdfs").glob("*.pdf")):
+                ...
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[httpx.BaseTransport] = None):
+        self.max_concurrency = max_concurrency
+        self.retry = _RetryPolicy(max_retries, backoff)
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._client = httpx.Client(
+            base_url=base_url,
+            timeout=timeout,
+            limits=_limits(max_concurrency),
+            headers=headers,
+            transport=transport
+        )
+
+    def __enter__(self) -> "DevMindClient":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Fecha as conexões do pool"""
+        self._client.close()
+
+    def request(self, method: str, url: str, upload: Optional[Tuple[Union[PathLike, bytes], Optional[str]]] = None,
+                **kwargs: Any) -> Dict[str, Any]:
+        """
+        Executa a requisição com novas tentativas e retorna o JSON da resposta
+
+        upload=(arquivo ou bytes, nome) é reaberto a cada tentativa, para que
+        arquivos sejam enviados em streaming sem carregá-los na memória.
+        """
+        attempt = 0
+        while True:
+            response = None
+            error: Optional[Exception] = None
+            with self._semaphore:
+                files = None
+                try:
+                    if upload is not None:
+                        name, content = _upload(*upload)
+                        files = {"file": (name, content, "application/pdf")}
+                    response = self._client.request(method, url, files=files, **kwargs)
+                except httpx.TransportError as e:
+                    error = e
+                finally:
+                    if files and hasattr(files["file"][1], "close"):
+                        files["file"][1].close()
+
+            delay = self.retry.delay(attempt, response)
+            if delay is None:
+                if error is not None:
+                    raise error
+                if response.is_error:
+                    raise DevMindError(response.status_code, _error_detail(response))
+                return response.json()
+
+            logger.debug("Nova tentativa de %s %s em %.2fs (%s)", method, url, delay,
+                         response.status_code if response is not None else error)
+            attempt += 1
+            time.sleep(delay)
+
+    def convert(self, source: Union[PathLike, bytes], filename: Optional[str] = None,
+                **options: Any) -> Dict[str, Any]:
+        """
+        Converte um PDF (caminho ou bytes) via /convert-pdf
+
+        Args:
+            source: Caminho do arquivo ou conteúdo em bytes
+            filename: Nome enviado (padrão: nome do arquivo)
+            **options: extract_tables, output_format, chunk_size, chunk_unit, ocr, layout,
+                extract_images
+        """
+        return self.request("POST", "/convert-pdf", upload=(source, filename),
+                            params=_conversion_params(**options))
+
+    def iter_convert(self, sources: Iterable[Union[PathLike, bytes]],
+                     **options: Any) -> Iterator[Tuple[Union[PathLike, bytes], Dict[str, Any]]]:
+        """
+        Converte vários PDFs em paralelo, entregando (origem, resultado) na
+        ordem de conclusão
+
+        Falhas aparecem como resultado {"success": False, "error": ...}.
+        """
+        sources = iter(sources)
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            pending = {}
+
+            def submit_next() -> bool:
+                source = next(sources, None)
+                if source is None:
+                    return False
+                pending[pool.submit(self._convert_safe, source, **options)] = source
+                return True
+
+            # Mantém no máximo 2x max_concurrency tarefas materializadas
+            for _ in range(self.max_concurrency * 2):
+                if not submit_next():
+                    break
+
+            try:
+                while pending:
+                    future = next(as_completed(pending))
+                    source = pending.pop(future)
+                    submit_next()
+                    yield source, future.result()
+            finally:
+                # Consumidor parou antes do fim: descarta as conversões não iniciadas
+                for future in pending:
+                    future.cancel()
+
+    def convert_many(self, sources: Iterable[Union[PathLike, bytes]],
+                     **options: Any) -> List[Dict[str, Any]]:
+        """Converte vários PDFs em paralelo, mantendo a ordem de entrada"""
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            return list(pool.map(lambda source: self._convert_safe(source, **options), sources))
+
+    def _convert_safe(self, source: Union[PathLike, bytes], **options: Any) -> Dict[str, Any]:
+        try:
+            return self.convert(source, **options)
+        except (DevMindError, httpx.HTTPError, OSError) as e:
+            return {"success": False, "error": str(e)}
+
+    def inspect(self, source: Union[PathLike, bytes], filename: Optional[str] = None) -> Dict[str, Any]:
+        """Metadados do PDF via /inspect-pdf (páginas, criptografia, camada de texto)"""
+        return self.request("POST", "/inspect-pdf", upload=(source, filename))
+
+    def submit_job(self, source: Union[PathLike, bytes], filename: Optional[str] = None,
+                   **options: Any) -> Dict[str, Any]:
+        """Enfileira a conversão no modo distribuído (POST /jobs)"""
+        return self.request("POST", "/jobs", upload=(source, filename),
+                            params=_conversion_params(**options))
+
+    def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Estado do job (com o resultado, se concluído)"""
+        return self.request("GET", f"/jobs/{job_id}")
+
+    def wait_job(self, job_id: str, timeout: Optional[float] = None,
+                 poll_interval: float = JOB_POLL_INTERVAL) -> Dict[str, Any]:
+        """
+        Aguarda o job terminar (done ou failed)
+
+        Raises:
+            TimeoutError: Se o job não terminar dentro de timeout
+        """
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        delay = poll_interval
+        while True:
+            job = self.get_job(job_id)
+            if job["status"] in JOB_FINAL_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Job {job_id} não terminou em {timeout}s")
+            time.sleep(delay)
+            delay = min(delay * 1.5, JOB_POLL_MAX_INTERVAL)
+
+    def workers(self) -> Dict[str, Any]:
+        """Carga dos workers e estado da fila (GET /workers)"""
+        return self.request("GET", "/workers")
+
+    def health(self) -> Dict[str, Any]:
+        """Status de /health"""
+        return self.request("GET", "/health")
+
+    def converters(self) -> Dict[str, Any]:
+        """Lista de /converters"""
+        return self.request("GET", "/converters")
+
+
+class AsyncDevMindClient:
+    """
+    Cliente assíncrono com pool de conexões
+
+    No máximo max_concurrency requisições ficam em andamento ao mesmo tempo.
+
+    Exemplo:
+        async with AsyncDevMindClient() as client:
+            results = await client.convert_many(paths, ocr=True)
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 timeout: float = DEFAULT_TIMEOUT,
+                 max_retries: int = 3,
+                 backoff: float = 0.5,
+                 headers: Optional[Dict[str, str]] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.max_concurrency = max_concurrency
+        self.retry = _RetryPolicy(max_retries, backoff)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=_limits(max_concurrency),
+            headers=headers,
+            transport=transport
+        )
+
+    async def __aenter__(self) -> "AsyncDevMindClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Fecha as conexões do pool"""
+        await self._client.aclose()
+
+    async def request(self, method: str, url: str,
+                      upload: Optional[Tuple[Union[PathLike, bytes], Optional[str]]] = None,
+                      **kwargs: Any) -> Dict[str, Any]:
+        """
+        Executa a requisição com novas tentativas (ver DevMindClient.request)
+
+        Arquivos são lidos numa thread a cada tentativa, dentro do limite de
+        concorrência: a leitura síncrona do upload bloquearia o event loop.
+        """
+        attempt = 0
+        while True:
+            response = None
+            error: Optional[Exception] = None
+            async with self._semaphore:
+                files = None
+                try:
+                    if upload is not None:
+                        name, content = await _async_upload(*upload)
+                        files = {"file": (name, content, "application/pdf")}
+                    response = await self._client.request(method, url, files=files, **kwargs)
+                except httpx.TransportError as e:
+                    error = e
+
+            delay = self.retry.delay(attempt, response)
+            if delay is None:
+                if error is not None:
+                    raise error
+                if response.is_error:
+                    raise DevMindError(response.status_code, _error_detail(response))
+                return response.json()
+
+            logger.debug("Nova tentativa de %s %s em %.2fs (%s)", method, url, delay,
+                         response.status_code if response is not None else error)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def convert(self, source: Union[PathLike, bytes], filename: Optional[str] = None,
+                      **options: Any) -> Dict[str, Any]:
+        """Converte um PDF (caminho ou bytes) via /convert-pdf"""
+        return await self.request("POST", "/convert-pdf", upload=(source, filename),
+                                  params=_conversion_params(**options))
+
+    async def iter_convert(self, sources: Iterable[Union[PathLike, bytes]],
+                           **options: Any) -> AsyncIterator[Tuple[Union[PathLike, bytes], Dict[str, Any]]]:
+        """
+        Converte vários PDFs, entregando (origem, resultado) na ordem de conclusão
+
+        Se o consumidor parar antes do fim, as requisições em andamento são
+        canceladas ao fechar o gerador (use contextlib.aclosing para fechá-lo
+        logo após o break).
+        """
+
+        async def run(source):
+            return source, await self._convert_safe(source, **options)
+
+        sources = iter(sources)
+        pending = set()
+        try:
+            for source in sources:
+                pending.add(asyncio.ensure_future(run(source)))
+                # O semáforo limita as requisições; isto limita as tarefas criadas
+                if len(pending) >= self.max_concurrency * 2:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield task.result()
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def convert_many(self, sources: Iterable[Union[PathLike, bytes]],
+                           **options: Any) -> List[Dict[str, Any]]:
+        """Converte vários PDFs em paralelo, mantendo a ordem de entrada"""
+        sources = list(sources)
+        results = await asyncio.gather(*(self._convert_safe(source, **options) for source in sources))
+        return list(results)
+
+    async def _convert_safe(self, source: Union[PathLike, bytes], **options: Any) -> Dict[str, Any]:
+        try:
+            return await self.convert(source, **options)
+        except (DevMindError, httpx.HTTPError, OSError) as e:
+            return {"success": False, "error": str(e)}
+
+    async def inspect(self, source: Union[PathLike, bytes], filename: Optional[str] = None) -> Dict[str, Any]:
+        """Metadados do PDF via /inspect-pdf (páginas, criptografia, camada de texto)"""
+        return await self.request("POST", "/inspect-pdf", upload=(source, filename))
+
+    async def submit_job(self, source: Union[PathLike, bytes], filename: Optional[str] = None,
+                         **options: Any) -> Dict[str, Any]:
+        """Enfileira a conversão no modo distribuído (POST /jobs)"""
+        return await self.request("POST", "/jobs", upload=(source, filename),
+                                  params=_conversion_params(**options))
+
+    async def get_job(self, job_id: str) -> Dict[str, Any]:
+        """Estado do job (com o resultado, se concluído)"""
+        return await self.request("GET", f"/jobs/{job_id}")
+
+    async def wait_job(self, job_id: str, timeout: Optional[float] = None,
+                       poll_interval: float = JOB_POLL_INTERVAL) -> Dict[str, Any]:
+        """Aguarda o job terminar (ver DevMindClient.wait_job)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        delay = poll_interval
+        while True:
+            job = await self.get_job(job_id)
+            if job["status"] in JOB_FINAL_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() + delay > deadline:
+                raise TimeoutError(f"Job {job_id} não terminou em {timeout}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 1.5, JOB_POLL_MAX_INTERVAL)
+
+    async def workers(self) -> Dict[str, Any]:
+        """Carga dos workers e estado da fila (GET /workers)"""
+        return await self.request("GET", "/workers")
+
+    async def health(self) -> Dict[str, Any]:
+        """Status de /health"""
+        return await self.request("GET", "/health")
+
+    async def converters(self) -> Dict[str, Any]:
+        """Lista de /converters"""
+        return await self.request("GET", "/converters")
@@ -0,0 +1,14 @@
+"""
+Modo distribuído: a API enfileira jobs em um broker e workers separados
+executam as conversões
+"""
+
+from .broker import Broker, create_broker, job_key
+from .storage import ScratchStorage
+
+__all__ = [
+    'Broker',
+    'ScratchStorage',
+    'create_broker',
+    'job_key'
+]
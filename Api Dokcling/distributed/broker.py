@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Interface dos brokers de jobs de conversão
+Os nós da API enfileiram jobs; os workers os recebem com um lease (prazo de
+visibilidade) e publicam o resultado. Jobs cujo lease expira voltam para a
+fila (entrega pelo menos uma vez), e o job_id é derivado do conteúdo e das
+opções, o que torna envio e resultado idempotentes.
+"""
+
+import hashlib
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, Any, List, Optional
+
+BROKER_URL = os.getenv("BROKER_URL")
+# Tempo que um worker tem para concluir (ou renovar) um job recebido
+VISIBILITY_TIMEOUT = float(os.getenv("BROKER_VISIBILITY_TIMEOUT", "120"))
+# Tentativas antes de o job ser marcado como falho
+MAX_ATTEMPTS = int(os.getenv("BROKER_MAX_ATTEMPTS", "3"))
+# Workers sem relatório por este período aparecem como inativos
+WORKER_STALE_SECONDS = float(os.getenv("BROKER_WORKER_STALE_SECONDS", "60"))
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+def job_key(doc_hash: str, options: Dict[str, Any]) -> str:
+    """job_id determinístico: mesmo documento e mesmas opções, mesmo job"""
+    canonical = json.dumps(
+        {key: value for key, value in options.items() if value is not None},
+        sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(f"{doc_hash}:{canonical}".encode()).hexdigest()
+
+
+class Broker(ABC):
+    """Fila de jobs com leases, resultados e relatórios de carga dos workers"""
+
+    def __init__(self, visibility_timeout: float = VISIBILITY_TIMEOUT,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+
+    @abstractmethod
+    def enqueue(self, doc_hash: str, filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Enfileira o job (ou devolve o existente, com o mesmo job_id)
+
+        Jobs falhos são reenfileirados; jobs na fila, em execução ou
+        concluídos são devolvidos como estão.
+        """
+
+    @abstractmethod
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Próximo job disponível (incluindo os de lease expirado), ou None"""
+
+    @abstractmethod
+    def extend(self, job_id: str, worker_id: str) -> bool:
+        """Renova o lease; False se o job não pertence mais ao worker"""
+
+    @abstractmethod
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        """Publica o resultado (ignorado se o job já foi concluído)"""
+
+    @abstractmethod
+    def fail(self, job_id: str, worker_id: str, error: str, retryable: bool = True):
+        """
+        Registra a falha; o job volta à fila até MAX_ATTEMPTS
+
+        Falhas causadas pela entrada (retryable=False) encerram o job na hora.
+        """
+
+    @abstractmethod
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        """Estado do job, com o resultado se concluído (e include_result)"""
+
+    @abstractmethod
+    def report_worker(self, worker_id: str, stats: Dict[str, Any]):
+        """Grava o relatório de carga do worker"""
+
+    @abstractmethod
+    def list_workers(self) -> List[Dict[str, Any]]:
+        """Últimos relatórios dos workers, com o indicador alive"""
+
+    @abstractmethod
+    def get_status(self) -> Dict[str, Any]:
+        """Contagem de jobs por estado"""
+
+    def close(self):
+        """Libera conexões"""
+
+
+def create_broker(url: Optional[str] = None) -> Broker:
+    """
+    Cria o broker a partir da URL (BROKER_URL)
+
+    sqlite:///data/jobs.db (relativo) ou sqlite:////var/jobs.db (absoluto)
+    para testes locais ou um volume compartilhado; redis://host:6379/0 para
+    implantações com vários nós.
+    """
+    url = url or BROKER_URL
+    if not url:
+        raise ValueError("BROKER_URL não configurado")
+
+    if url.startswith("sqlite:///"):
+        from .sqlite_broker import SQLiteBroker
+        return SQLiteBroker(url[len("sqlite:///"):])
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        from .redis_broker import RedisBroker
+        return RedisBroker(url)
+
+    raise ValueError(f"Broker não suportado: {url}")
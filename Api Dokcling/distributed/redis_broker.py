@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Broker Redis (ou compatível) para implantações com vários nós
+Cada operação de fila é um script Lua atômico; os jobs ficam em hashes,
+a fila em uma lista e os leases em um sorted set pontuado pelo prazo
+"""
+
+import json
+import os
+import time
+from typing import Dict, Any, List, Optional
+
+from .broker import Broker, WORKER_STALE_SECONDS, job_key
+
+# Resultados concluídos expiram após este período (o job pode ser reenviado)
+RESULT_TTL_SECONDS = int(os.getenv("BROKER_RESULT_TTL_SECONDS", str(7 * 24 * 3600)))
+
+_ENQUEUE = """
+local status = redis.call('HGET', KEYS[1], 'status')
+if not status then
+  redis.call('HSET', KEYS[1], 'job_id', ARGV[1], 'doc_hash', ARGV[2], 'filename', ARGV[3],
+             'options', ARGV[4], 'status', 'queued', 'attempts', 0,
+             'created_at', ARGV[5], 'updated_at', ARGV[5])
+  redis.call('LPUSH', KEYS[2], ARGV[1])
+elseif status == 'failed' then
+  redis.call('HSET', KEYS[1], 'status', 'queued', 'attempts', 0, 'updated_at', ARGV[5])
+  redis.call('HDEL', KEYS[1], 'error', 'worker_id', 'lease_until')
+  redis.call('LPUSH', KEYS[2], ARGV[1])
+end
+return 1
+"""
+
+# Devolve à fila os jobs de lease expirado e entrega o próximo job
+_LEASE = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+for _, id in ipairs(expired) do
+  redis.call('ZREM', KEYS[2], id)
+  local job = ARGV[5] .. id
+  if redis.call('HGET', job, 'status') == 'running' then
+    redis.call('HDEL', job, 'worker_id', 'lease_until')
+    if tonumber(redis.call('HGET', job, 'attempts')) >= tonumber(ARGV[4]) then
+      redis.call('HSET', job, 'status', 'failed', 'updated_at', ARGV[2],
+                 'error', 'Lease expirado após o máximo de tentativas')
+    else
+      redis.call('HSET', job, 'status', 'queued', 'updated_at', ARGV[2])
+      redis.call('RPUSH', KEYS[1], id)
+    end
+  end
+end
+while true do
+  local id = redis.call('RPOP', KEYS[1])
+  if not id then return false end
+  local job = ARGV[5] .. id
+  if redis.call('HGET', job, 'status') == 'queued' then
+    redis.call('HSET', job, 'status', 'running', 'worker_id', ARGV[1],
+               'lease_until', ARGV[3], 'updated_at', ARGV[2])
+    redis.call('HINCRBY', job, 'attempts', 1)
+    redis.call('ZADD', KEYS[2], ARGV[3], id)
+    return id
+  end
+end
+"""
+
+_EXTEND = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'running'
+   or redis.call('HGET', KEYS[1], 'worker_id') ~= ARGV[1] then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'lease_until', ARGV[2], 'updated_at', ARGV[3])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[4])
+return 1
+"""
+
+_COMPLETE = """
+redis.call('ZREM', KEYS[2], ARGV[4])
+if redis.call('HGET', KEYS[1], 'status') == 'done' then
+  return 0
+end
+redis.call('HSET', KEYS[1], 'status', 'done', 'result', ARGV[1], 'worker_id', ARGV[2], 'updated_at', ARGV[3])
+redis.call('HDEL', KEYS[1], 'lease_until', 'error')
+if tonumber(ARGV[5]) > 0 then
+  redis.call('EXPIRE', KEYS[1], ARGV[5])
+end
+return 1
+"""
+
+_FAIL = """
+if redis.call('HGET', KEYS[1], 'status') ~= 'running'
+   or redis.call('HGET', KEYS[1], 'worker_id') ~= ARGV[1] then
+  return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[5])
+redis.call('HDEL', KEYS[1], 'worker_id', 'lease_until')
+if tonumber(redis.call('HGET', KEYS[1], 'attempts')) >= tonumber(ARGV[4]) then
+  redis.call('HSET', KEYS[1], 'status', 'failed', 'error', ARGV[2], 'updated_at', ARGV[3])
+else
+  redis.call('HSET', KEYS[1], 'status', 'queued', 'error', ARGV[2], 'updated_at', ARGV[3])
+  redis.call('RPUSH', KEYS[3], ARGV[5])
+end
+return 1
+"""
+
+
+class RedisBroker(Broker):
+    """
+    Fila de jobs no Redis
+
+    Os scripts acessam as chaves dos jobs pelo prefixo; em Redis Cluster,
+    use um prefixo com hash tag (ex.: "{devmind}") para mantê-las no mesmo slot.
+    """
+
+    def __init__(self, url: str, prefix: str = "devmind", **kwargs):
+        super().__init__(**kwargs)
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("Broker Redis requer o pacote redis: pip install redis") from e
+
+        self.url = url
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._queue = f"{prefix}:queue"
+        self._leases = f"{prefix}:leases"
+        self._workers = f"{prefix}:workers"
+        self._enqueue = self._redis.register_script(_ENQUEUE)
+        self._lease = self._redis.register_script(_LEASE)
+        self._extend = self._redis.register_script(_EXTEND)
+        self._complete = self._redis.register_script(_COMPLETE)
+        self._fail = self._redis.register_script(_FAIL)
+
+    def _job(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def enqueue(self, doc_hash: str, filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = job_key(doc_hash, options)
+        self._enqueue(
+            keys=[self._job(job_id), self._queue],
+            args=[job_id, doc_hash, filename, json.dumps(options), time.time()]
+        )
+        return self.get_job(job_id, include_result=False)
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        job_id = self._lease(
+            keys=[self._queue, self._leases],
+            args=[worker_id, now, now + self.visibility_timeout, self.max_attempts, f"{self.prefix}:job:"]
+        )
+        return self.get_job(job_id, include_result=False) if job_id else None
+
+    def extend(self, job_id: str, worker_id: str) -> bool:
+        now = time.time()
+        return bool(self._extend(
+            keys=[self._job(job_id), self._leases],
+            args=[worker_id, now + self.visibility_timeout, now, job_id]
+        ))
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        self._complete(
+            keys=[self._job(job_id), self._leases],
+            args=[json.dumps(result, ensure_ascii=False), worker_id, time.time(), job_id, RESULT_TTL_SECONDS]
+        )
+
+    def fail(self, job_id: str, worker_id: str, error: str, retryable: bool = True):
+        # Sem nova tentativa, qualquer número de tentativas já é o limite
+        max_attempts = self.max_attempts if retryable else 0
+        self._fail(
+            keys=[self._job(job_id), self._leases, self._queue],
+            args=[worker_id, error, time.time(), max_attempts, job_id]
+        )
+
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        data = self._redis.hgetall(self._job(job_id))
+        if not data:
+            return None
+        job: Dict[str, Any] = {
+            "job_id": data.get("job_id", job_id),
+            "doc_hash": data.get("doc_hash"),
+            "filename": data.get("filename"),
+            "options": json.loads(data.get("options", "{}")),
+            "status": data.get("status"),
+            "attempts": int(data.get("attempts", 0)),
+            "worker_id": data.get("worker_id"),
+            "lease_until": float(data["lease_until"]) if data.get("lease_until") else None,
+            "created_at": float(data.get("created_at", 0)),
+            "updated_at": float(data.get("updated_at", 0))
+        }
+        if data.get("error"):
+            job["error"] = data["error"]
+        if include_result and data.get("result"):
+            job["result"] = json.loads(data["result"])
+        return job
+
+    def report_worker(self, worker_id: str, stats: Dict[str, Any]):
+        self._redis.hset(self._workers, worker_id, json.dumps(dict(stats, updated_at=time.time())))
+
+    def list_workers(self) -> List[Dict[str, Any]]:
+        now = time.time()
+        workers = []
+        for worker_id, raw in sorted(self._redis.hgetall(self._workers).items()):
+            stats = json.loads(raw)
+            stats.update(worker_id=worker_id, alive=now - stats.get("updated_at", 0) < WORKER_STALE_SECONDS)
+            workers.append(stats)
+        return workers
+
+    def get_status(self) -> Dict[str, Any]:
+        # Contagens exatas de concluídos/falhos exigiriam varrer as chaves
+        return {
+            "broker": "redis",
+            "url": self.url.split("@")[-1],
+            "jobs": {
+                "queued": self._redis.llen(self._queue),
+                "running": self._redis.zcard(self._leases)
+            }
+        }
+
+    def close(self):
+        self._redis.close()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Broker SQLite para testes locais e implantações em um único host
+Vários processos (API e workers) compartilham o mesmo arquivo em modo WAL
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional
+
+from .broker import Broker, JOB_STATUSES, WORKER_STALE_SECONDS, job_key
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    doc_hash TEXT NOT NULL,
+    filename TEXT,
+    options TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_until REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    stats TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+_JOB_COLUMNS = ("job_id", "doc_hash", "filename", "options", "status", "attempts",
+                "worker_id", "lease_until", "created_at", "updated_at", "result", "error")
+
+
+class SQLiteBroker(Broker):
+    """Fila de jobs em um arquivo SQLite"""
+
+    def __init__(self, path: str, **kwargs):
+        super().__init__(**kwargs)
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transação com lock de escrita desde o início (evita corridas no lease)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def enqueue(self, doc_hash: str, filename: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = job_key(doc_hash, options)
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, doc_hash, filename, options, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, 'queued', ?, ?)",
+                    (job_id, doc_hash, filename, json.dumps(options), now, now)
+                )
+            elif row[0] == "failed":
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', attempts = 0, error = NULL, worker_id = NULL, "
+                    "lease_until = NULL, updated_at = ? WHERE job_id = ?",
+                    (now, job_id)
+                )
+        return self.get_job(job_id, include_result=False)
+
+    def lease(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs com lease expirado que esgotaram as tentativas são encerrados
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Lease expirado após o máximo de tentativas', "
+                "worker_id = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                (now, now, self.max_attempts)
+            )
+            row = conn.execute(
+                "SELECT job_id FROM jobs WHERE status = 'queued' "
+                "OR (status = 'running' AND lease_until < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'running', worker_id = ?, lease_until = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE job_id = ?",
+                (worker_id, now + self.visibility_timeout, now, row[0])
+            )
+        return self.get_job(row[0], include_result=False)
+
+    def extend(self, job_id: str, worker_id: str) -> bool:
+        now = time.time()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (now + self.visibility_timeout, now, job_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id: str, worker_id: str, result: Dict[str, Any]):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, worker_id = ?, "
+                "lease_until = NULL, updated_at = ? WHERE job_id = ? AND status != 'done'",
+                (json.dumps(result, ensure_ascii=False), worker_id, time.time(), job_id)
+            )
+
+    def fail(self, job_id: str, worker_id: str, error: str, retryable: bool = True):
+        # Sem nova tentativa, qualquer número de tentativas já é o limite
+        max_attempts = self.max_attempts if retryable else 0
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "error = ?, worker_id = NULL, lease_until = NULL, updated_at = ? "
+                "WHERE job_id = ? AND worker_id = ? AND status = 'running'",
+                (max_attempts, error, time.time(), job_id, worker_id)
+            )
+
+    def get_job(self, job_id: str, include_result: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_JOB_COLUMNS, row))
+        job["options"] = json.loads(job["options"])
+        result = job.pop("result")
+        if include_result and result is not None:
+            job["result"] = json.loads(result)
+        if job["error"] is None:
+            job.pop("error")
+        return job
+
+    def report_worker(self, worker_id: str, stats: Dict[str, Any]):
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, stats, updated_at) VALUES (?, ?, ?)",
+                (worker_id, json.dumps(stats), time.time())
+            )
+
+    def list_workers(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT worker_id, stats, updated_at FROM workers ORDER BY worker_id"
+            ).fetchall()
+        now = time.time()
+        return [
+            dict(json.loads(stats), worker_id=worker_id, updated_at=updated_at,
+                 alive=now - updated_at < WORKER_STALE_SECONDS)
+            for worker_id, stats, updated_at in rows
+        ]
+
+    def get_status(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update(dict(rows))
+        return {"broker": "sqlite", "path": self.path, "jobs": counts}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Armazenamento temporário compartilhado dos uploads
+Diretório endereçado por conteúdo (SHA-256) visível para a API e os workers
+(volume compartilhado, NFS etc.)
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SCRATCH_DIR = os.getenv("SCRATCH_DIR", "./data/scratch")
+# Uploads mais antigos que isto são removidos pela limpeza periódica dos workers
+SCRATCH_TTL_HOURS = float(os.getenv("SCRATCH_TTL_HOURS", "48"))
+
+
+class ScratchStorage:
+    """Arquivos de upload por hash, gravados de forma atômica"""
+
+    def __init__(self, directory: str = SCRATCH_DIR, ttl_hours: float = SCRATCH_TTL_HOURS):
+        self.directory = Path(directory)
+        self.ttl_hours = ttl_hours
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, doc_hash: str) -> Path:
+        # Subdiretórios pelo prefixo evitam diretórios com milhões de entradas
+        return self.directory / doc_hash[:2] / f"{doc_hash}.pdf"
+
+    def put(self, content: bytes) -> str:
+        """Grava o conteúdo (uma vez por hash) e retorna o hash"""
+        doc_hash = hashlib.sha256(content).hexdigest()
+        path = self._path(doc_hash)
+        if path.exists():
+            # Renova o arquivo para a limpeza por idade
+            os.utime(path)
+            return doc_hash
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return doc_hash
+
+    def get(self, doc_hash: str) -> Optional[bytes]:
+        """Conteúdo do upload, ou None se não existe mais"""
+        try:
+            return self._path(doc_hash).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def purge_expired(self) -> int:
+        """Remove uploads mais antigos que ttl_hours; retorna quantos"""
+        cutoff = time.time() - self.ttl_hours * 3600
+        removed = 0
+        for path in self.directory.glob("*/*"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                pass
+        if removed:
+            logger.info("Limpeza do armazenamento temporário: %d arquivos removidos", removed)
+        return removed
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"directory": str(self.directory), "ttl_hours": self.ttl_hours}
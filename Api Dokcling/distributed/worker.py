@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Worker de conversão do modo distribuído
+Recebe jobs do broker, lê o upload do armazenamento compartilhado, converte
+com o ConverterManager e publica o resultado, renovando os leases dos jobs
+em andamento e reportando a própria carga
+
+Uso:
+    python -m distributed.worker --broker sqlite:///data/jobs.db --concurrency 2
+"""
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+from .broker import Broker, create_broker
+from .storage import ScratchStorage
+
+logger = logging.getLogger(__name__)
+
+WORKER_CONCURRENCY = int(os.getenv("WORKER_CONCURRENCY", "1"))
+WORKER_POLL_INTERVAL = float(os.getenv("WORKER_POLL_INTERVAL", "1.0"))
+WORKER_REPORT_INTERVAL = float(os.getenv("WORKER_REPORT_INTERVAL", "10"))
+# Intervalo entre limpezas do armazenamento temporário
+SCRATCH_PURGE_INTERVAL = 3600.0
+
+
+class InputError(RuntimeError):
+    """Falha causada pelo próprio job (upload ausente, PDF protegido ou inválido), sem nova tentativa"""
+
+
+class Worker:
+    """Consome jobs do broker com concurrency threads"""
+
+    def __init__(self, broker: Broker, storage: ScratchStorage,
+                 converter_names: Optional[str] = None,
+                 concurrency: int = WORKER_CONCURRENCY,
+                 worker_id: Optional[str] = None,
+                 poll_interval: float = WORKER_POLL_INTERVAL,
+                 report_interval: float = WORKER_REPORT_INTERVAL):
+        from converters.manager import ConverterManager
+
+        self.broker = broker
+        self.storage = storage
+        self.concurrency = concurrency
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.poll_interval = poll_interval
+        # Renova os leases bem antes do prazo de visibilidade
+        self.report_interval = min(report_interval, broker.visibility_timeout / 3)
+        self.manager = ConverterManager(converter_names)
+
+        self.stop_event = threading.Event()
+        self._active: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._stats = {"processed": 0, "failed": 0, "busy_ms": 0.0, "last_job_at": None}
+        self._started_at = time.time()
+
+    def run(self):
+        """Executa até stop() (ou SIGTERM/SIGINT, se chamado na thread principal)"""
+        if threading.current_thread() is threading.main_thread():
+            for sig in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(sig, lambda signum, frame: self.stop())
+
+        logger.info("👷 Worker %s iniciado (%d threads)", self.worker_id, self.concurrency)
+        threads: List[threading.Thread] = [
+            threading.Thread(target=self._consume, name=f"worker-{i}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+
+        try:
+            last_purge = 0.0
+            while not self.stop_event.wait(self.report_interval):
+                self._heartbeat()
+                if time.time() - last_purge > SCRATCH_PURGE_INTERVAL:
+                    self.storage.purge_expired()
+                    last_purge = time.time()
+
+            # Termina os jobs em andamento (leases ainda renovados) antes de sair
+            while any(thread.is_alive() for thread in threads):
+                self._heartbeat()
+                for thread in threads:
+                    thread.join(timeout=self.report_interval / len(threads))
+            self._heartbeat()
+        finally:
+            # Inclui o pool de processos do OCR, que sobreviveria ao worker
+            self.manager.shutdown()
+        logger.info("Worker %s encerrado", self.worker_id)
+
+    def stop(self):
+        """Para de receber jobs; os em andamento são concluídos"""
+        if not self.stop_event.is_set():
+            logger.info("⏳ Worker %s parando após os jobs em andamento", self.worker_id)
+            self.stop_event.set()
+
+    def _consume(self):
+        while not self.stop_event.is_set():
+            try:
+                job = self.broker.lease(self.worker_id)
+            except Exception as e:
+                logger.warning("Falha ao receber job do broker: %s", e)
+                job = None
+            if job is None:
+                self.stop_event.wait(self.poll_interval)
+                continue
+            self._process(job)
+
+    def _process(self, job: Dict[str, Any]):
+        """Converte um job e publica o resultado (ou a falha)"""
+        job_id = job["job_id"]
+        with self._lock:
+            self._active[job_id] = time.time()
+        start = time.perf_counter()
+        try:
+            content = self.storage.get(job["doc_hash"])
+            if content is None:
+                raise InputError("Upload não encontrado no armazenamento temporário")
+
+            result = self.manager.convert_pdf(content, job["filename"], **job["options"])
+            if not result.get("success"):
+                error = InputError if result.get("input_error") else RuntimeError
+                raise error(result.get("error", "Falha na conversão"))
+
+            result["job_id"] = job_id
+            result["worker_id"] = self.worker_id
+            self.broker.complete(job_id, self.worker_id, result)
+            succeeded = True
+        except Exception as e:
+            logger.warning("Job %s falhou (tentativa %s): %s", job_id[:12], job.get("attempts"), e)
+            try:
+                self.broker.fail(job_id, self.worker_id, str(e), retryable=not isinstance(e, InputError))
+            except Exception as broker_error:
+                # O lease expira e o job volta para a fila
+                logger.error("Falha ao registrar erro do job %s: %s", job_id[:12], broker_error)
+            succeeded = False
+        finally:
+            with self._lock:
+                self._active.pop(job_id, None)
+
+        with self._lock:
+            self._stats["processed" if succeeded else "failed"] += 1
+            self._stats["busy_ms"] += (time.perf_counter() - start) * 1000
+            self._stats["last_job_at"] = time.time()
+
+    def _heartbeat(self):
+        """Renova os leases dos jobs em andamento e publica o relatório de carga"""
+        with self._lock:
+            active = list(self._active)
+        for job_id in active:
+            try:
+                if not self.broker.extend(job_id, self.worker_id):
+                    logger.warning("Lease do job %s perdido (outro worker pode processá-lo)", job_id[:12])
+            except Exception as e:
+                logger.warning("Falha ao renovar o lease do job %s: %s", job_id[:12], e)
+        try:
+            self.broker.report_worker(self.worker_id, self.get_stats())
+        except Exception as e:
+            logger.warning("Falha ao reportar a carga do worker: %s", e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Carga atual do worker"""
+        from converters.memory import current_rss_bytes
+
+        with self._lock:
+            stats = dict(self._stats)
+            in_flight = len(self._active)
+        done = stats["processed"] + stats["failed"]
+        uptime = time.time() - self._started_at
+        return {
+            "host": socket.gethostname(),
+            "pid": os.getpid(),
+            "concurrency": self.concurrency,
+            "in_flight": in_flight,
+            "processed": stats["processed"],
+            "failed": stats["failed"],
+            "avg_job_ms": round(stats["busy_ms"] / done, 1) if done else None,
+            "utilization": round(stats["busy_ms"] / 1000 / (uptime * self.concurrency), 3) if uptime else 0.0,
+            "last_job_at": stats["last_job_at"],
+            "rss_mb": round(current_rss_bytes() / 1024 / 1024, 1),
+            "started_at": self._started_at,
+            "stopping": self.stop_event.is_set()
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Worker de conversão do modo distribuído")
+    parser.add_argument("--broker", default=None, help="URL do broker (padrão: BROKER_URL)")
+    parser.add_argument("--scratch", default=None, help="Diretório compartilhado (padrão: SCRATCH_DIR)")
+    parser.add_argument("--concurrency", type=int, default=WORKER_CONCURRENCY, help="Jobs simultâneos")
+    parser.add_argument("--converters", default=None, help="Conversores habilitados (padrão: PDF_CONVERTERS)")
+    parser.add_argument("--worker-id", default=None, help="Identificador (padrão: host-pid)")
+    args = parser.parse_args(argv)
+
+    from logging_config import configure_logging
+    configure_logging()
+
+    broker = create_broker(args.broker)
+    storage = ScratchStorage(args.scratch) if args.scratch else ScratchStorage()
+    worker = Worker(broker, storage, args.converters, args.concurrency, args.worker_id)
+    try:
+        worker.run()
+    finally:
+        broker.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
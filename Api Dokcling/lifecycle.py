@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Desligamento gracioso da API
+No SIGTERM a API deixa de admitir conversões (503 com Retry-After, /health
+em "draining"), aguarda as conversões em andamento até DRAIN_TIMEOUT e só
+então repassa o sinal ao servidor (uvicorn)
+"""
+
+import logging
+import os
+import signal
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+DRAIN_TIMEOUT = float(os.getenv("DRAIN_TIMEOUT", "25"))
+DRAIN_RETRY_AFTER = int(os.getenv("DRAIN_RETRY_AFTER", "5"))
+
+
+class DrainController:
+    """Contador de conversões em andamento e estado de desligamento"""
+
+    def __init__(self, timeout: float = DRAIN_TIMEOUT):
+        self.timeout = timeout
+        self.draining = False
+        self.deadline: Optional[float] = None
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Marca o bloco como trabalho em andamento"""
+        with self._condition:
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify_all()
+
+    def begin(self):
+        """Para de admitir trabalho novo"""
+        with self._condition:
+            if not self.draining:
+                self.draining = True
+                self.deadline = time.monotonic() + self.timeout
+                logger.info("⏳ Desligamento iniciado: %d conversões em andamento, prazo de %.0fs",
+                            self._in_flight, self.timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Aguarda o fim das conversões em andamento (False se o prazo esgotar)"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._in_flight == 0, timeout)
+
+    def install_signal_handler(self, sig: int = signal.SIGTERM) -> bool:
+        """
+        Intercepta o sinal, drena e depois chama o handler anterior
+
+        Deve ser chamado depois que o servidor instalou os próprios handlers
+        (evento de startup). Um segundo sinal é repassado imediatamente.
+        """
+        try:
+            previous = signal.getsignal(sig)
+
+            def handler(signum, frame):
+                if self.draining:
+                    _forward(previous, signum, frame)
+                    return
+                self.begin()
+                threading.Thread(
+                    target=self._drain_then_forward, args=(previous, signum, frame),
+                    name="drain", daemon=True
+                ).start()
+
+            signal.signal(sig, handler)
+            return True
+        except ValueError:
+            # Fora da thread principal (ex.: TestClient): sem interceptação
+            logger.debug("Handler de %s não instalado (fora da thread principal)", sig)
+            return False
+
+    def _drain_then_forward(self, previous: Any, signum: int, frame: Any):
+        if self.wait_idle(self.timeout):
+            logger.info("✅ Conversões em andamento concluídas; encerrando")
+        else:
+            logger.warning("⚠️ Prazo de desligamento esgotado com %d conversões em andamento "
+                           "(o progresso por página fica no checkpoint)", self._in_flight)
+        _forward(previous, signum, frame)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Estado do desligamento para o /health"""
+        remaining = None
+        if self.deadline is not None:
+            remaining = round(max(self.deadline - time.monotonic(), 0.0), 1)
+        return {
+            "draining": self.draining,
+            "in_flight": self._in_flight,
+            "drain_remaining_seconds": remaining
+        }
+
+
+def _forward(previous: Any, signum: int, frame: Any):
+    """Repassa o sinal ao handler anterior (ou ao comportamento padrão)"""
+    if callable(previous):
+        previous(signum, frame)
+    elif previous == signal.SIG_IGN:
+        return
+    elif threading.current_thread() is threading.main_thread():
+        signal.signal(signum, signal.SIG_DFL)
+        signal.raise_signal(signum)
+    else:
+        # Só a thread principal troca handlers: reentra pelo handler, que já drena
+        os.kill(os.getpid(), signum)
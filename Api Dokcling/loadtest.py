@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Teste de carga da API (main:app)
+Executa a aplicação em processo (ASGI) ou por um socket local (uvicorn) com
+uma mistura configurável de documentos e níveis de concorrência, e mede
+throughput, percentis de latência, taxa de erro e tempo de fila, gerando a
+curva de capacidade
+
+Uso:
+    python loadtest.py --target asgi --concurrency 1,2,4,8 --duration 15
+    python loadtest.py --target socket --server-workers 4 --mix 1:0.6,20:0.3,200:0.1
+    python loadtest.py --url http://api:8000 --corpus ./pdfs --json resultado.json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+import httpx
+
+BASE_DIR = Path(__file__).resolve().parent
+
+# Ganho mínimo de throughput para considerar que o próximo nível ainda escala
+SATURATION_GAIN = 0.10
+
+
+def synthetic_pdf(pages: int, lines_per_page: int = 40) -> bytes:
+    """PDF mínimo com texto em todas as páginas (sem dependências externas)"""
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # /Pages, preenchido após criar as páginas
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+    ]
+    kids = []
+    for page in range(1, pages + 1):
+        lines = [f"BT /F1 11 Tf 50 800 Td 14 TL (Pagina {page}) Tj".encode()]
+        for line in range(lines_per_page):
+            lines.append(f"T* (Linha {line} do documento sintetico de teste de carga) Tj".encode())
+        lines.append(b"ET")
+        stream = b"\n".join(lines)
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(b"%d 0 R" % len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(kids), pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def parse_mix(spec: str) -> List[Tuple[int, float]]:
+    """Converte "1:0.6,20:0.3,200:0.1" em [(páginas, peso), ...]"""
+    mix = []
+    for item in spec.split(","):
+        pages, _, weight = item.partition(":")
+        mix.append((int(pages), float(weight or 1)))
+    return mix
+
+
+def load_documents(corpus: Optional[str], mix: List[Tuple[int, float]]) -> List[Tuple[str, bytes, float]]:
+    """Documentos (nome, conteúdo, peso) do corpus ou sintéticos"""
+    if corpus:
+        paths = sorted(Path(corpus).rglob("*.pdf")) if Path(corpus).is_dir() else [Path(corpus)]
+        documents = [(path.name, path.read_bytes(), 1.0) for path in paths]
+        if not documents:
+            raise SystemExit(f"❌ Nenhum PDF encontrado em {corpus}")
+        return documents
+    return [(f"sintetico-{pages}p.pdf", synthetic_pdf(pages), weight) for pages, weight in mix]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Percentil por interpolação linear (0 para lista vazia)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100
+    low = int(k)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (k - low)
+
+
+class _Level:
+    """Medições de um nível de concorrência"""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        self.latencies: List[float] = []
+        self.queue_waits: List[float] = []
+        self.errors: Dict[str, int] = {}
+        self.pages = 0
+        self.in_flight = 0
+        self.in_flight_samples: List[int] = []
+
+    def record(self, latency_ms: float, status: Any, result: Optional[Dict[str, Any]]):
+        self.latencies.append(latency_ms)
+        if result is not None and result.get("success") and result.get("mode") != "fallback":
+            self.pages += result.get("pages") or 0
+            service_ms = sum((result.get("stage_timings_ms") or {}).values())
+            if service_ms:
+                # Tempo fora da conversão: fila do servidor, upload e serialização
+                self.queue_waits.append(max(latency_ms - service_ms, 0.0))
+        else:
+            key = str(status)
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        total = len(self.latencies)
+        failed = sum(self.errors.values())
+        return {
+            "concurrency": self.concurrency,
+            "requests": total,
+            "errors": failed,
+            "error_rate": round(failed / total, 4) if total else 0.0,
+            "errors_by_status": self.errors,
+            "throughput_rps": round((total - failed) / elapsed, 2),
+            "pages_per_second": round(self.pages / elapsed, 2),
+            "latency_ms": {
+                "p50": round(percentile(self.latencies, 50), 1),
+                "p95": round(percentile(self.latencies, 95), 1),
+                "p99": round(percentile(self.latencies, 99), 1),
+                "max": round(max(self.latencies, default=0.0), 1)
+            },
+            "queue_wait_ms": {
+                "p50": round(percentile(self.queue_waits, 50), 1),
+                "p95": round(percentile(self.queue_waits, 95), 1)
+            },
+            "in_flight": {
+                "avg": round(sum(self.in_flight_samples) / len(self.in_flight_samples), 2)
+                if self.in_flight_samples else 0.0,
+                "max": max(self.in_flight_samples, default=0)
+            },
+            "elapsed_seconds": round(elapsed, 2)
+        }
+
+
+async def run_level(client: httpx.AsyncClient, documents: List[Tuple[str, bytes, float]],
+                    concurrency: int, duration: float, params: Dict[str, Any],
+                    seed: int) -> Dict[str, Any]:
+    """
+    Carga em malha fechada: concurrency usuários enviando documentos
+    sorteados (pelos pesos) até o fim de duration
+    """
+    level = _Level(concurrency)
+    rng = random.Random(seed)
+    weights = [weight for _, _, weight in documents]
+    deadline = time.perf_counter() + duration
+
+    async def user():
+        while time.perf_counter() < deadline:
+            name, content, _ = rng.choices(documents, weights)[0]
+            level.in_flight += 1
+            start = time.perf_counter()
+            status: Any = None
+            result = None
+            try:
+                response = await client.post(
+                    "/convert-pdf", params=params,
+                    files={"file": (name, content, "application/pdf")}
+                )
+                status = response.status_code
+                if response.status_code == 200:
+                    result = response.json()
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            finally:
+                level.in_flight -= 1
+            level.record((time.perf_counter() - start) * 1000, status, result)
+
+    async def sampler():
+        while time.perf_counter() < deadline:
+            level.in_flight_samples.append(level.in_flight)
+            await asyncio.sleep(0.1)
+
+    start = time.perf_counter()
+    await asyncio.gather(sampler(), *(user() for _ in range(concurrency)))
+    return level.summary(time.perf_counter() - start)
+
+
+def capacity_curve(levels: List[Dict[str, Any]], max_error_rate: float) -> Dict[str, Any]:
+    """
+    Ponto de saturação: último nível em que o throughput ainda cresceu pelo
+    menos SATURATION_GAIN e a taxa de erro ficou abaixo de max_error_rate
+    """
+    best = None
+    for previous, current in zip([None] + levels[:-1], levels):
+        if current["error_rate"] > max_error_rate:
+            break
+        if previous is not None and current["throughput_rps"] < previous["throughput_rps"] * (1 + SATURATION_GAIN):
+            break
+        best = current
+    return {
+        "saturation_concurrency": best["concurrency"] if best else None,
+        "max_throughput_rps": max((level["throughput_rps"] for level in levels), default=0.0),
+        "p95_at_saturation_ms": best["latency_ms"]["p95"] if best else None,
+        "curve": [
+            {
+                "concurrency": level["concurrency"],
+                "throughput_rps": level["throughput_rps"],
+                "p95_ms": level["latency_ms"]["p95"],
+                "error_rate": level["error_rate"]
+            }
+            for level in levels
+        ]
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, port: Optional[int] = None, timeout: float = 120.0) -> Tuple[subprocess.Popen, str]:
+    """Inicia o uvicorn com main:app em um socket local e aguarda o /health"""
+    port = port or _free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        cwd=str(BASE_DIR)
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"❌ Servidor encerrou durante a inicialização (código {process.returncode})")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return process, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    process.terminate()
+    raise SystemExit("❌ Servidor não respondeu ao /health a tempo")
+
+
+async def run(target: str, url: Optional[str], documents: List[Tuple[str, bytes, float]],
+              levels: Sequence[int], duration: float, warmup: float,
+              params: Dict[str, Any], timeout: float) -> List[Dict[str, Any]]:
+    """Executa todos os níveis de concorrência contra o alvo"""
+    limits = httpx.Limits(max_connections=max(levels), max_keepalive_connections=max(levels))
+    if target == "asgi":
+        sys.path.insert(0, str(BASE_DIR))
+        from main import app
+        # O log por requisição do httpx distorceria a medição
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest",
+                                   timeout=timeout, limits=limits)
+    else:
+        client = httpx.AsyncClient(base_url=url, timeout=timeout, limits=limits)
+
+    results = []
+    async with client:
+        if warmup > 0:
+            await run_level(client, documents, 1, warmup, params, seed=0)
+        for i, concurrency in enumerate(levels, 1):
+            summary = await run_level(client, documents, concurrency, duration, params, seed=i)
+            results.append(summary)
+            print(
+                f"  c={concurrency:<4} {summary['throughput_rps']:>8.2f} req/s "
+                f"{summary['pages_per_second']:>9.1f} pág/s  "
+                f"p50={summary['latency_ms']['p50']:.0f}ms p95={summary['latency_ms']['p95']:.0f}ms "
+                f"p99={summary['latency_ms']['p99']:.0f}ms  fila p95={summary['queue_wait_ms']['p95']:.0f}ms  "
+                f"erros={summary['error_rate']:.1%}",
+                file=sys.stderr
+            )
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Função principal"""
+    parser = argparse.ArgumentParser(description="Teste de carga da API PDF to Markdown")
+    parser.add_argument("--target", choices=("asgi", "socket"), default="asgi",
+                        help="asgi (em processo) ou socket (uvicorn local)")
+    parser.add_argument("--url", default=None, help="Usa um servidor já em execução (ignora --target)")
+    parser.add_argument("--server-workers", type=int, default=1, help="Workers do uvicorn no modo socket")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="Níveis de concorrência")
+    parser.add_argument("--duration", type=float, default=15.0, help="Segundos por nível")
+    parser.add_argument("--warmup", type=float, default=3.0, help="Segundos de aquecimento")
+    parser.add_argument("--mix", default="1:0.5,10:0.35,100:0.15",
+                        help="Documentos sintéticos páginas:peso (ignorado com --corpus)")
+    parser.add_argument("--corpus", default=None, help="Diretório ou arquivo PDF reais")
+    parser.add_argument("--tables", action="store_true", help="Envia extract_tables=true")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Timeout por requisição (s)")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="Taxa de erro máxima aceita no ponto de saturação")
+    parser.add_argument("--json", default=None, help="Grava o relatório completo em JSON")
+    args = parser.parse_args(argv)
+
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    documents = load_documents(args.corpus, parse_mix(args.mix))
+    params = {"extract_tables": "true"} if args.tables else {}
+
+    process = None
+    url = args.url
+    target = "socket" if url else args.target
+    if target == "socket" and not url:
+        process, url = start_server(args.server_workers)
+
+    print(f"🚀 Teste de carga ({target}{' ' + url if url else ''}), "
+          f"{len(documents)} documento(s), níveis {levels}", file=sys.stderr)
+    try:
+        results = asyncio.run(run(target, url, documents, levels, args.duration,
+                                  args.warmup, params, args.timeout))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=30)
+
+    report = {
+        "target": target,
+        "url": url,
+        "server_workers": args.server_workers if process is not None else None,
+        "documents": [{"name": name, "size_bytes": len(content), "weight": weight}
+                      for name, content, weight in documents],
+        "params": params,
+        "levels": results,
+        "capacity": capacity_curve(results, args.max_error_rate)
+    }
+
+    capacity = report["capacity"]
+    print("📊 Capacidade:")
+    print(f"   saturação em c={capacity['saturation_concurrency']} "
+          f"(p95 {capacity['p95_at_saturation_ms']} ms), "
+          f"máximo {capacity['max_throughput_rps']} req/s")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"   relatório: {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
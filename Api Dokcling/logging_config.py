@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Configuração de logging da API
+Texto ou JSON estruturado, com escrita em uma thread separada (QueueHandler)
+para que o I/O de log nunca bloqueie as conversões
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Optional
+
+LOG_FORMATS = ("text", "json")
+
+# Logger dedicado ao registro-resumo de cada conversão
+conversion_logger = logging.getLogger("conversion")
+
+_listener: Optional[QueueListener] = None
+
+
+class _LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler que só interpola a mensagem na thread de origem
+
+    O QueueHandler padrão chama format() em prepare(); aqui apenas msg % args
+    é resolvido (os args podem ser objetos mutáveis, alterados antes de o
+    listener processar o registro), e o resto da formatação (horário,
+    exceção, campos de evento) fica para a thread do listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        message = record.getMessage()
+        record = copy.copy(record)
+        record.msg = message
+        record.args = None
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """Uma linha JSON por registro; campos de extra={"event": {...}} vão na raiz"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        event = getattr(record, "event", None)
+        if isinstance(event, dict):
+            payload.update(event)
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Formato texto tradicional, com os campos de evento como chave=valor"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        event = getattr(record, "event", None)
+        if isinstance(event, dict):
+            line += " " + " ".join(f"{key}={value}" for key, value in event.items())
+        return line
+
+
+def configure_logging(level: Optional[str] = None, log_format: Optional[str] = None) -> QueueListener:
+    """
+    Configura o logger raiz com um QueueHandler não bloqueante
+
+    Args:
+        level: Nível de log (padrão: LOG_LEVEL ou info)
+        log_format: "text" ou "json" (padrão: LOG_FORMAT ou text)
+    """
+    global _listener
+
+    level = (level or os.getenv("LOG_LEVEL", "info")).upper()
+    log_format = (log_format or os.getenv("LOG_FORMAT", "text")).lower()
+    if log_format not in LOG_FORMATS:
+        log_format = "text"
+
+    if _listener is not None:
+        _stop_listener()
+    else:
+        atexit.register(_stop_listener)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JSONFormatter() if log_format == "json" else TextFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_LazyQueueHandler(log_queue))
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def _stop_listener():
+    """Para o listener atual, escrevendo os registros ainda na fila"""
+    # QueueListener.stop() falha se chamado duas vezes
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def log_conversion(request_id: str, result: Dict[str, Any], size_bytes: int,
+                   elapsed_ms: float):
+    """Emite um único registro-resumo por conversão"""
+    if not conversion_logger.isEnabledFor(logging.INFO):
+        return
+
+    event = {
+        "event": "conversion",
+        "request_id": request_id,
+        "filename": result.get("filename"),
+        "bytes": size_bytes,
+        "pages": result.get("pages"),
+        "converter": result.get("converter_used"),
+        "success": result.get("success"),
+        "mode": result.get("mode"),
+        "elapsed_ms": round(elapsed_ms, 2),
+        "stage_timings_ms": result.get("stage_timings_ms"),
+        "cache_hit": bool(result.get("ocr_cache_hits") or result.get("reused_pages")),
+        "reused_pages": result.get("reused_pages", 0),
+        "hedged": result.get("hedged", False)
+    }
+    if "profile_id" in result:
+        event["profile_id"] = result["profile_id"]
+
+    conversion_logger.info("conversion", extra={"event": event})
+
+
+def new_request_id() -> str:
+    """Identificador curto para correlacionar os logs de uma requisição"""
+    return f"{int(time.time() * 1000):x}-{os.urandom(4).hex()}"
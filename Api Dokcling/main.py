@@ -1,11 +1,25 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Header, Request
+from fastapi.responses import JSONResponse, Response, FileResponse
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional
+import hmac
 import logging
+import os
+import time
 import uvicorn
+from logging_config import configure_logging, log_conversion, new_request_id
+from lifecycle import DrainController, DRAIN_RETRY_AFTER
 from converters.manager import ConverterManager
+from converters.structure import OUTPUT_FORMATS, CHUNK_UNITS
+from converters.profiling import should_profile
+from converters.docling import DOCLING_PIPELINES
+from converters.inspection import inspect_pdf
+from converters.assets import AssetStore, ASSET_MEDIA_TYPES
+from distributed.broker import BROKER_URL, create_broker
+from distributed.storage import ScratchStorage
 
-# Configuração de logging
-logging.basicConfig(level=logging.INFO)
+# Configuração de logging (LOG_LEVEL, LOG_FORMAT=text|json)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 app = FastAPI(
@@ -17,6 +31,49 @@ app = FastAPI(
 # Inicialização do gerenciador de conversores
 logger.info("🚀 Inicializando PDF to Markdown Converter API v2.0")
 converter_manager = ConverterManager()
+drain = DrainController()
+asset_store = AssetStore()
+
+# Modo distribuído (BROKER_URL): /jobs enfileira conversões para os workers
+job_broker = None
+scratch_storage = None
+if BROKER_URL:
+    try:
+        job_broker = create_broker(BROKER_URL)
+        scratch_storage = ScratchStorage()
+        logger.info("📬 Modo distribuído habilitado: %s", job_broker.get_status()["broker"])
+    except Exception as e:
+        logger.error(f"❌ Broker indisponível, modo distribuído desabilitado: {e}")
+        job_broker = None
+
+# Endpoints que recebem trabalho novo (recusados durante o desligamento)
+ADMISSION_PATHS = ("/convert-pdf", "/inspect-pdf", "/jobs")
+
+@app.on_event("startup")
+async def install_drain_handler():
+    """Intercepta o SIGTERM depois que o uvicorn instalou os próprios handlers"""
+    drain.install_signal_handler()
+
+@app.on_event("shutdown")
+async def shutdown_converters():
+    """Libera os pools dos conversores e a conexão com o broker"""
+    converter_manager.shutdown()
+    if job_broker is not None:
+        job_broker.close()
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Recusa trabalho novo durante o desligamento e conta o trabalho em andamento"""
+    if request.url.path not in ADMISSION_PATHS:
+        return await call_next(request)
+    if drain.draining:
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "Servidor em desligamento; tente novamente"},
+            headers={"Retry-After": str(DRAIN_RETRY_AFTER)}
+        )
+    with drain.track():
+        return await call_next(request)
 
 @app.get("/")
 async def root():
@@ -41,22 +98,42 @@ async def root():
     return status_info
 
 @app.post("/convert-pdf")
-async def convert_pdf(file: UploadFile = File(...)):
+async def convert_pdf(
+    file: UploadFile = File(...),
+    extract_tables: Optional[bool] = Query(None, description="Detecta tabelas e gera tabelas Markdown"),
+    output_format: str = Query("markdown", description="markdown ou pages (registros por página)"),
+    chunk_size: Optional[int] = Query(None, ge=1, description="Tamanho dos chunks no formato pages"),
+    chunk_unit: str = Query("chars", description="Unidade de chunk_size: chars ou tokens"),
+    ocr: Optional[bool] = Query(None, description="Aplica OCR local às páginas sem camada de texto"),
+    layout: Optional[bool] = Query(None, description="Títulos, parágrafos e colunas por métricas de fonte"),
+    extract_images: Optional[bool] = Query(None, description="Extrai as imagens e as referencia por URL no Markdown"),
+    pipeline: Optional[str] = Query(None, description="Perfil do pipeline Docling: fast, balanced ou accurate"),
+    x_debug_profile: Optional[str] = Header(None, description="1 para perfilar esta conversão")
+):
     """
     Converte um arquivo PDF para Markdown
     
     Args:
         file: Arquivo PDF enviado via upload
+        extract_tables: Habilita a extração de tabelas (padrão: PDF_EXTRACT_TABLES)
+        output_format: "pages" adiciona page_items (e chunks) à resposta
+        chunk_size: Tamanho máximo de cada chunk pré-dividido
+        chunk_unit: Unidade do tamanho do chunk (chars ou tokens)
+        ocr: Habilita o OCR de páginas escaneadas (padrão: PDF_OCR_ENABLED)
+        layout: Habilita a análise de layout por métricas de fonte (padrão: PDF_LAYOUT)
+        extract_images: Grava as imagens em /assets e as referencia no Markdown
+            (padrão: PDF_EXTRACT_IMAGES)
+        pipeline: Perfil do pipeline Docling (padrão: DOCLING_PIPELINE)
+        x_debug_profile: Header X-Debug-Profile; força o profiling da conversão
+            (além da amostragem por PROFILE_SAMPLE_RATE)
         
     Returns:
         JSON com o conteúdo em Markdown
     """
-    # Validações
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="Nome do arquivo não fornecido")
+    _validate_upload(file, output_format, chunk_unit, pipeline)
     
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Arquivo deve ser um PDF")
+    request_id = new_request_id()
+    start = time.perf_counter()
     
     try:
         # Lê o conteúdo do arquivo
@@ -64,34 +141,168 @@ async def convert_pdf(file: UploadFile = File(...)):
         if not content:
             raise HTTPException(status_code=400, detail="Arquivo vazio")
         
-        logger.info(f"Arquivo recebido: {file.filename} ({len(content)} bytes)")
+        logger.debug("Arquivo recebido: %s (%d bytes) [%s]", file.filename, len(content), request_id)
         
-        # Converte usando o gerenciador de conversores
-        result = converter_manager.convert_pdf(content, file.filename)
+        # Converte usando o gerenciador de conversores, fora do event loop
+        # (a conversão é bloqueante e travaria as demais requisições)
+        result = await run_in_threadpool(
+            converter_manager.convert_pdf,
+            content,
+            file.filename,
+            extract_tables=extract_tables,
+            output_format=output_format,
+            chunk_size=chunk_size,
+            chunk_unit=chunk_unit,
+            ocr=ocr,
+            layout=layout,
+            extract_images=extract_images,
+            pipeline=pipeline,
+            profile=should_profile(x_debug_profile in ("1", "true", "yes"))
+        )
         
-        logger.info(f"Conversão concluída para: {file.filename}")
+        log_conversion(request_id, result, len(content), (time.perf_counter() - start) * 1000)
         return result
                 
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erro inesperado: {e}")
+        logger.error("Erro inesperado [%s]: %s", request_id, e, exc_info=True)
         raise HTTPException(status_code=500, detail=f"Erro interno do servidor: {str(e)}")
 
+def _validate_upload(file: UploadFile, output_format: str, chunk_unit: str, pipeline: Optional[str]):
+    """Validações comuns de /convert-pdf e /jobs"""
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Nome do arquivo não fornecido")
+    
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Arquivo deve ser um PDF")
+    
+    if output_format not in OUTPUT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"output_format deve ser um de: {', '.join(OUTPUT_FORMATS)}")
+    
+    if chunk_unit not in CHUNK_UNITS:
+        raise HTTPException(status_code=400, detail=f"chunk_unit deve ser um de: {', '.join(CHUNK_UNITS)}")
+    
+    if pipeline is not None and pipeline not in DOCLING_PIPELINES:
+        raise HTTPException(status_code=400, detail=f"pipeline deve ser um de: {', '.join(DOCLING_PIPELINES)}")
+
+def _require_broker():
+    if job_broker is None:
+        raise HTTPException(status_code=503, detail="Modo distribuído desabilitado (configure BROKER_URL)")
+    return job_broker
+
+@app.post("/jobs", status_code=202)
+async def submit_job(
+    file: UploadFile = File(...),
+    extract_tables: Optional[bool] = Query(None, description="Detecta tabelas e gera tabelas Markdown"),
+    output_format: str = Query("markdown", description="markdown ou pages (registros por página)"),
+    chunk_size: Optional[int] = Query(None, ge=1, description="Tamanho dos chunks no formato pages"),
+    chunk_unit: str = Query("chars", description="Unidade de chunk_size: chars ou tokens"),
+    ocr: Optional[bool] = Query(None, description="Aplica OCR local às páginas sem camada de texto"),
+    layout: Optional[bool] = Query(None, description="Títulos, parágrafos e colunas por métricas de fonte"),
+    extract_images: Optional[bool] = Query(None, description="Extrai as imagens e as referencia por URL no Markdown"),
+    pipeline: Optional[str] = Query(None, description="Perfil do pipeline Docling: fast, balanced ou accurate")
+):
+    """
+    Enfileira a conversão para os workers (modo distribuído)
+    
+    Aceita as mesmas opções de /convert-pdf. O job_id é derivado do conteúdo
+    e das opções: reenviar o mesmo documento devolve o mesmo job (e o
+    resultado, se já concluído, fica disponível em GET /jobs/{job_id}).
+    """
+    broker = _require_broker()
+    _validate_upload(file, output_format, chunk_unit, pipeline)
+    
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Arquivo vazio")
+    
+    options = {
+        "extract_tables": extract_tables,
+        "output_format": output_format,
+        "chunk_size": chunk_size,
+        "chunk_unit": chunk_unit,
+        "ocr": ocr,
+        "layout": layout,
+        "extract_images": extract_images,
+        "pipeline": pipeline
+    }
+    doc_hash = await run_in_threadpool(scratch_storage.put, content)
+    return await run_in_threadpool(broker.enqueue, doc_hash, file.filename, options)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Estado do job; inclui o resultado quando concluído"""
+    job = await run_in_threadpool(_require_broker().get_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' não encontrado")
+    return job
+
+@app.get("/workers")
+async def list_workers():
+    """Carga reportada por cada worker e estado da fila"""
+    broker = _require_broker()
+    workers = await run_in_threadpool(broker.list_workers)
+    status = await run_in_threadpool(broker.get_status)
+    status["workers"] = workers
+    return status
+
+@app.post("/inspect-pdf")
+async def inspect_pdf_endpoint(file: UploadFile = File(...)):
+    """
+    Metadados do PDF sem conversão (páginas, criptografia, linearização,
+    produtor e indícios de camada de texto), lidos pelo trailer/xref
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Nome do arquivo não fornecido")
+    
+    content = await file.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Arquivo vazio")
+    
+    result = await run_in_threadpool(inspect_pdf, content)
+    result["filename"] = file.filename
+    return result
+
+@app.get("/assets/{asset_id}")
+async def get_asset(asset_id: str, if_none_match: Optional[str] = Header(None)):
+    """
+    Imagem extraída (extract_images), servida direto do disco
+    
+    Suporta requisições Range; o conteúdo de um asset nunca muda (o nome é
+    o hash), então a resposta pode ser mantida em cache indefinidamente.
+    """
+    path = asset_store.path(asset_id)
+    if path is None or not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Asset '{asset_id}' não encontrado")
+    
+    headers = {
+        "ETag": f'"{asset_id}"',
+        "Cache-Control": "public, max-age=31536000, immutable"
+    }
+    if if_none_match and f'"{asset_id}"' in if_none_match:
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, media_type=ASSET_MEDIA_TYPES[asset_id.rsplit(".", 1)[1]], headers=headers)
+
 @app.get("/health")
 async def health_check():
     """Endpoint para verificação de saúde da aplicação"""
     converter_status = converter_manager.get_converter_status()
     
     health_info = {
-        "status": "healthy",
+        "status": "draining" if drain.draining else "healthy",
         "version": "2.0.0",
         "architecture": "modular",
         "timestamp": "2024-01-01T00:00:00Z"
     }
     
     health_info.update(converter_status)
+    health_info.update(drain.get_status())
     
+    if drain.draining:
+        # Balanceadores e healthchecks deixam de enviar tráfego para esta instância
+        return JSONResponse(status_code=503, content=health_info,
+                            headers={"Retry-After": str(DRAIN_RETRY_AFTER)})
     return health_info
 
 @app.get("/converters")
@@ -102,15 +313,57 @@ async def list_converters():
 @app.get("/converters/{converter_name}")
 async def get_converter_status(converter_name: str):
     """Retorna status detalhado de um conversor específico"""
-    for converter in converter_manager.converters:
-        if converter_name.lower() in converter.name.lower():
-            if hasattr(converter, 'get_detailed_status'):
-                return converter.get_detailed_status()
-            else:
-                return converter.get_status()
+    converter = converter_manager.find_converter(converter_name)
+    if converter:
+        if hasattr(converter, 'get_detailed_status'):
+            status = converter.get_detailed_status()
+        else:
+            status = converter.get_status()
+        status["health"] = converter_manager.get_health(converter)
+        return status
     
     raise HTTPException(status_code=404, detail=f"Conversor '{converter_name}' não encontrado")
 
+def _check_admin_token(x_admin_token: Optional[str]):
+    """
+    Exige o header X-Admin-Token igual a ADMIN_TOKEN
+
+    Sem ADMIN_TOKEN configurado, os endpoints /admin ficam desabilitados (404).
+    """
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), admin_token.encode()):
+        raise HTTPException(status_code=403, detail="Token administrativo inválido")
+
+@app.get("/admin/profiles")
+async def list_profiles(x_admin_token: Optional[str] = Header(None)):
+    """Lista os traces das conversões perfiladas mais lentas"""
+    _check_admin_token(x_admin_token)
+    return {"profiles": converter_manager.profiles.list()}
+
+@app.get("/admin/profiles/{trace_id}")
+async def get_profile(trace_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Retorna um trace: tempos por página e estágio e funções mais custosas"""
+    _check_admin_token(x_admin_token)
+    trace = converter_manager.profiles.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail=f"Trace '{trace_id}' não encontrado")
+    return trace
+
+@app.get("/admin/profiles/{trace_id}/pstats")
+async def download_profile(trace_id: str, x_admin_token: Optional[str] = Header(None)):
+    """Download do perfil de CPU no formato pstats (python -m pstats arquivo.prof)"""
+    _check_admin_token(x_admin_token)
+    data = converter_manager.profiles.get_pstats(trace_id)
+    if data is None:
+        raise HTTPException(status_code=404, detail=f"Perfil '{trace_id}' não encontrado")
+    return Response(
+        content=data,
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f'attachment; filename="{trace_id}.prof"'}
+    )
+
 if __name__ == "__main__":
     uvicorn.run(
         "main:app",
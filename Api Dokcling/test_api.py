@@ -9,6 +9,8 @@ import json
 import os
 from pathlib import Path
 
+from devmind_client import DevMindClient, DevMindError
+
 # Configuração da API
 API_BASE_URL = "http://localhost:8000"
 
@@ -87,19 +89,15 @@ def test_with_sample_pdf():
     print(f"📄 Usando arquivo: {pdf_file.name}")
     
     try:
-        with open(pdf_file, "rb") as f:
-            files = {"file": (pdf_file.name, f, "application/pdf")}
-            response = requests.post(f"{API_BASE_URL}/convert-pdf", files=files)
-            
-            if response.status_code == 200:
-                data = response.json()
-                print("✅ Conversão realizada com sucesso!")
-                print(f"📝 Tamanho do markdown: {len(data.get('markdown', ''))} caracteres")
-                print(f"🔧 Conversor usado: {data.get('converter_used', 'N/A')}")
-            else:
-                print(f"❌ Erro na conversão: {response.status_code}")
-                print(f"📄 Detalhes: {response.text}")
+        with DevMindClient(API_BASE_URL) as client:
+            data = client.convert(pdf_file)
+            print("✅ Conversão realizada com sucesso!")
+            print(f"📝 Tamanho do markdown: {len(data.get('markdown', ''))} caracteres")
+            print(f"🔧 Conversor usado: {data.get('converter_used', 'N/A')}")
                 
+    except DevMindError as e:
+        print(f"❌ Erro na conversão: {e.status_code}")
+        print(f"📄 Detalhes: {e.detail}")
     except Exception as e:
         print(f"❌ Erro ao processar arquivo: {e}")
 
@@ -130,6 +128,11 @@ def show_usage_examples():
     print("   files = {'file': open('arquivo.pdf', 'rb')}")
     print(f"   response = requests.post('{API_BASE_URL}/convert-pdf', files=files)")
     print("   print(response.json())")
+    
+    print("\n🐍 Com o cliente oficial (conexões reaproveitadas, novas tentativas em 503):")
+    print("   from devmind_client import DevMindClient")
+    print(f"   with DevMindClient('{API_BASE_URL}') as client:")
+    print("       result = client.convert('arquivo.pdf', extract_tables=True)")
 
 def main():
     """Função principal"""
@@ -0,0 +1,22 @@
+"""Autenticação dos endpoints /admin"""
+
+from fastapi.testclient import TestClient
+
+import main
+
+client = TestClient(main.app)
+
+
+def test_admin_is_disabled_without_token(monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+
+    assert client.get("/admin/profiles").status_code == 404
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": ""}).status_code == 404
+
+
+def test_admin_requires_matching_token(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", "s3cret")
+
+    assert client.get("/admin/profiles").status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "s3cre"}).status_code == 403
+    assert client.get("/admin/profiles", headers={"X-Admin-Token": "s3cret"}).status_code == 200
@@ -0,0 +1,66 @@
+"""Manifesto e opções da conversão em lote"""
+
+import bulk_convert
+from conftest import build_pdf
+
+CONTENT = b"BT /F1 24 Tf 72 720 Td (Hello World) Tj ET"
+
+
+def test_manifest_is_keyed_by_content_and_options(tmp_path):
+    source = tmp_path / "pdfs"
+    source.mkdir()
+    (source / "a.pdf").write_bytes(build_pdf([CONTENT]))
+    output = tmp_path / "saida"
+
+    def run(**options):
+        return bulk_convert.convert_paths([str(source)], str(output), workers=1,
+                                          converter_names="simple_pdf", options=options)
+
+    assert run()["converted"] == 1
+    assert run()["skipped"] == 1
+    # Mesmo conteúdo com outras opções não reaproveita a saída anterior
+    assert run(extract_tables=True)["converted"] == 1
+    assert run(extract_tables=True)["skipped"] == 1
+    # None equivale a não informar a opção (padrão do conversor)
+    assert run(extract_tables=None, ocr=None)["skipped"] == 1
+
+
+def test_flags_are_tri_state(monkeypatch, tmp_path):
+    captured = {}
+
+    def fake_convert_paths(inputs, output_dir, **kwargs):
+        captured.update(kwargs["options"])
+        return {"failed": 0}
+
+    monkeypatch.setattr(bulk_convert, "convert_paths", fake_convert_paths)
+
+    bulk_convert.main(["x.pdf", "-o", str(tmp_path)])
+    assert captured == {"extract_tables": None, "ocr": None, "layout": None}
+
+    bulk_convert.main(["x.pdf", "-o", str(tmp_path), "--tables", "--no-ocr"])
+    assert captured["extract_tables"] is True
+    assert captured["ocr"] is False
+
+
+def test_inputs_with_the_same_output_path_do_not_overwrite(tmp_path):
+    for root, text in (("a", b"Primeiro"), ("b", b"Segundo")):
+        (tmp_path / root).mkdir()
+        (tmp_path / root / "x.pdf").write_bytes(build_pdf([CONTENT.replace(b"Hello World", text)]))
+    output = tmp_path / "saida"
+
+    stats = bulk_convert.convert_paths([str(tmp_path / "a"), str(tmp_path / "b"), str(tmp_path / "a")],
+                                       str(output), workers=1, converter_names="simple_pdf")
+
+    assert stats["files"] == 2
+    assert stats["converted"] == 1
+    assert stats["collisions"] == 1
+    assert "Primeiro" in (output / "x.md").read_text(encoding="utf-8")
+
+
+def test_worker_manager_uses_one_thread_per_converter(monkeypatch):
+    # O paralelismo vem dos processos do pool
+    monkeypatch.setattr(bulk_convert, "_manager", None)
+
+    bulk_convert._init_worker("simple_pdf", 30)
+
+    assert bulk_convert._manager.pools["simple_pdf"]._max_workers == 1
@@ -0,0 +1,54 @@
+"""Cliente assíncrono: uploads fora do event loop e cancelamento em iter_convert"""
+
+import asyncio
+
+import httpx
+
+from devmind_client.client import AsyncDevMindClient
+
+
+def test_async_upload_is_read_in_a_thread(monkeypatch, tmp_path):
+    path = tmp_path / "doc.pdf"
+    path.write_bytes(b"%PDF-1.4 conteudo")
+    threaded = []
+    to_thread = asyncio.to_thread
+
+    async def tracking_to_thread(func, *args):
+        threaded.append(func)
+        return await to_thread(func, *args)
+
+    monkeypatch.setattr(asyncio, "to_thread", tracking_to_thread)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"success": True, "has_content": b"conteudo" in request.content})
+
+    async def main():
+        async with AsyncDevMindClient(transport=httpx.MockTransport(handler)) as client:
+            return await client.convert(path)
+
+    assert asyncio.run(main()) == {"success": True, "has_content": True}
+    assert len(threaded) == 1
+
+
+def test_async_iter_convert_cancels_pending_requests_on_early_exit():
+    cancelled = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if b"slow" in request.content:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(request)
+                raise
+        return httpx.Response(200, json={"success": True})
+
+    async def main():
+        async with AsyncDevMindClient(transport=httpx.MockTransport(handler)) as client:
+            stream = client.iter_convert([b"fast", b"slow", b"slow"])
+            first = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.sleep(0.1)
+            # Antes do fim do asyncio.run, que cancelaria as tarefas restantes
+            return first, len(cancelled)
+
+    assert asyncio.run(main()) == ((b"fast", {"success": True}), 2)
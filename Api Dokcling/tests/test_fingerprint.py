@@ -0,0 +1,42 @@
+"""Impressões digitais de páginas e reaproveitamento pelo índice"""
+
+from io import BytesIO
+
+import pdfplumber
+
+from conftest import build_pdf
+from converters.fingerprint import FingerprintIndex, page_fingerprint
+from converters.simple_pdf import SimplePDFConverter
+
+CONTENT = b"BT /F1 24 Tf 72 720 Td (Hello World) Tj ET"
+# Mesma fonte base, mas os códigos de H e W desenham X e Z
+REMAPPED_FONT = (
+    b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+    b"/Encoding << /Type /Encoding /Differences [72 /X 87 /Z] >> >>"
+)
+
+
+def _fingerprints(pdf_content: bytes):
+    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+        return [page_fingerprint(page) for page in pdf.pages]
+
+
+def test_same_content_streams_with_different_fonts_differ():
+    original = build_pdf([CONTENT])
+    remapped = build_pdf([CONTENT], font=REMAPPED_FONT)
+
+    assert _fingerprints(original) == _fingerprints(build_pdf([CONTENT]))
+    assert _fingerprints(original) != _fingerprints(remapped)
+
+
+def test_index_does_not_serve_text_extracted_with_another_font(tmp_path):
+    converter = SimplePDFConverter()
+    converter.fingerprint_index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+
+    first = converter.convert_pdf(build_pdf([CONTENT]), "original.pdf")
+    second = converter.convert_pdf(build_pdf([CONTENT], font=REMAPPED_FONT), "remapped.pdf")
+
+    assert "Hello World" in first["markdown"]
+    assert "Xello Zorld" in second["markdown"]
+    assert second["reused_pages"] == 0
+    assert "near_duplicate" not in second
@@ -0,0 +1,78 @@
+"""Circuit breaker e hedging pela latência por página"""
+
+from conftest import build_pdf
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from converters.health import ConverterHealth, CLOSED, HALF_OPEN
+from converters.manager import ConverterManager, HEDGE_MIN_SAMPLES
+
+
+def test_input_errors_do_not_open_the_breaker():
+    health = ConverterHealth("simple_pdf", min_calls=4, error_rate_threshold=0.5)
+    for _ in range(10):
+        health.record(50.0, False, pages=2, input_error=True)
+
+    status = health.get_status()
+    assert health.state == CLOSED
+    assert status["window_calls"] == 0
+    assert status["total_input_errors"] == 10
+
+
+def test_backend_errors_open_the_breaker():
+    health = ConverterHealth("simple_pdf", min_calls=4, error_rate_threshold=0.5)
+    for _ in range(4):
+        health.record(50.0, False, pages=2)
+
+    assert health.state != CLOSED
+
+
+def test_hedge_delay_scales_with_document_pages():
+    manager = ConverterManager("simple_pdf")
+    converter = manager.converters[0]
+    health = manager.health[converter.key]
+    # Documentos pequenos e grandes com o mesmo custo por página (10 ms)
+    for index in range(HEDGE_MIN_SAMPLES):
+        pages = 2 if index % 2 else 500
+        health.record(10.0 * pages, True, pages)
+
+    assert abs(manager._hedge_delay(converter, 500) - 5.0) < 1e-6
+    assert abs(manager._hedge_delay(converter, 2) - 0.02) < 1e-6
+    assert manager._hedge_delay(converter, None) is None
+
+
+def test_pdf_without_text_is_recorded_as_input_error():
+    manager = ConverterManager("simple_pdf")
+    result = manager.convert_pdf(build_pdf([b"0.5 w 72 72 100 100 re S"]), "desenho.pdf", ocr=False)
+
+    status = manager.get_health(manager.converters[0])
+    assert result["fallback_reason"] == "no_text_layer"
+    assert status["total_input_errors"] == 1
+    assert status["total_errors"] == 0
+
+
+def test_cancelled_probe_releases_the_half_open_breaker():
+    manager = ConverterManager("simple_pdf")
+    converter = manager.converters[0]
+    health = manager.health[converter.key]
+    health._open()
+    health.opened_at = time.monotonic() - health.cooldown_s
+
+    # Pool ocupado: a chamada de teste fica na fila e é cancelada, como o
+    # perdedor de uma disputa "hedged"
+    release = threading.Event()
+    manager.pools[converter.key] = ThreadPoolExecutor(max_workers=1)
+    manager.pools[converter.key].submit(release.wait)
+    chosen, probe = manager._next_allowed(iter([converter]))
+    future = manager._submit(chosen, build_pdf([b"BT /F1 24 Tf 72 720 Td (Oi) Tj ET"]), "teste.pdf", probe)
+    assert probe is True
+    assert health.state == HALF_OPEN
+    assert not health.allow_request()
+
+    assert future.cancel()
+    release.set()
+
+    assert health.allow_request()
+    health.record(10.0, True, pages=1)
+    assert health.state == CLOSED
@@ -0,0 +1,95 @@
+"""Inspeção rápida: criptografia lida pelo trailer"""
+
+from io import BytesIO
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from conftest import build_pdf
+from converters.inspection import inspect_pdf
+from converters.manager import ConverterManager
+
+CONTENT = b"BT /F1 24 Tf 72 720 Td (Hello World) Tj ET"
+
+
+def _encrypted(user_password: str) -> bytes:
+    writer = PdfWriter()
+    for page in PdfReader(BytesIO(build_pdf([CONTENT, CONTENT]))).pages:
+        writer.add_page(page)
+    writer.encrypt(user_password, "owner")
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _aes256(pdf_content: bytes) -> bytes:
+    """Acrescenta ao PDF um /Encrypt AES-256 (V5/R6) cujas chaves não aceitam a senha vazia"""
+    trailer = pdf_content.rindex(b"trailer")
+    size = int(pdf_content[trailer:].split(b"/Size ")[1].split()[0])
+    encrypt = (
+        b"%d 0 obj\n<< /Filter /Standard /V 5 /R 6 /Length 256 /P -4 "
+        b"/O <%s> /U <%s> /OE <%s> /UE <%s> /Perms <%s> "
+        b"/CF << /StdCF << /CFM /AESV3 /AuthEvent /DocOpen /Length 32 >> >> "
+        b"/StmF /StdCF /StrF /StdCF >>\nendobj\n"
+        % (size, b"11" * 48, b"22" * 48, b"33" * 32, b"44" * 32, b"55" * 16)
+    )
+    body = pdf_content[:trailer]
+    xref = body.rindex(b"xref")
+    offset = len(body[:xref])
+    body = body[:xref] + encrypt
+    entries = pdf_content[xref:trailer].rstrip(b"\n").split(b"\n")
+    entries[1] = b"0 %d" % (size + 1)
+    entries.append(b"%010d 00000 n " % offset)
+    return (
+        body + b"\n".join(entries) + b"\n"
+        + b"trailer\n<< /Size %d /Root 1 0 R /Encrypt %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+        % (size + 1, size, len(body))
+    )
+
+
+def test_plain_pdf_is_not_encrypted():
+    info = inspect_pdf(build_pdf([CONTENT]))
+
+    assert info["encrypted"] is False
+    assert info["needs_password"] is False
+    assert info["pages"] == 1
+
+
+def test_user_password_is_detected():
+    info = inspect_pdf(_encrypted("secret"))
+
+    assert info["encrypted"] is True
+    assert info["needs_password"] is True
+    assert info["encryption"]["filter"] == "/Standard"
+
+
+def test_empty_user_password_is_readable():
+    info = inspect_pdf(_encrypted(""))
+
+    assert info["encrypted"] is True
+    assert info["needs_password"] is False
+    assert info["pages"] == 2
+
+
+def test_aes256_is_reported_as_encrypted_without_pycryptodome():
+    # Antes, o DependencyError do PyPDF2 virava encrypted=False
+    info = inspect_pdf(_aes256(build_pdf([CONTENT])))
+
+    assert info["encrypted"] is True
+    assert info["encryption"] == {"filter": "/Standard", "version": 5, "revision": 6}
+    assert info["needs_password"] is not False
+
+
+def test_malformed_encryption_is_left_to_the_converters():
+    # Antes, qualquer exceção do PyPDF2 virava "PDF protegido por senha"
+    plain = build_pdf([CONTENT])
+    dangling = plain.replace(b"/Root 1 0 R", b"/Root 1 0 R /Encrypt 99 0 R")
+    unsupported = _aes256(plain).replace(b"/V 5 /R 6", b"/V 9 /R 9")
+
+    for pdf_content in (dangling, unsupported):
+        info = inspect_pdf(pdf_content)
+
+        assert info["encrypted"] is True
+        assert info["needs_password"] is None
+
+        result = ConverterManager("simple_pdf").convert_pdf(pdf_content, "broken.pdf")
+        assert result.get("error") != "PDF protegido por senha"
@@ -0,0 +1,57 @@
+"""Análise de layout: histograma do documento e níveis de título"""
+
+from io import BytesIO
+
+import pdfplumber
+
+import converters.layout as layout
+from conftest import build_pdf
+from converters.fingerprint import FingerprintIndex
+from converters.simple_pdf import SimplePDFConverter
+
+TITLE_PAGE = b"BT /F1 24 Tf 72 720 Td (Relatorio anual) Tj ET"
+BODY_PAGE = b"\n".join(
+    b"BT /F1 10 Tf 72 %d Td (Linha %d do corpo do texto com varias palavras) Tj ET" % (720 - 12 * i, i)
+    for i in range(20)
+)
+
+
+def _markdown(pdf_content: bytes) -> str:
+    result = SimplePDFConverter().convert_pdf(pdf_content, "layout.pdf", layout=True)
+    assert result["layout_analysis"] is True
+    return result["markdown"]
+
+
+def test_heading_levels_use_the_whole_document():
+    # Na página 1 só há texto grande: pelo histograma da página ele seria o corpo
+    markdown = _markdown(build_pdf([TITLE_PAGE, BODY_PAGE]))
+
+    assert "### Relatorio anual" in markdown
+    assert "# Linha" not in markdown
+
+
+def test_zero_heading_levels_disables_headings(monkeypatch):
+    monkeypatch.setattr(layout, "HEADING_LEVELS", 0)
+
+    pdf_content = build_pdf([TITLE_PAGE.replace(b"720", b"780") + b"\n" + BODY_PAGE])
+
+    with pdfplumber.open(BytesIO(pdf_content)) as pdf:
+        analyzer = layout.LayoutAnalyzer()
+        analyzer.collect_page(pdf.pages[0])
+        markdown = analyzer.page_markdown(pdf.pages[0])
+
+    assert markdown.startswith("Relatorio anual")
+    assert "#" not in markdown
+
+
+def test_reused_pages_keep_this_documents_heading_levels(tmp_path):
+    # A mesma página, num documento com um título maior, desce um nível
+    converter = SimplePDFConverter()
+    converter.fingerprint_index = FingerprintIndex(str(tmp_path / "fingerprints.db"))
+    section = b"BT /F1 14 Tf 72 780 Td (Resultados) Tj ET\n" + BODY_PAGE
+
+    first = converter.convert_pdf(build_pdf([section, BODY_PAGE]), "a.pdf", layout=True)
+    second = converter.convert_pdf(build_pdf([TITLE_PAGE, section]), "b.pdf", layout=True)
+
+    assert "### Resultados" in first["markdown"]
+    assert "#### Resultados" in second["markdown"]
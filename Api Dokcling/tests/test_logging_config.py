@@ -0,0 +1,35 @@
+"""Logging assíncrono e registro-resumo das conversões"""
+
+import logging
+import queue
+
+import logging_config
+from logging_config import _LazyQueueHandler
+
+
+def test_message_is_interpolated_before_queueing():
+    log_queue = queue.SimpleQueue()
+    logger = logging.getLogger("test.lazy")
+    logger.addHandler(_LazyQueueHandler(log_queue))
+    logger.propagate = False
+    items = [1]
+
+    logger.warning("itens %s", items)
+    items.append(2)
+
+    record = log_queue.get_nowait()
+    assert record.getMessage() == "itens [1]"
+    assert record.args is None
+
+
+def test_fingerprint_reuse_counts_as_cache_hit(monkeypatch):
+    events = []
+    monkeypatch.setattr(logging_config.conversion_logger, "isEnabledFor", lambda level: True)
+    monkeypatch.setattr(logging_config.conversion_logger, "info",
+                        lambda msg, extra: events.append(extra["event"]))
+
+    logging_config.log_conversion("r1", {"reused_pages": 3}, 100, 1.0)
+    logging_config.log_conversion("r2", {"reused_pages": 0}, 100, 1.0)
+
+    assert [event["cache_hit"] for event in events] == [True, False]
+    assert events[0]["reused_pages"] == 3
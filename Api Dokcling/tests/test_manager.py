@@ -0,0 +1,42 @@
+"""Ordem da cadeia de fallback do ConverterManager"""
+
+from conftest import build_pdf
+from converters.manager import ConverterManager
+
+CONTENT = b"BT /F1 24 Tf 72 720 Td (Hello World) Tj ET"
+
+
+def test_mock_converter_is_always_last():
+    # O SimpleConverter declara custo 0, mas só simula a conversão
+    manager = ConverterManager("simple,simple_pdf")
+
+    assert [c.key for c in manager.build_fallback_chain()] == ["simple_pdf", "simple"]
+    assert [c.key for c in manager.build_fallback_chain(extract_tables=True)][-1] == "simple"
+    assert manager.active_converter.key == "simple_pdf"
+
+    result = manager.convert_pdf(build_pdf([CONTENT]), "hello.pdf")
+    assert result["mode"] == "real"
+    assert "Hello World" in result["markdown"]
+
+
+def test_converter_reuses_the_inspected_page_count(monkeypatch):
+    # A inspeção do manager já contou as páginas; o conversor não relê o PDF
+    calls = []
+    monkeypatch.setattr("converters.simple_pdf.count_pages", lambda pdf_content: calls.append(1))
+    manager = ConverterManager("simple_pdf")
+
+    result = manager.convert_pdf(build_pdf([CONTENT, CONTENT]), "hello.pdf")
+    assert result["pages"] == 2
+    assert calls == []
+
+
+def test_shutdown_releases_the_converters_own_pools():
+    # O pool de processos do OCR não pertence ao manager, mas deve ser encerrado com ele
+    manager = ConverterManager("simple_pdf")
+    converter = manager.converters[0]
+    calls = []
+    converter.ocr_stage.shutdown = lambda: calls.append("ocr")
+
+    manager.shutdown()
+
+    assert calls == ["ocr"]
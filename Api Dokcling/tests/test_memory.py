@@ -0,0 +1,34 @@
+"""Memória estável ao longo de documentos longos"""
+
+import converters.simple_pdf as simple_pdf
+from converters.memory import MemoryTracker, PAGE_WINDOW
+from loadtest import synthetic_pdf
+
+PAGES = PAGE_WINDOW * 5
+
+
+class _RecordingTracker(MemoryTracker):
+    samples: list = []
+
+    def sample(self) -> int:
+        rss = super().sample()
+        self.samples.append(rss)
+        return rss
+
+
+def test_rss_is_flat_across_a_large_pdf(monkeypatch):
+    monkeypatch.setattr(simple_pdf, "MemoryTracker", _RecordingTracker)
+    converter = simple_pdf.SimplePDFConverter()
+    # Aquece imports e caches do processo
+    converter.convert_pdf(synthetic_pdf(4, 5), "aquecimento.pdf")
+    _RecordingTracker.samples = []
+
+    result = converter.convert_pdf(synthetic_pdf(PAGES, 5), "longo.pdf", layout=False, extract_images=False)
+
+    # Uma amostra por janela de páginas, mais a do relatório final
+    windows = _RecordingTracker.samples[:-1]
+    assert result["mode"] == "real"
+    assert len(windows) == PAGES // PAGE_WINDOW
+    # Sem liberar as páginas, o RSS cresce ~30 MB a cada janela de 64 páginas
+    growth_mb = (max(windows) - windows[0]) / 1024 / 1024
+    assert growth_mb < 8, f"RSS cresceu {growth_mb:.1f} MB entre a primeira e a última janela"
@@ -0,0 +1,36 @@
+"""Segmentos de texto e tabela de uma página"""
+
+from io import BytesIO
+
+import pdfplumber
+
+from conftest import build_pdf
+from converters.tables import extract_page_segments
+
+# Grade 2x2 entre x=72..272 e y=600..680, com uma nota à direita na mesma faixa
+PAGE = b"\n".join([
+    b"BT /F1 12 Tf 72 720 Td (Intro above the table) Tj ET",
+    b"0.5 w 72 600 200 80 re S 172 600 m 172 680 l S 72 640 m 272 640 l S",
+    b"BT /F1 10 Tf 80 660 Td (Name) Tj ET",
+    b"BT /F1 10 Tf 180 660 Td (Value) Tj ET",
+    b"BT /F1 10 Tf 80 620 Td (alpha) Tj ET",
+    b"BT /F1 10 Tf 180 620 Td (42) Tj ET",
+    b"BT /F1 10 Tf 320 640 Td (SIDE NOTE beside the table) Tj ET",
+    b"BT /F1 12 Tf 72 560 Td (Outro below the table) Tj ET",
+])
+
+
+def test_text_beside_a_table_is_kept():
+    with pdfplumber.open(BytesIO(build_pdf([PAGE]))) as pdf:
+        segments = extract_page_segments(pdf.pages[0])
+
+    kinds = [kind for kind, _ in segments]
+    texts = [content for kind, content in segments if kind == "text"]
+    table = next(content for kind, content in segments if kind == "table")
+
+    assert kinds == ["text", "table", "text", "text"]
+    assert "Intro above the table" in texts[0]
+    assert "SIDE NOTE beside the table" in texts[1]
+    assert "Outro below the table" in texts[2]
+    assert "| alpha | 42 |" in table
+    assert "SIDE NOTE" not in table
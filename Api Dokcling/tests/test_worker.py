@@ -0,0 +1,58 @@
+"""Falhas de jobs no worker distribuído: repetidas só quando podem dar certo"""
+
+from io import BytesIO
+
+from PyPDF2 import PdfReader, PdfWriter
+
+from conftest import build_pdf
+from distributed.sqlite_broker import SQLiteBroker
+from distributed.storage import ScratchStorage
+from distributed.worker import Worker
+
+CONTENT = b"BT /F1 24 Tf 72 720 Td (Hello World) Tj ET"
+
+
+def _protected() -> bytes:
+    writer = PdfWriter()
+    for page in PdfReader(BytesIO(build_pdf([CONTENT]))).pages:
+        writer.add_page(page)
+    writer.encrypt("secret", "owner")
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+def _run_job(tmp_path, doc_hash, storage, manager_result=None):
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"), max_attempts=3)
+    worker = Worker(broker, storage, converter_names="simple_pdf", worker_id="w1")
+    if manager_result is not None:
+        worker.manager.convert_pdf = lambda content, filename, **options: manager_result
+    try:
+        job_id = broker.enqueue(doc_hash, "doc.pdf", {})["job_id"]
+        worker._process(broker.lease("w1"))
+        return broker.get_job(job_id)
+    finally:
+        worker.manager.shutdown()
+        broker.close()
+
+
+def test_input_failures_are_not_retried(tmp_path):
+    storage = ScratchStorage(str(tmp_path / "scratch"))
+
+    protected = _run_job(tmp_path / "a", storage.put(_protected()), storage)
+    assert protected["status"] == "failed"
+    assert protected["attempts"] == 1
+    assert protected["error"] == "PDF protegido por senha"
+
+    missing = _run_job(tmp_path / "b", "0" * 64, storage)
+    assert missing["status"] == "failed"
+    assert missing["attempts"] == 1
+
+
+def test_converter_failures_are_retried(tmp_path):
+    storage = ScratchStorage(str(tmp_path / "scratch"))
+    doc_hash = storage.put(build_pdf([CONTENT]))
+
+    job = _run_job(tmp_path, doc_hash, storage, {"success": False, "error": "Timeout"})
+    assert job["status"] == "queued"
+    assert job["error"] == "Timeout"